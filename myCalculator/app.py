@@ -2,6 +2,10 @@
 """
 myCalculator 主程序入口
 启动多功能计算器应用程序
+
+用法:
+    python app.py                       启动图形界面
+    python app.py --batch [文件 ...]     批量计算文件或标准输入中的表达式
 """
 
 import sys
@@ -12,10 +16,16 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
 try:
-    from ui.calculator_window import main
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        from ui.batch_cli import main
+
+        if __name__ == "__main__":
+            sys.exit(main(sys.argv[2:]))
+    else:
+        from ui.calculator_window import main
 
-    if __name__ == "__main__":
-        main()
+        if __name__ == "__main__":
+            main()
 
 except Exception as e:
     print(f"程序启动失败: {str(e)}")
@@ -2,18 +2,58 @@
 货币换算模块
 支持多种货币之间的实时汇率转换
 使用ExchangeRate-API获取实时汇率数据
+获取到的汇率同时保存在磁盘缓存中（见 rate_store），重启后在有效期内无需重新联网
+货币转换只获取一次以美元为基准的汇率，任意两种货币之间的汇率由交叉汇率矩阵得到
+网络请求复用连接并自动重试；一旦有缓存，汇率由后台线程在过期前刷新，转换不再等待网络
 """
 
 import requests
 import json
+import threading
 from datetime import datetime, timedelta
 import time
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_store import RateStore, default_cache_path
+
+# 网络请求失败时的重试次数和退避系数（第 n 次重试前约等待 RETRY_BACKOFF * 2^(n-1) 秒）
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# 没有缓存时在调用线程（界面线程）上同步获取：连接超时较短，连接失败只重试一次，读取失败不重试，
+# 离线时最多等待约 2 * FOREGROUND_CONNECT_TIMEOUT 秒，而不是后台刷新那样多次重试
+FOREGROUND_CONNECT_TIMEOUT = 3
+
+# 缓存存在多久（占有效期的比例）后由后台线程提前刷新
+REFRESH_AHEAD = 0.8
+
+# 后台刷新失败后再次尝试的间隔，以及后台线程两次检查之间的最短间隔（秒）
+REFRESH_RETRY_INTERVAL = 60
+MIN_REFRESH_WAIT = 1.0
+
+
+def _get_retry(**options):
+    """只重试 GET 请求的 Retry；urllib3 1.26 之前的版本中 allowed_methods 名为 method_whitelist"""
+    try:
+        return Retry(allowed_methods=frozenset(['GET']), **options)
+    except TypeError:
+        return Retry(method_whitelist=frozenset(['GET']), **options)
+
+
 class CurrencyConverter:
     """货币转换类"""
 
-    def __init__(self):
-        """初始化货币转换器"""
+    def __init__(self, cache_path=None, persistent=True, background_refresh=True):
+        """初始化货币转换器
+
+        Args:
+            cache_path: 磁盘缓存文件路径，默认见 rate_store.default_cache_path
+            persistent: 是否使用磁盘缓存
+            background_refresh: 是否由后台线程刷新汇率（关闭时过期后同步获取）
+        """
         # API配置
         self.base_url = "https://api.exchangerate-api.com/v4/latest/"
         self.backup_url = "https://api.fixer.io/latest"  # 备用API
@@ -37,9 +77,33 @@ class CurrencyConverter:
         self.cache_timestamp = {}
         self.cache_duration = 3600  # 缓存1小时
 
+        # 交叉汇率的基准货币：每个缓存有效期内只需获取这一种货币的汇率
+        self.pivot_currency = 'USD'
+        # 交叉汇率矩阵，基准货币的汇率刷新后才重新计算
+        self._cross_rates = None
+
+        # 磁盘缓存（第一次查询汇率时才读取文件）
+        if persistent and cache_path is None:
+            cache_path = default_cache_path()
+        self.rate_store = RateStore(cache_path) if persistent and cache_path else None
+
         # 网络请求超时时间
         self.timeout = 10
 
+        # 复用连接的 HTTP 会话：后台刷新失败时按指数退避自动重试，同步获取只快速重试一次连接
+        self.session = self._create_session(_get_retry(
+            total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUS))
+        self.foreground_session = self._create_session(_get_retry(total=1, connect=1, read=0))
+
+        # 后台刷新：有缓存后由后台线程在过期前更新，已过期的汇率先直接返回再在后台刷新
+        self.background_refresh = background_refresh
+        self._cache_lock = threading.Lock()
+        self._refresh_condition = threading.Condition()
+        self._pending_refresh = set()
+        self._next_attempt = {}
+        self._refresh_thread = None
+        self._stop_refresh = None
+
     def get_real_time_rates(self, base_currency='USD'):
         """
         获取实时汇率数据
@@ -51,38 +115,46 @@ class CurrencyConverter:
             汇率字典或错误信息
         """
         try:
-            # 检查缓存是否有效
-            current_time = time.time()
-            if (base_currency in self.rates_cache and
-                base_currency in self.cache_timestamp and
-                current_time - self.cache_timestamp[base_currency] < self.cache_duration):
-                return {
-                    'success': True,
-                    'rates': self.rates_cache[base_currency],
-                    'cached': True
-                }
-
-            # 构建API请求URL
-            url = f"{self.base_url}{base_currency}"
+            # 内存中没有时先读取磁盘缓存
+            if base_currency not in self.rates_cache:
+                self._load_persisted(base_currency)
 
-            # 发送请求
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-
-            data = response.json()
+            current_time = time.time()
+            with self._cache_lock:
+                rates = self.rates_cache.get(base_currency)
+                timestamp = self.cache_timestamp.get(base_currency)
+            if rates is not None and timestamp is not None:
+                # 检查缓存是否有效
+                if current_time - timestamp < self.cache_duration:
+                    self._ensure_refresher()
+                    return {
+                        'success': True,
+                        'rates': rates,
+                        'cached': True
+                    }
+                if self.background_refresh:
+                    # 已过期：立即返回旧汇率并请求后台刷新，转换不等待网络
+                    self.request_refresh(base_currency)
+                    return {
+                        'success': True,
+                        'rates': rates,
+                        'cached': True,
+                        'stale': True,
+                        'warning': '汇率已过期，正在后台更新'
+                    }
 
-            if 'rates' not in data:
-                raise ValueError("API响应格式错误")
+            # 没有缓存（或关闭了后台刷新）时同步获取
+            rates, date = self._fetch_rates(base_currency, foreground=True)
 
             # 更新缓存
-            self.rates_cache[base_currency] = data['rates']
-            self.cache_timestamp[base_currency] = current_time
+            self._store_rates(base_currency, rates, current_time, date)
+            self._ensure_refresher()
 
             return {
                 'success': True,
-                'rates': data['rates'],
+                'rates': rates,
                 'cached': False,
-                'timestamp': data.get('date', datetime.now().strftime('%Y-%m-%d'))
+                'timestamp': date or datetime.now().strftime('%Y-%m-%d')
             }
 
         except requests.exceptions.RequestException as e:
@@ -108,6 +180,183 @@ class CurrencyConverter:
                 }
             return {'success': False, 'error': error_msg}
 
+    @staticmethod
+    def _create_session(retry):
+        """创建带连接池和自动重试的 HTTP 会话"""
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=2, pool_maxsize=4)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _fetch_rates(self, base_currency, foreground=False):
+        """联网获取汇率，返回 (汇率字典, API日期)
+
+        Args:
+            foreground: 是否在调用线程上同步获取（使用较短的连接超时，不做多次重试）
+        """
+        if foreground:
+            session, timeout = self.foreground_session, (FOREGROUND_CONNECT_TIMEOUT, self.timeout)
+        else:
+            session, timeout = self.session, self.timeout
+        response = session.get(f"{self.base_url}{base_currency}", timeout=timeout)
+        response.raise_for_status()
+
+        data = response.json()
+
+        if 'rates' not in data:
+            raise ValueError("API响应格式错误")
+        return data['rates'], data.get('date')
+
+    def _store_rates(self, base_currency, rates, timestamp, date):
+        """更新内存缓存并写入磁盘缓存"""
+        with self._cache_lock:
+            self.rates_cache[base_currency] = rates
+            self.cache_timestamp[base_currency] = timestamp
+        self._persist(base_currency, rates, timestamp, date)
+        # 让后台线程按新的获取时间重新计算下一次刷新时间
+        with self._refresh_condition:
+            self._refresh_condition.notify()
+
+    def request_refresh(self, base_currency):
+        """请求后台线程刷新指定基准货币的汇率，立即返回"""
+        with self._refresh_condition:
+            self._pending_refresh.add(base_currency)
+            self._refresh_condition.notify()
+        self._ensure_refresher()
+
+    def _ensure_refresher(self):
+        """按需启动后台刷新线程"""
+        if not self.background_refresh or self._refresh_thread is not None:
+            return
+        with self._refresh_condition:
+            if self._refresh_thread is None:
+                # 每个线程有自己的停止标志，停止后再启动不会影响旧线程退出
+                self._stop_refresh = threading.Event()
+                self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(self._stop_refresh,),
+                                                        name='exchange-rate-refresh', daemon=True)
+                self._refresh_thread.start()
+
+    def stop_background_refresh(self, timeout=None):
+        """停止后台刷新线程"""
+        with self._refresh_condition:
+            thread = self._refresh_thread
+            self._refresh_thread = None
+            if self._stop_refresh is not None:
+                self._stop_refresh.set()
+            self._refresh_condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def close(self):
+        """停止后台刷新并关闭 HTTP 会话"""
+        self.stop_background_refresh()
+        self.session.close()
+        self.foreground_session.close()
+
+    def _due_time(self, base_currency, timestamp):
+        """基准货币下一次应刷新的时间"""
+        return max(timestamp + self.cache_duration * REFRESH_AHEAD,
+                   self._next_attempt.get(base_currency, 0))
+
+    def _due_refreshes(self, now):
+        """已到刷新时间的基准货币"""
+        with self._cache_lock:
+            items = list(self.cache_timestamp.items())
+        return {base for base, timestamp in items if self._due_time(base, timestamp) <= now}
+
+    def _refresh_delay(self):
+        """距下一次需要刷新的秒数，没有缓存时返回 None（等待刷新请求）"""
+        with self._cache_lock:
+            items = list(self.cache_timestamp.items())
+        if not items:
+            return None
+        delay = min(self._due_time(base, timestamp) for base, timestamp in items) - time.time()
+        return min(max(delay, MIN_REFRESH_WAIT), max(self.cache_duration, MIN_REFRESH_WAIT))
+
+    def _refresh_loop(self, stop):
+        """后台刷新线程：处理刷新请求，并在缓存过期前提前刷新"""
+        while True:
+            with self._refresh_condition:
+                if not self._pending_refresh and not stop.is_set():
+                    self._refresh_condition.wait(self._refresh_delay())
+                if stop.is_set():
+                    return
+                pending = self._pending_refresh
+                self._pending_refresh = set()
+
+            now = time.time()
+            pending |= self._due_refreshes(now)
+            for base_currency in pending:
+                if stop.is_set():
+                    return
+                if self._next_attempt.get(base_currency, 0) > now:
+                    # 刚刷新失败过，等重试间隔过后再试
+                    continue
+                try:
+                    rates, date = self._fetch_rates(base_currency)
+                except Exception:
+                    # 刷新失败时继续使用旧汇率
+                    self._next_attempt[base_currency] = time.time() + REFRESH_RETRY_INTERVAL
+                    continue
+                self._next_attempt.pop(base_currency, None)
+                self._store_rates(base_currency, rates, now, date)
+
+    def get_cross_rates(self):
+        """
+        获取支持的货币两两之间的交叉汇率
+
+        只获取基准货币（pivot_currency）的汇率，
+        1 单位 A = rates[B] / rates[A] 单位 B；矩阵只在基准汇率刷新后重新计算
+
+        Returns:
+            与 get_real_time_rates 相同的字典，成功时另含
+            'currencies'（货币代码列表）、'index'（{货币代码: 序号}）和 'matrix'
+            （matrix[i][j] 为 1 单位 currencies[i] 等于多少 currencies[j]，缺少汇率时为 None）
+        """
+        response = self.get_real_time_rates(self.pivot_currency)
+        if not response['success']:
+            return response
+        rates = response['rates']
+        cross = self._cross_rates
+        if cross is None or cross['source'] is not rates:
+            # 每次获取或读取缓存都会产生新的汇率字典，据此判断是否已刷新
+            currencies = list(self.supported_currencies)
+            values = [1.0 if code == self.pivot_currency else rates.get(code) for code in currencies]
+            matrix = [[target / source if source and target is not None else None for target in values]
+                      for source in values]
+            cross = {
+                'source': rates,
+                'currencies': currencies,
+                'index': {code: i for i, code in enumerate(currencies)},
+                'matrix': matrix
+            }
+            self._cross_rates = cross
+        response = dict(response)
+        response['currencies'] = cross['currencies']
+        response['matrix'] = cross['matrix']
+        response['index'] = cross['index']
+        return response
+
+    def _load_persisted(self, base_currency):
+        """从磁盘缓存读取汇率到内存（过期的数据也读取，联网失败时仍可使用）"""
+        if self.rate_store is None:
+            return
+        entry = self.rate_store.get(base_currency)
+        if entry is not None:
+            with self._cache_lock:
+                self.rates_cache[base_currency] = entry['rates']
+                self.cache_timestamp[base_currency] = entry['timestamp']
+
+    def _persist(self, base_currency, rates, timestamp, date):
+        """把汇率写入磁盘缓存，写入失败时只保留内存缓存"""
+        if self.rate_store is None:
+            return
+        try:
+            self.rate_store.put(base_currency, rates, timestamp, date)
+        except OSError:
+            pass
+
     def convert_currency(self, amount, from_currency, to_currency):
         """
         货币转换
@@ -153,8 +402,8 @@ class CurrencyConverter:
                     'amount': amount
                 }
 
-            # 获取汇率数据
-            rates_response = self.get_real_time_rates(from_currency)
+            # 获取交叉汇率（所有源货币共用一次基准货币的获取）
+            rates_response = self.get_cross_rates()
 
             if not rates_response['success']:
                 return {
@@ -162,13 +411,15 @@ class CurrencyConverter:
                     'error': rates_response['error']
                 }
 
-            rates = rates_response['rates']
+            index = rates_response['index']
+            rate = rates_response['matrix'][index[from_currency]][index[to_currency]]
 
-            if to_currency not in rates:
-                raise ValueError(f"无法获取 {to_currency} 的汇率数据")
+            if rate is None:
+                missing = [code for code in (from_currency, to_currency)
+                           if code != self.pivot_currency and code not in rates_response['rates']]
+                raise ValueError(f"无法获取 {', '.join(missing)} 的汇率数据")
 
             # 执行转换
-            rate = rates[to_currency]
             result = amount * rate
 
             return {
@@ -293,19 +544,30 @@ class CurrencyConverter:
         return result_str
 
     def clear_cache(self):
-        """清除汇率缓存"""
-        self.rates_cache.clear()
-        self.cache_timestamp.clear()
+        """清除汇率缓存（包括磁盘缓存）"""
+        with self._cache_lock:
+            self.rates_cache.clear()
+            self.cache_timestamp.clear()
+        with self._refresh_condition:
+            self._pending_refresh.clear()
+            self._next_attempt.clear()
+        if self.rate_store is not None:
+            self.rate_store.clear()
 
     def get_cache_info(self):
-        """获取缓存信息"""
+        """获取缓存信息，包括内存和磁盘中的记录"""
         info = {}
-        for currency, timestamp in self.cache_timestamp.items():
+        on_disk = self.rate_store.timestamps() if self.rate_store is not None else {}
+        timestamps = dict(on_disk)
+        timestamps.update(self.cache_timestamp)
+        for currency, timestamp in timestamps.items():
             cache_time = datetime.fromtimestamp(timestamp)
             info[currency] = {
                 'cached_time': cache_time.strftime('%Y-%m-%d %H:%M:%S'),
                 'age_seconds': int(time.time() - timestamp),
-                'is_valid': (time.time() - timestamp) < self.cache_duration
+                'is_valid': (time.time() - timestamp) < self.cache_duration,
+                'in_memory': currency in self.cache_timestamp,
+                'on_disk': currency in on_disk
             }
         return info
 
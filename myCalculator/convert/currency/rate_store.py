@@ -0,0 +1,115 @@
+"""
+汇率持久化缓存模块
+把按基准货币获取的汇率及获取时间保存在本地 JSON 文件中，程序重启后仍可使用。
+
+文件在第一次读取时才加载；每次更新都先写入同目录下的临时文件再原子替换，
+写到一半退出也不会留下损坏的缓存。文件损坏或无法读取时按空缓存处理。
+
+缓存路径默认为 ~/.mycalculator/exchange_rates.json，
+可用环境变量 MYCALCULATOR_RATE_CACHE 指定其他路径，值为 0 时不使用磁盘缓存。
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+RATE_CACHE_ENV_VAR = 'MYCALCULATOR_RATE_CACHE'
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.mycalculator', 'exchange_rates.json')
+
+# 文件格式版本，格式不兼容时忽略旧文件
+_FORMAT_VERSION = 1
+
+
+def default_cache_path():
+    """磁盘缓存路径，None 表示已通过环境变量关闭"""
+    value = os.environ.get(RATE_CACHE_ENV_VAR, '').strip()
+    if value == '0':
+        return None
+    return value or DEFAULT_CACHE_PATH
+
+
+class RateStore:
+    """汇率磁盘缓存，线程安全
+
+    每个基准货币一条记录：{'rates': {货币: 汇率}, 'timestamp': 获取时间（Unix 秒）, 'date': API 日期}
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 缓存文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        """读取缓存文件（调用时须持有锁）"""
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self._entries
+        if isinstance(data, dict) and data.get('version') == _FORMAT_VERSION:
+            for base, entry in data.get('entries', {}).items():
+                if (isinstance(entry, dict) and isinstance(entry.get('rates'), dict)
+                        and isinstance(entry.get('timestamp'), (int, float))):
+                    self._entries[base] = entry
+        return self._entries
+
+    def _save(self):
+        """原子写入缓存文件（调用时须持有锁）"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(prefix='.exchange_rates.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump({'version': _FORMAT_VERSION, 'entries': self._entries}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+    def get(self, base_currency):
+        """返回基准货币的缓存记录（字典），没有时返回 None"""
+        with self._lock:
+            return self._load().get(base_currency)
+
+    def put(self, base_currency, rates, timestamp, date=None):
+        """保存一条记录并写入磁盘"""
+        with self._lock:
+            self._load()[base_currency] = {'rates': rates, 'timestamp': timestamp, 'date': date}
+            self._save()
+
+    def clear(self):
+        """清空缓存并删除缓存文件"""
+        with self._lock:
+            self._entries = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def timestamps(self):
+        """{基准货币: 获取时间}"""
+        with self._lock:
+            return {base: entry['timestamp'] for base, entry in self._load().items()}
+
+    @property
+    def loaded(self):
+        """缓存文件是否已经读取"""
+        return self._entries is not None
+
+    def __repr__(self):
+        return f"RateStore(path={self.path!r}, loaded={self.loaded})"
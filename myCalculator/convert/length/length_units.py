@@ -1,12 +1,19 @@
 """
 长度单位换算模块
-实现英尺、英寸与米之间的相互转换
+支持公制、英制/美制、航海和天文长度单位，以及面积、体积单位之间的换算（见 unit_registry）
 标准换算公式：
 1 英尺 = 0.3048 米
 1 英寸 = 0.0254 米
 1 英尺 = 12 英寸
+
+换算结果始终是数值，显示用的文字（如 "3英尺 3.37英寸"）由 format_result / format_feet_inches 生成
 """
 
+from utils.error_handling import (ERROR_INVALID_NUMBER, ERROR_NEGATIVE_VALUE, ERROR_UNSUPPORTED_UNIT,
+                                  ERROR_DIMENSION_MISMATCH)
+from utils.result import Result, failure, parse_number
+from .unit_registry import length_units
+
 class LengthConverter:
     """长度单位转换类"""
 
@@ -17,6 +24,9 @@ class LengthConverter:
     METER_TO_FOOT = 1.0 / FOOT_TO_METER  # 约等于 3.28084
     METER_TO_INCH = 1.0 / INCH_TO_METER  # 约等于 39.3701
 
+    # 单位注册表（含预先计算的换算矩阵）
+    registry = length_units
+
     @staticmethod
     def foot_to_meter(feet, inches=0):
         """
@@ -185,17 +195,14 @@ class LengthConverter:
 
         Args:
             value: 要转换的数值
-            from_unit: 源单位 ('meter', 'foot', 'inch')
-            to_unit: 目标单位 ('meter', 'foot', 'inch')
+            from_unit: 源单位（如 'meter'、'ft'、'nautical_mile'、'square_foot'、'liter'）
+            to_unit: 目标单位，量纲须与源单位相同
 
         Returns:
-            转换后的数值，如果是转换单位组合，返回字典
+            转换后的数值（float），显示文字用 format_result 生成
         """
         try:
-            # 验证输入单位
-            valid_units = ['meter', 'foot', 'inch']
-            if from_unit not in valid_units or to_unit not in valid_units:
-                raise ValueError("不支持的长度单位。支持的单位: meter, foot, inch")
+            factor = LengthConverter.registry.factor(from_unit, to_unit)
 
             value = float(value)
 
@@ -203,50 +210,111 @@ class LengthConverter:
             if value < 0:
                 raise ValueError("长度不能为负数")
 
-            # 如果源单位和目标单位相同，直接返回
-            if from_unit == to_unit:
-                return value
+            return value * factor
 
-            # 转换逻辑
-            if from_unit == 'meter' and to_unit == 'foot':
-                result = LengthConverter.meter_to_foot(value)
-                return f"{result['feet']}英尺 {result['inches']}英寸"
+        except Exception as e:
+            raise ValueError(f"长度转换错误: {str(e)}")
 
-            elif from_unit == 'meter' and to_unit == 'inch':
-                return LengthConverter.meter_to_inch(value)
+    @staticmethod
+    def try_convert(value, from_unit, to_unit):
+        """通用长度转换的不抛出异常版本：先校验输入，出错时返回带错误码的 Result 而不抛出异常
 
-            elif from_unit == 'foot' and to_unit == 'meter':
-                return LengthConverter.foot_to_meter(value)
+        Returns:
+            Result，成功时 value 与 convert 的返回值相同
+        """
+        registry = LengthConverter.registry
+        source = registry.find(from_unit)
+        target = registry.find(to_unit)
+        if source is None or target is None:
+            return failure(ERROR_UNSUPPORTED_UNIT)
+        factor = registry.matrix[source][target]
+        if factor is None:
+            return failure(ERROR_DIMENSION_MISMATCH)
+        value = parse_number(value)
+        if value is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if value < 0:
+            return failure(ERROR_NEGATIVE_VALUE)
+        return Result(value * factor)
 
-            elif from_unit == 'foot' and to_unit == 'inch':
-                return LengthConverter.foot_to_inch(value)
+    @staticmethod
+    def convert_array(values, from_unit, to_unit):
+        """数组长度换算（一次乘法），见 bulk_length.convert_array
 
-            elif from_unit == 'inch' and to_unit == 'meter':
-                return LengthConverter.inch_to_meter(value)
+        Returns:
+            ArrayResult，无效元素在 mask 中标出
+        """
+        from .bulk_length import convert_array
+        return convert_array(values, from_unit, to_unit)
 
-            elif from_unit == 'inch' and to_unit == 'foot':
-                return LengthConverter.inch_to_foot(value)
+    @staticmethod
+    def convert_csv_column(source, target, column, from_unit, to_unit, inch_column=None, **options):
+        """流式改写 CSV 文件中的一列长度数据，见 bulk_length.convert_csv_column
 
-            else:
-                raise ValueError("不支持的转换类型")
+        Returns:
+            {'rows': 数据行数, 'converted': 换算成功的行数, 'invalid': 无法换算的行数}
+        """
+        from .bulk_length import convert_csv_column
+        return convert_csv_column(source, target, column, from_unit, to_unit, inch_column, **options)
 
-        except Exception as e:
-            raise ValueError(f"长度转换错误: {str(e)}")
+    @staticmethod
+    def format_result(value, unit, digits=10):
+        """
+        把换算结果格式化为显示文字
+
+        Args:
+            value: 数值
+            unit: 单位名称
+            digits: 有效数字位数
+
+        Returns:
+            如 "3.280839895 英尺"
+        """
+        return f"{value:.{digits}g} {LengthConverter.registry.label(unit)}"
+
+    @staticmethod
+    def format_feet_inches(feet, decimals=2):
+        """
+        把英尺数格式化为 "X英尺 Y英寸"
+
+        Args:
+            feet: 英尺数
+            decimals: 英寸保留的小数位数
+
+        Returns:
+            显示文字，英寸四舍五入到 12 时进位到英尺
+        """
+        whole_feet = int(feet)
+        inches = round((feet - whole_feet) * LengthConverter.FOOT_TO_INCH, decimals)
+        if inches >= LengthConverter.FOOT_TO_INCH:
+            whole_feet += 1
+            inches = 0.0
+        return f"{whole_feet}英尺 {inches}英寸"
+
+    @staticmethod
+    def get_supported_units(dimension=None):
+        """获取支持的单位列表（dimension 为 1、2、3 时只返回长度、面积或体积单位）"""
+        return LengthConverter.registry.units(dimension)
 
     @staticmethod
-    def get_supported_units():
-        """获取支持的长度单位列表"""
-        return ['meter', 'foot', 'inch']
+    def get_unit_labels(dimension=None):
+        """获取 {中文名称: 单位名称}，按登记顺序排列"""
+        registry = LengthConverter.registry
+        return {registry.label(name): name for name in registry.units(dimension)}
 
     @staticmethod
     def get_conversion_info():
         """获取换算信息"""
+        convert = LengthConverter.registry.convert
         return {
-            '1 英尺': '0.3048 米',
+            '1 英尺': '0.3048 米 = 12 英寸',
             '1 英寸': '0.0254 米',
-            '1 英尺': '12 英寸',
-            '1 米': f'{LengthConverter.METER_TO_FOOT:.5f} 英尺',
-            '1 米': f'{LengthConverter.METER_TO_INCH:.4f} 英寸'
+            '1 米': f'{LengthConverter.METER_TO_FOOT:.5f} 英尺 = {LengthConverter.METER_TO_INCH:.4f} 英寸',
+            '1 英里': f'{convert(1, "mile", "kilometer"):g} 千米',
+            '1 海里': '1852 米',
+            '1 光年': f'{convert(1, "light_year", "astronomical_unit"):.1f} 天文单位',
+            '1 英亩': f'{convert(1, "acre", "square_meter"):.2f} 平方米',
+            '1 美制加仑': f'{convert(1, "us_gallon", "liter"):.4f} 升'
         }
 
 # 创建全局实例
@@ -0,0 +1,225 @@
+"""
+长度单位注册表模块
+登记公制、英制/美制、航海和天文长度单位，以及由长度的幂（量纲指数）得到的面积、体积单位。
+
+每个单位记录换算到国际单位（米、平方米、立方米）的精确系数（分数），
+注册表把任意两个单位之间的换算系数预先计算为稠密矩阵，换算只需查表和一次乘法；
+量纲不同的单位之间矩阵元素为 None。
+"""
+
+import math
+from fractions import Fraction
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 量纲指数对应的物理量，以及派生单位的中文前缀
+DIMENSION_NAMES = {1: '长度', 2: '面积', 3: '体积'}
+_POWER_LABELS = {2: '平方', 3: '立方'}
+
+# 单位名称中的幂写法
+_POWER_SUFFIXES = (('**', '^'), ('²', '^2'), ('³', '^3'))
+_POWER_PREFIXES = (('square_', 2), ('sq_', 2), ('cubic_', 3), ('cu_', 3))
+
+
+class Unit:
+    """单位：名称、换算到国际单位的系数、量纲指数、中文名称和所属制式"""
+
+    __slots__ = ('name', 'factor', 'dimension', 'label', 'system')
+
+    def __init__(self, name, factor, dimension, label, system):
+        self.name = name
+        self.factor = factor
+        self.dimension = dimension
+        self.label = label
+        self.system = system
+
+    def __repr__(self):
+        return f"Unit({self.name!r}, factor={float(self.factor):g}, dimension={self.dimension})"
+
+
+class UnitRegistry:
+    """单位注册表，线性单位自动派生平方和立方单位"""
+
+    def __init__(self):
+        self._units = []
+        self._index = {}
+        self._matrix = None
+        self._array = None
+
+    def define(self, name, factor, dimension=1, label=None, system=None, aliases=()):
+        """登记单位
+
+        Args:
+            name: 单位名称（英文，小写）
+            factor: 1 单位等于多少米（面积为平方米，体积为立方米），
+                    可为分数、整数或十进制字符串，用于精确计算换算系数
+            dimension: 量纲指数，1 为长度，2 为面积，3 为体积
+            label: 中文名称
+            system: 制式，如 'metric'、'imperial'、'nautical'、'astronomical'
+            aliases: 别名（如符号 'm'、'ft'）
+
+        长度单位同时登记 "名称^2" 和 "名称^3"（别名同样派生），
+        也可写作 square_名称、cubic_名称、名称²、名称³。
+        """
+        if dimension not in DIMENSION_NAMES:
+            raise ValueError("量纲指数必须为 1、2 或 3")
+        factor = Fraction(factor)
+        if factor <= 0:
+            raise ValueError("换算系数必须为正数")
+        label = label or name
+        self._add(Unit(name, factor, dimension, label, system), aliases)
+        if dimension == 1:
+            for power, prefix in _POWER_LABELS.items():
+                self._add(Unit(f"{name}^{power}", factor ** power, power, prefix + label, system),
+                          [f"{alias}^{power}" for alias in aliases])
+
+    def _add(self, unit, aliases):
+        key = unit.name.lower()
+        if key in self._index:
+            raise ValueError(f"单位 {unit.name} 已存在")
+        self._index[key] = len(self._units)
+        for alias in aliases:
+            if alias.lower() in self._index:
+                raise ValueError(f"单位别名 {alias} 已存在")
+            self._index[alias.lower()] = len(self._units)
+        self._units.append(unit)
+        # 登记新单位后矩阵在下次换算时重建
+        self._matrix = None
+        self._array = None
+
+    def _normalize(self, name):
+        """统一单位名称的写法：小写、空格换下划线、幂写成 ^n"""
+        key = str(name).strip().lower().replace(' ', '_')
+        for old, new in _POWER_SUFFIXES:
+            key = key.replace(old, new)
+        for prefix, power in _POWER_PREFIXES:
+            if key.startswith(prefix):
+                return f"{key[len(prefix):]}^{power}"
+        return key
+
+    def find(self, name):
+        """单位在矩阵中的序号，未知单位返回 None"""
+        position = self._index.get(name)
+        if position is None:
+            position = self._index.get(self._normalize(name))
+        return position
+
+    def index(self, name):
+        """单位在矩阵中的序号，未知单位抛出 ValueError"""
+        position = self.find(name)
+        if position is None:
+            raise ValueError(f"不支持的单位: {name}")
+        return position
+
+    def get(self, name):
+        """返回 Unit 对象"""
+        return self._units[self.index(name)]
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def __len__(self):
+        return len(self._units)
+
+    def units(self, dimension=None, system=None):
+        """按登记顺序返回单位名称列表，可按量纲指数和制式筛选"""
+        return [unit.name for unit in self._units
+                if (dimension is None or unit.dimension == dimension)
+                and (system is None or unit.system == system)]
+
+    @property
+    def matrix(self):
+        """稠密换算矩阵：matrix[i][j] 为 1 个单位 i 等于多少单位 j，量纲不同时为 None"""
+        if self._matrix is None:
+            units = self._units
+            # 先用分数计算比值再转为浮点数，例如英尺到英寸恰好是 12.0
+            self._matrix = [[float(source.factor / target.factor)
+                             if source.dimension == target.dimension else None
+                             for target in units]
+                            for source in units]
+        return self._matrix
+
+    def array(self):
+        """换算矩阵的 NumPy 版本，量纲不同处为 NaN"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("需要安装 numpy")
+        if self._array is None:
+            self._array = np.array([[math.nan if factor is None else factor for factor in row]
+                                    for row in self.matrix])
+        return self._array
+
+    def factor(self, from_unit, to_unit):
+        """1 个 from_unit 等于多少 to_unit"""
+        factor = self.matrix[self.index(from_unit)][self.index(to_unit)]
+        if factor is None:
+            source = self.get(from_unit)
+            target = self.get(to_unit)
+            raise ValueError(f"{source.label}（{DIMENSION_NAMES[source.dimension]}）不能换算为"
+                             f"{target.label}（{DIMENSION_NAMES[target.dimension]}）")
+        return factor
+
+    def convert(self, value, from_unit, to_unit):
+        """数值换算：查矩阵后做一次乘法"""
+        return value * self.factor(from_unit, to_unit)
+
+    def label(self, name):
+        """单位的中文名称"""
+        return self._units[self.index(name)].label
+
+
+def _default_registry():
+    registry = UnitRegistry()
+    # 公制
+    for name, factor, label, aliases in (
+            ('nanometer', '1e-9', '纳米', ('nm',)),
+            ('micrometer', '1e-6', '微米', ('um', 'μm', 'micron')),
+            ('millimeter', '0.001', '毫米', ('mm',)),
+            ('centimeter', '0.01', '厘米', ('cm',)),
+            ('decimeter', '0.1', '分米', ('dm',)),
+            ('meter', 1, '米', ('m', 'metre')),
+            ('kilometer', 1000, '千米', ('km', 'kilometre'))):
+        registry.define(name, factor, label=label, system='metric', aliases=aliases)
+    # 英制/美制（1959 年国际码定义）
+    for name, factor, label, aliases in (
+            ('thou', '0.0000254', '密耳', ('mil',)),
+            ('inch', '0.0254', '英寸', ('in',)),
+            ('foot', '0.3048', '英尺', ('ft', 'feet')),
+            ('yard', '0.9144', '码', ('yd',)),
+            ('chain', '20.1168', '链', ('ch',)),
+            ('furlong', '201.168', '浪', ('fur',)),
+            ('mile', '1609.344', '英里', ('mi',))):
+        registry.define(name, factor, label=label, system='imperial', aliases=aliases)
+    # 航海
+    for name, factor, label, aliases in (
+            ('fathom', '1.8288', '英寻', ('ftm',)),
+            ('cable', '185.2', '链（航海）', ()),
+            ('nautical_mile', 1852, '海里', ('nmi',))):
+        registry.define(name, factor, label=label, system='nautical', aliases=aliases)
+    # 天文（天文单位按 IAU 2012 定义，秒差距为 648000/π 天文单位）
+    astronomical_unit = 149597870700
+    for name, factor, label, aliases in (
+            ('astronomical_unit', astronomical_unit, '天文单位', ('au',)),
+            ('light_year', 9460730472580800, '光年', ('ly',)),
+            ('parsec', Fraction(648000 * astronomical_unit) / Fraction(math.pi), '秒差距', ('pc',))):
+        registry.define(name, factor, label=label, system='astronomical', aliases=aliases)
+    # 有专门名称的面积和体积单位
+    for name, factor, dimension, label, system, aliases in (
+            ('are', 100, 2, '公亩', 'metric', ('a',)),
+            ('hectare', 10000, 2, '公顷', 'metric', ('ha',)),
+            ('acre', '4046.8564224', 2, '英亩', 'imperial', ('ac',)),
+            ('milliliter', '1e-6', 3, '毫升', 'metric', ('ml',)),
+            ('liter', '0.001', 3, '升', 'metric', ('l', 'litre')),
+            ('us_fluid_ounce', '0.0000295735295625', 3, '美制液量盎司', 'imperial', ('fl_oz',)),
+            ('us_gallon', '0.003785411784', 3, '美制加仑', 'imperial', ('gal',)),
+            ('imperial_gallon', '0.00454609', 3, '英制加仑', 'imperial', ('imp_gal',))):
+        registry.define(name, factor, dimension, label, system, aliases)
+    return registry
+
+
+# 创建全局实例
+length_units = _default_registry()
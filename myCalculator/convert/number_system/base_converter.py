@@ -1,86 +1,344 @@
 """
 进制换算模块
-支持十进制、二进制、八进制、十六进制之间的相互转换
+支持 2 到 36 任意进制之间的相互转换（整数和小数，小数按有理数精确转换）
+
+大整数按进制的幂递归二分，幂次缓存复用，除法使用基于乘法的分治算法，
+百万位数字的转换在次二次时间内完成；循环小数用括号标出循环节，如 0.1(6)。
 """
 
+import math
+import threading
+from fractions import Fraction
+
+from utils.error_handling import (ERROR_MESSAGES, ERROR_INVALID_NUMBER, ERROR_INVALID_DIGIT,
+                                  ERROR_UNSUPPORTED_BASE)
+from utils.result import Result, failure
+
+MIN_BASE = 2
+MAX_BASE = 36
+
+# 数字字符，大于9的数字用大写字母表示
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# 各进制允许的数字字符（不区分大小写）
+_BASE_DIGITS = {base: frozenset(DIGITS[:base] + DIGITS[10:base].lower())
+                for base in range(MIN_BASE, MAX_BASE + 1)}
+
+# 小数部分（含循环节）默认最多输出的位数，超出时截断并以 "..." 结尾
+MAX_FRACTION_DIGITS = 256
+
+# 递归二分的叶子位数：不超过该位数时直接使用内置转换（须小于 Python 的 4300 位限制）
+_LEAF_DIGITS = 512
+
+# 除数小于该比特数时直接使用内置 divmod
+_DIV_LIMIT_BITS = 4000
+
+# 进制的幂缓存：base -> [base^(叶子位数 * 2^i), ...]
+_power_cache = {}
+_power_lock = threading.Lock()
+
+# 进制的质因数，用于计算有理数在该进制下的非循环位数
+_BASE_PRIMES = {base: tuple(p for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31)
+                            if base % p == 0)
+                for base in range(MIN_BASE, MAX_BASE + 1)}
+
+# 2 的幂进制每个数字对应的比特数
+_POWER_OF_TWO_BITS = {2: 1, 4: 2, 8: 3, 16: 4, 32: 5}
+
+
+def _powers(base, bits):
+    """返回进制的幂列表，最后一项的平方超过 2^bits"""
+    with _power_lock:
+        powers = _power_cache.setdefault(base, [base ** _LEAF_DIGITS])
+        while powers[-1].bit_length() * 2 <= bits + 1:
+            powers.append(powers[-1] * powers[-1])
+        count = 1
+        while count < len(powers) and powers[count - 1].bit_length() * 2 <= bits + 1:
+            count += 1
+        return powers[:count]
+
+
+def _div2n1n(a, b, n):
+    """分治除法（Burnikel-Ziegler）：b 恰好 n 位，a < 2^n * b，返回 (a // b, a % b)"""
+    if a.bit_length() - n <= _DIV_LIMIT_BITS:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half = n >> 1
+    mask = (1 << half) - 1
+    b1, b2 = b >> half, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half) & mask, b, b1, b2, half)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half)
+    if pad:
+        r >>= 1
+    return q1 << half | q2, r
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+
+def _divmod(a, b):
+    """非负整数的除法，大数时用分治除法代替内置的二次复杂度除法"""
+    n = b.bit_length()
+    if n <= _DIV_LIMIT_BITS or a.bit_length() - n <= _DIV_LIMIT_BITS:
+        return divmod(a, b)
+    if a.bit_length() <= 2 * n:
+        if a >> n < b:
+            return _div2n1n(a, b, n)
+    # 被除数过长时按 2^n 进制逐段做长除法
+    mask = (1 << n) - 1
+    chunks = []
+    while a:
+        chunks.append(a & mask)
+        a >>= n
+    quotient = 0
+    remainder = 0
+    for chunk in reversed(chunks):
+        digit, remainder = _div2n1n((remainder << n) | chunk, b, n)
+        quotient = (quotient << n) | digit
+    return quotient, remainder
+
+
+def _leaf_to_digits(n, base):
+    """不超过叶子位数的非负整数转换为数字串"""
+    if base == 10:
+        return str(n)
+    if n < base:
+        return DIGITS[n]
+    digits = []
+    while n:
+        n, digit = divmod(n, base)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def _power_of_two_digits(n, base):
+    """2 的幂进制直接按比特分组转换（线性时间）"""
+    if base == 2:
+        return format(n, 'b')
+    if base == 8:
+        return format(n, 'o')
+    if base == 16:
+        return format(n, 'X')
+    bits = _POWER_OF_TWO_BITS[base]
+    binary = format(n, 'b')
+    binary = binary.zfill(-(-len(binary) // bits) * bits)
+    return ''.join(DIGITS[int(binary[i:i + bits], 2)] for i in range(0, len(binary), bits))
+
+
+def integer_to_digits(n, base):
+    """非负整数转换为指定进制的数字串（大写字母）"""
+    if n < 0:
+        raise ValueError("只能转换非负整数")
+    if base in _POWER_OF_TWO_BITS:
+        return _power_of_two_digits(n, base)
+    powers = _powers(base, n.bit_length())
+    if n < powers[0]:
+        return _leaf_to_digits(n, base)
+
+    parts = []
+
+    def split(value, level, width):
+        # width 为需要补足的位数（0 表示最高位部分，不补零）
+        if level < 0:
+            text = _leaf_to_digits(value, base) if value else ''
+            parts.append(text.rjust(width, '0') if width else text)
+            return
+        power = powers[level]
+        if value < power and not width:
+            split(value, level - 1, 0)
+            return
+        high, low = _divmod(value, power)
+        low_width = _LEAF_DIGITS << level
+        split(high, level - 1, width - low_width if width else 0)
+        split(low, level - 1, low_width)
+
+    split(n, len(powers) - 1, 0)
+    return ''.join(parts) or '0'
+
+
+def digits_to_integer(text, base):
+    """指定进制的数字串转换为非负整数（调用前已校验字符）"""
+    if base in _POWER_OF_TWO_BITS or len(text) <= _LEAF_DIGITS:
+        return int(text, base) if text else 0
+    powers = _powers(base, int(len(text) * base.bit_length()))
+
+    def join(digits):
+        if len(digits) <= _LEAF_DIGITS:
+            return int(digits, base)
+        # 低位部分取不小于一半的最小叶子位数 * 2^level，幂次可复用缓存
+        level = 0
+        while (_LEAF_DIGITS << (level + 1)) < len(digits):
+            level += 1
+        width = _LEAF_DIGITS << level
+        return join(digits[:-width]) * powers[level] + join(digits[-width:])
+
+    return join(text)
+
+
+def _valuation(n, p):
+    """n 中质因数 p 的次数，返回 (次数, n / p^次数)"""
+    if p == 2:
+        count = (n & -n).bit_length() - 1
+        return count, n >> count
+    count = 0
+    powers = [p]
+    while n % powers[-1] == 0:
+        n //= powers[-1]
+        count += 1 << (len(powers) - 1)
+        powers.append(powers[-1] * powers[-1])
+    for i in range(len(powers) - 2, -1, -1):
+        if n % powers[i] == 0:
+            n //= powers[i]
+            count += 1 << i
+    return count, n
+
+
+def fraction_to_digits(numerator, denominator, base, max_digits=MAX_FRACTION_DIGITS):
+    """0 <= numerator/denominator < 1 的小数部分转换为指定进制
+
+    先由分母中与进制共有的质因数算出非循环位数，剩余分母中
+    进制的乘法阶就是循环节长度，两部分都用整数运算一次求出。
+
+    Returns:
+        (非循环部分, 循环节, 是否被截断)
+    """
+    if numerator == 0:
+        return '', '', False
+
+    # 非循环位数：分母中每个质因数 p 需要 ceil(v_p(分母) / v_p(进制)) 位
+    coprime = denominator
+    prefix_length = 0
+    for p in _BASE_PRIMES[base]:
+        count, coprime = _valuation(coprime, p)
+        base_count, _ = _valuation(base, p)
+        prefix_length = max(prefix_length, -(-count // base_count))
+
+    if prefix_length >= max_digits:
+        digits, _ = _divmod(numerator * base ** max_digits, denominator)
+        return integer_to_digits(digits, base).rjust(max_digits, '0'), '', True
+
+    prefix, remainder = _divmod(numerator * base ** prefix_length, denominator)
+    prefix = integer_to_digits(prefix, base).rjust(prefix_length, '0') if prefix_length else ''
+    if remainder == 0:
+        return prefix, '', False
+
+    # 循环节长度为 base 模 coprime 的乘法阶，超过剩余位数时截断
+    limit = max_digits - prefix_length
+    period = 1
+    power = base % coprime
+    while power != 1 and period < limit:
+        power = power * base % coprime
+        period += 1
+    if power != 1:
+        digits, _ = _divmod(remainder * base ** limit, denominator)
+        return prefix, integer_to_digits(digits, base).rjust(limit, '0'), True
+
+    # remainder/denominator = repeating/(base^period - 1)
+    repeating, _ = _divmod(remainder * (base ** period - 1), denominator)
+    return prefix, integer_to_digits(repeating, base).rjust(period, '0'), False
+
+
+def _split_number(text, base):
+    """把数字串拆分为 (错误码, (负号, 整数部分, 非循环小数, 循环节))
+
+    支持可选的正负号、小数点和括号标出的循环节，如 "-12.3(45)"。
+    """
+    if not isinstance(base, int) or not MIN_BASE <= base <= MAX_BASE:
+        return ERROR_UNSUPPORTED_BASE, None
+    if not isinstance(text, str):
+        text = str(text)
+    text = text.strip()
+    negative = text.startswith('-')
+    if text[:1] in '+-':
+        text = text[1:]
+    integer_part, point, fraction_part = text.partition('.')
+    repeating = ''
+    if fraction_part.endswith(')') and '(' in fraction_part:
+        fraction_part, _, repeating = fraction_part[:-1].partition('(')
+        if not repeating:
+            return ERROR_INVALID_NUMBER, None
+    if not integer_part and not fraction_part and not repeating:
+        return ERROR_INVALID_NUMBER, None
+    digits = _BASE_DIGITS[base]
+    for part in (integer_part, fraction_part, repeating):
+        if not digits.issuperset(part):
+            return ERROR_INVALID_DIGIT, None
+    return 0, (negative, integer_part, fraction_part, repeating)
+
+
+def _parts_to_fraction(parts, base):
+    """把 _split_number 的结果转换为 (分子, 分母)"""
+    negative, integer_part, fraction_part, repeating = parts
+    numerator = digits_to_integer(integer_part + fraction_part, base)
+    denominator = base ** len(fraction_part)
+    if repeating:
+        cycle = base ** len(repeating) - 1
+        numerator = numerator * cycle + digits_to_integer(repeating, base)
+        denominator *= cycle
+    return (-numerator if negative else numerator), denominator
+
+
+def format_in_base(numerator, denominator, base, max_fraction_digits=MAX_FRACTION_DIGITS):
+    """把有理数 numerator/denominator 格式化为指定进制的字符串"""
+    if denominator == 0:
+        raise ValueError("分母不能为零")
+    sign = '-' if (numerator < 0) != (denominator < 0) and numerator != 0 else ''
+    numerator, denominator = abs(numerator), abs(denominator)
+    # 约分后非循环位数和循环节长度才是最短的
+    common = math.gcd(numerator, denominator)
+    if common > 1:
+        numerator //= common
+        denominator //= common
+    integer, remainder = _divmod(numerator, denominator)
+    text = sign + integer_to_digits(integer, base)
+    if remainder:
+        prefix, repeating, truncated = fraction_to_digits(remainder, denominator, base,
+                                                          max_fraction_digits)
+        text += '.' + prefix
+        if truncated:
+            text += repeating + '...'
+        elif repeating:
+            text += f"({repeating})"
+    return text
+
+
 class NumberSystemConverter:
     """进制转换类"""
 
     @staticmethod
     def decimal_to_binary(decimal_num):
-        """十进制转二进制"""
+        """十进制转二进制（小数部分精确转换，循环节用括号标出）"""
         try:
-            if isinstance(decimal_num, str):
-                decimal_num = float(decimal_num)
-
-            # 处理小数部分
-            if isinstance(decimal_num, float) and not decimal_num.is_integer():
-                integer_part = int(decimal_num)
-                fractional_part = decimal_num - integer_part
-
-                # 转换整数部分
-                binary_integer = bin(integer_part)[2:]
-
-                # 转换小数部分（最多8位）
-                binary_fractional = NumberSystemConverter._fractional_to_base(
-                    fractional_part, 2, 8
-                )
-
-                return binary_integer + binary_fractional if binary_fractional else binary_integer
-            else:
-                return bin(int(decimal_num))[2:]
+            return NumberSystemConverter.from_number(decimal_num, 2)
         except Exception as e:
             raise ValueError(f"十进制转二进制错误: {str(e)}")
 
     @staticmethod
     def decimal_to_octal(decimal_num):
-        """十进制转八进制"""
+        """十进制转八进制（小数部分精确转换，循环节用括号标出）"""
         try:
-            if isinstance(decimal_num, str):
-                decimal_num = float(decimal_num)
-
-            # 处理小数部分
-            if isinstance(decimal_num, float) and not decimal_num.is_integer():
-                integer_part = int(decimal_num)
-                fractional_part = decimal_num - integer_part
-
-                # 转换整数部分
-                octal_integer = oct(integer_part)[2:]
-
-                # 转换小数部分（最多8位）
-                octal_fractional = NumberSystemConverter._fractional_to_base(
-                    fractional_part, 8, 8
-                )
-
-                return octal_integer + octal_fractional if octal_fractional else octal_integer
-            else:
-                return oct(int(decimal_num))[2:]
+            return NumberSystemConverter.from_number(decimal_num, 8)
         except Exception as e:
             raise ValueError(f"十进制转八进制错误: {str(e)}")
 
     @staticmethod
     def decimal_to_hexadecimal(decimal_num):
-        """十进制转十六进制"""
+        """十进制转十六进制（小数部分精确转换，循环节用括号标出）"""
         try:
-            if isinstance(decimal_num, str):
-                decimal_num = float(decimal_num)
-
-            # 处理小数部分
-            if isinstance(decimal_num, float) and not decimal_num.is_integer():
-                integer_part = int(decimal_num)
-                fractional_part = decimal_num - integer_part
-
-                # 转换整数部分
-                hex_integer = hex(integer_part)[2:].upper()
-
-                # 转换小数部分（最多8位）
-                hex_fractional = NumberSystemConverter._fractional_to_base(
-                    fractional_part, 16, 8
-                )
-
-                return hex_integer + hex_fractional if hex_fractional else hex_integer
-            else:
-                return hex(int(decimal_num))[2:].upper()
+            return NumberSystemConverter.from_number(decimal_num, 16)
         except Exception as e:
             raise ValueError(f"十进制转十六进制错误: {str(e)}")
 
@@ -167,72 +425,126 @@ class NumberSystemConverter:
             raise ValueError(f"十六进制转十进制错误: {str(e)}")
 
     @staticmethod
-    def convert(number, from_base, to_base):
+    def from_number(value, base, max_fraction_digits=MAX_FRACTION_DIGITS):
+        """把 int、float、Fraction、Decimal 或十进制字符串转换为指定进制
+
+        浮点数按最短十进制表示（repr）转换，0.1 得到的是 1/10 而不是其二进制近似值。
+        """
+        if not MIN_BASE <= base <= MAX_BASE:
+            raise ValueError(f"进制必须在 {MIN_BASE} 到 {MAX_BASE} 之间")
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                raise ValueError("无法转换无穷大或非数值")
+            value = repr(value)
+        if isinstance(value, str):
+            error, parts = _split_number(value, 10)
+            if not error:
+                numerator, denominator = _parts_to_fraction(parts, 10)
+                return format_in_base(numerator, denominator, base, max_fraction_digits)
+            # 科学计数法等其他十进制写法交给 Fraction 解析
+            value = Fraction(value.strip())
+        value = Fraction(value)
+        return format_in_base(value.numerator, value.denominator, base, max_fraction_digits)
+
+    @staticmethod
+    def to_fraction(number, base):
+        """把指定进制的数字串精确转换为 Fraction（整数时返回 int）"""
+        error, parts = _split_number(number, base)
+        if error:
+            raise ValueError(ERROR_MESSAGES[error])
+        numerator, denominator = _parts_to_fraction(parts, base)
+        if denominator == 1:
+            return numerator
+        return Fraction(numerator, denominator)
+
+    @staticmethod
+    def convert(number, from_base, to_base, max_fraction_digits=MAX_FRACTION_DIGITS):
         """通用进制转换函数
 
+        整数部分任意长度都精确转换；小数部分按有理数精确转换，
+        循环小数的循环节用括号标出（如十进制 0.1 转二进制为 0.0(0011)），
+        输入也可以使用同样的写法。小数部分超过 max_fraction_digits 位时截断并以 "..." 结尾。
+
         Args:
-            number: 要转换的数字（字符串）
-            from_base: 源进制（2, 8, 10, 16）
-            to_base: 目标进制（2, 8, 10, 16）
+            number: 要转换的数字（字符串），可带正负号
+            from_base: 源进制（2 到 36）
+            to_base: 目标进制（2 到 36）
+            max_fraction_digits: 小数部分最多输出的位数
 
         Returns:
-            转换后的数字字符串
+            转换后的数字字符串，大于9的数字用大写字母表示
         """
         try:
-            if from_base not in [2, 8, 10, 16] or to_base not in [2, 8, 10, 16]:
-                raise ValueError("只支持二进制、八进制、十进制、十六进制之间的转换")
-
-            # 先将源进制转换为十进制
-            if from_base == 10:
-                decimal_value = float(number) if '.' in str(number) else int(number)
-            elif from_base == 2:
-                decimal_value = NumberSystemConverter.binary_to_decimal(number)
-            elif from_base == 8:
-                decimal_value = NumberSystemConverter.octal_to_decimal(number)
-            elif from_base == 16:
-                decimal_value = NumberSystemConverter.hexadecimal_to_decimal(number)
-
-            # 再将十进制转换为目标进制
-            if to_base == 10:
-                return str(decimal_value)
-            elif to_base == 2:
-                return NumberSystemConverter.decimal_to_binary(decimal_value)
-            elif to_base == 8:
-                return NumberSystemConverter.decimal_to_octal(decimal_value)
-            elif to_base == 16:
-                return NumberSystemConverter.decimal_to_hexadecimal(decimal_value)
+            if not (MIN_BASE <= from_base <= MAX_BASE and MIN_BASE <= to_base <= MAX_BASE):
+                raise ValueError(f"只支持 {MIN_BASE} 到 {MAX_BASE} 进制之间的转换")
+
+            error, parts = _split_number(number, from_base)
+            if error:
+                raise ValueError(ERROR_MESSAGES[error])
+            numerator, denominator = _parts_to_fraction(parts, from_base)
+            return format_in_base(numerator, denominator, to_base, max_fraction_digits)
 
         except Exception as e:
             raise ValueError(f"进制转换错误: {str(e)}")
 
     @staticmethod
-    def _fractional_to_base(fractional, base, max_digits=8):
-        """将小数部分转换为指定进制
+    def try_convert(number, from_base, to_base):
+        """通用进制转换的不抛出异常版本：先校验输入，出错时返回带错误码的 Result 而不抛出异常
 
         Args:
-            fractional: 小数部分 (0 <= fractional < 1)
-            base: 目标进制
-            max_digits: 最大小数位数
+            number: 要转换的数字（字符串），写法与 convert 相同
+            from_base: 源进制（2 到 36）
+            to_base: 目标进制（2 到 36）
 
         Returns:
-            小数部分的字符串表示（不包含小数点）
+            Result，成功时 value 为转换后的数字字符串
         """
-        if fractional == 0:
-            return ""
+        if not isinstance(number, str):
+            return failure(ERROR_INVALID_NUMBER)
+        if not isinstance(to_base, int) or not MIN_BASE <= to_base <= MAX_BASE:
+            return failure(ERROR_UNSUPPORTED_BASE)
+        error, parts = _split_number(number, from_base)
+        if error:
+            return failure(error)
+        numerator, denominator = _parts_to_fraction(parts, from_base)
+        return Result(format_in_base(numerator, denominator, to_base))
 
-        result = []
-        remaining = fractional
+    @staticmethod
+    def convert_many(numbers, from_base, to_base, output='list', width=None):
+        """批量转换 64 位整数，见 bulk_converter.convert_many
 
-        for _ in range(max_digits):
-            remaining *= base
-            digit = int(remaining)
-            result.append(str(digit) if base < 10 else str(hex(digit))[2:].upper())
-            remaining -= digit
+        Args:
+            numbers: NumPy 整数数组或字符串序列
+            from_base: 源进制（2 到 36）
+            to_base: 目标进制（2 到 36）
+            output: 'list' 返回字符串列表，'bytes' 返回定宽字节缓冲区
+            width: 'bytes' 模式下每项的字节数
 
-            if remaining == 0:
-                break
+        Returns:
+            BulkConversionResult
+        """
+        from .bulk_converter import convert_many
+        return convert_many(numbers, from_base, to_base, output, width)
 
-        return '.' + ''.join(result) if result else ""
+    @staticmethod
+    def dump_file(source, target, base=16, row_bytes=16, offsets=True):
+        """把文件按定宽行转储为二进制、八进制或十六进制文本，见 byte_dump.dump_file
+
+        Returns:
+            写入的字节数
+        """
+        from .byte_dump import dump_file
+        return dump_file(source, target, base, row_bytes, offsets)
+
+    @staticmethod
+    def undump_file(source, target, base=16, offsets=True):
+        """把 dump_file 输出的文本还原为原文件，见 byte_dump.undump_file
+
+        Returns:
+            写入的字节数
+        """
+        from .byte_dump import undump_file
+        return undump_file(source, target, base, offsets)
 
     @staticmethod
     def validate_number(number_str, base):
@@ -240,35 +552,48 @@ class NumberSystemConverter:
 
         Args:
             number_str: 数字字符串
-            base: 进制（2, 8, 10, 16）
+            base: 进制（2 到 36）
 
         Returns:
             True if valid, False otherwise
         """
-        try:
-            if base == 2:
-                valid_chars = set('01.')
-            elif base == 8:
-                valid_chars = set('01234567.')
-            elif base == 10:
-                valid_chars = set('0123456789.')
-            elif base == 16:
-                valid_chars = set('0123456789ABCDEFabcdef.')
-            else:
-                return False
-
-            # 检查小数点数量
-            if number_str.count('.') > 1:
-                return False
-
-            # 检查每个字符
-            for char in number_str:
-                if char not in valid_chars:
-                    return False
-
-            return True
-        except:
+        if not isinstance(number_str, str) or not isinstance(base, int):
             return False
+        error, _ = _split_number(number_str, base)
+        return error == 0
 
 # 创建全局实例
-number_converter = NumberSystemConverter()
\ No newline at end of file
+number_converter = NumberSystemConverter()
+
+
+def benchmark_conversion(digit_counts=(10000, 100000, 1000000)):
+    """大整数在十进制字符串、整数和三进制字符串之间的转换耗时
+
+    Returns:
+        {位数: {阶段: 秒}}
+    """
+    import random
+    import time
+
+    results = {}
+    for count in digit_counts:
+        text = str(random.randint(1, 9)) + ''.join(random.choice(DIGITS[:10]) for _ in range(count - 1))
+        timings = {}
+        start = time.perf_counter()
+        value = digits_to_integer(text, 10)
+        timings['parse'] = time.perf_counter() - start
+        start = time.perf_counter()
+        integer_to_digits(value, 10)
+        timings['format'] = time.perf_counter() - start
+        start = time.perf_counter()
+        NumberSystemConverter.convert(text, 10, 3)
+        timings['base3'] = time.perf_counter() - start
+        results[count] = timings
+    return results
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m convert.number_system.base_converter
+    for count, timings in benchmark_conversion().items():
+        print(f"{count:>8} 位: 解析 {timings['parse']:.3f} s, 十进制输出 {timings['format']:.3f} s, "
+              f"十进制转三进制 {timings['base3']:.3f} s")
@@ -0,0 +1,382 @@
+"""
+批量进制转换模块
+NumberSystemConverter 的向量化版本：一次转换整批 64 位整数，
+输入可以是 NumPy 整数数组或字符串序列，输出为字符串列表或定宽字节缓冲区。
+
+字符校验对整批文本做一次 str.translate / bytes.translate，
+解析和格式化按数字位逐列计算，每列只做一次数组运算和查表。
+"""
+
+from core.math_ext.array_math import ArrayResult
+from .base_converter import DIGITS, MIN_BASE, MAX_BASE, NumberSystemConverter, integer_to_digits
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+_UINT64_MAX = (1 << 64) - 1
+_INT64_MAX = (1 << 63) - 1
+
+# 每个进制的合法字符（数字、负号和分隔用的换行），translate 时全部删除，剩下的就是非法字符
+_VALID_CHARACTERS = {base: DIGITS[:base] + DIGITS[10:base].lower() + '-\n'
+                     for base in range(MIN_BASE, MAX_BASE + 1)}
+_DELETE_TABLES = {base: str.maketrans('', '', characters)
+                  for base, characters in _VALID_CHARACTERS.items()}
+_DELETE_BYTES = {base: characters.encode('ascii') for base, characters in _VALID_CHARACTERS.items()}
+
+if NUMPY_AVAILABLE:
+    # 字符编码 -> 数字值，非数字字符为 255
+    _DIGIT_VALUES = np.full(256, 255, dtype=np.uint8)
+    for _value, _character in enumerate(DIGITS):
+        _DIGIT_VALUES[ord(_character)] = _value
+        _DIGIT_VALUES[ord(_character.lower())] = _value
+    # 数字值 -> 字符编码（大写）
+    _DIGIT_CODES = np.frombuffer(DIGITS.encode('ascii'), dtype=np.uint8)
+
+
+class BulkConversionResult(ArrayResult):
+    """批量转换结果
+
+    values 为字符串列表（出错位置为空字符串）、整数数组（出错位置为0）
+    或定宽字节缓冲区（每项 width 字节，出错位置填空格）；mask 为 True 表示该项无效或溢出。
+    """
+
+    def __init__(self, values, mask, width=None):
+        super().__init__(values, mask)
+        self.width = width
+
+    def __len__(self):
+        return len(self.mask)
+
+    def __repr__(self):
+        return f"BulkConversionResult(size={len(self)}, errors={self.error_count})"
+
+
+def _check_base(base):
+    if not isinstance(base, int) or not MIN_BASE <= base <= MAX_BASE:
+        raise ValueError(f"进制必须在 {MIN_BASE} 到 {MAX_BASE} 之间")
+
+
+def _digits_needed(base):
+    """64 位无符号整数在该进制下最多需要的位数"""
+    return len(integer_to_digits(_UINT64_MAX, base))
+
+
+def _join_valid(items, base):
+    """用 translate 校验整批文本，返回 (以换行分隔的 ASCII 字节串, 非法项掩码或 None)
+
+    先对拼接后的整批文本做一次 translate，并核对换行数与项数一致（项内含换行会多切出一项），
+    只有发现问题时才逐项检查，把含非法字符或换行的项替换为空串，保证返回的字节串中只有合法字符。
+    """
+    separators = len(items) - 1
+    if items and isinstance(items[0], (bytes, bytearray)):
+        delete = _DELETE_BYTES[base]
+        text = b'\n'.join(items)
+        if not text.translate(None, delete) and text.count(b'\n') == separators:
+            return text, None
+        invalid = [bool(item.translate(None, delete)) or b'\n' in item for item in items]
+        return b'\n'.join(b'' if bad else item for item, bad in zip(items, invalid)), invalid
+    table = _DELETE_TABLES[base]
+    text = '\n'.join(items)
+    if not text.translate(table) and text.count('\n') == separators:
+        return text.encode('ascii'), None
+    invalid = [bool(item.translate(table)) or '\n' in item for item in items]
+    return '\n'.join('' if bad else item for item, bad in zip(items, invalid)).encode('ascii'), invalid
+
+
+def parse_strings(items, base):
+    """把一批指定进制的数字串解析为 64 位整数
+
+    Args:
+        items: 字符串（或 bytes）序列、NumPy 字符串数组
+        base: 源进制（2 到 36），字母不区分大小写，可带前导负号
+
+    Returns:
+        BulkConversionResult，values 为 uint64 数组（有负数时为 int64；
+        同时有负数和超过 int64 的正数时为 Python 整数组成的 object 数组），
+        无效、为空或超出范围（-2^63 到 2^64-1）的项在 mask 中标出、值为0。
+        每一项是否有效只取决于它自己，与同一批中的其他项无关
+    """
+    parsed = _parse(items, base)
+    if not NUMPY_AVAILABLE:
+        return parsed
+    magnitude, negative, mask = parsed
+    if not negative.any():
+        values = magnitude
+    elif magnitude[~negative].max(initial=0) <= _INT64_MAX:
+        values = magnitude.astype(np.int64)
+        # -2^63 的绝对值转换为 int64 后仍是 -2^63，取负不变
+        np.negative(values, out=values, where=negative)
+    else:
+        values = magnitude.astype(object)
+        values[negative] = -values[negative]
+    return BulkConversionResult(values, mask)
+
+
+def _parse(items, base):
+    """解析一批数字串，有 NumPy 时返回 (绝对值 uint64 数组, 负数掩码, 无效掩码)"""
+    _check_base(base)
+    if NUMPY_AVAILABLE and isinstance(items, np.ndarray):
+        if items.dtype.kind not in 'SU':
+            raise ValueError("输入必须是字符串数组")
+        items = items.ravel().tolist()
+    else:
+        items = list(items)
+    text, invalid = _join_valid(items, base)
+
+    if not NUMPY_AVAILABLE:
+        return _parse_python(items, base, invalid)
+    if not items:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool), np.zeros(0, dtype=bool)
+
+    # 整批文本作为一个字节数组，按换行定位每一项的起止位置
+    buffer = np.frombuffer(text + b'\n', dtype=np.uint8)
+    ends = np.flatnonzero(buffer == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    negative = buffer[starts] == ord('-')
+    first = starts + negative
+    digit_counts = ends - first
+    max_digits = _digits_needed(base)
+    mask = (digit_counts <= 0) | (digit_counts > max_digits)
+    if invalid is not None:
+        mask |= np.asarray(invalid, dtype=bool)
+
+    # 把每项的数字部分右对齐到 columns 列，左侧补0（不影响 Horner 求值）
+    columns = int(min(max(digit_counts.max(), 0), max_digits))
+    source = ends[:, None] - columns + np.arange(columns)
+    in_number = (source >= first[:, None]) & ~mask[:, None]
+    digit_values = np.where(in_number, _DIGIT_VALUES[buffer[np.maximum(source, 0)]], 0)
+    # 非法字符（包括不在开头的负号）查表得 255
+    mask |= (digit_values >= base).any(axis=1)
+
+    # 逐列 Horner 求值：acc = acc * base + digit，同时检测 64 位溢出
+    accumulator = np.zeros(len(ends), dtype=np.uint64)
+    base64 = np.uint64(base)
+    for column in range(columns):
+        digit = digit_values[:, column].astype(np.uint64)
+        if column < max_digits - 1:
+            # 前 max_digits-1 位的值小于 base^(max_digits-1)，不会溢出
+            accumulator = accumulator * base64 + digit
+            continue
+        mask |= accumulator > np.uint64(_UINT64_MAX // base)
+        accumulator *= base64
+        mask |= accumulator > np.uint64(_UINT64_MAX) - digit
+        accumulator += digit
+
+    # 负数的绝对值最大为 2^63，非负数最大为 2^64-1
+    mask |= negative & (accumulator > np.uint64(_INT64_MAX + 1))
+    accumulator[mask] = 0
+    negative &= ~mask
+    return accumulator, negative, mask
+
+
+def _parse_python(items, base, invalid):
+    """无 NumPy 时逐项解析"""
+    values = []
+    mask = []
+    for index, item in enumerate(items):
+        if isinstance(item, (bytes, bytearray)):
+            item = item.decode('ascii', errors='replace')
+        negative = item.startswith('-')
+        digits = item[1:] if negative else item
+        bad = (invalid is not None and invalid[index]) or not digits or '-' in digits
+        value = 0 if bad else int(digits, base)
+        if not bad and value > (_INT64_MAX + 1 if negative else _UINT64_MAX):
+            bad = True
+            value = 0
+        values.append(-value if negative else value)
+        mask.append(bad)
+    return BulkConversionResult(values, mask)
+
+
+def format_integers(values, base, output='list', width=None):
+    """把一批整数格式化为指定进制的数字串（大写字母）
+
+    从最低位开始每轮用一次数组除法（2 的幂进制用移位和掩码）取出所有数的同一位，
+    再查表得到字符编码，整块拼接后一次解码。
+
+    Args:
+        values: NumPy 整数数组或整数序列（-2^63 到 2^64-1）
+        base: 目标进制（2 到 36）
+        output: 'list' 返回字符串列表；'bytes' 返回定宽字节缓冲区（右对齐、前补0）
+        width: 'bytes' 模式下每项的字节数，默认为最长一项的长度
+
+    Returns:
+        BulkConversionResult
+    """
+    _check_base(base)
+    if output not in ('list', 'bytes'):
+        raise ValueError("output 必须是 'list' 或 'bytes'")
+    if not NUMPY_AVAILABLE:
+        return _format_python(values, base, output, width)
+
+    array = np.asarray(values)
+    if array.dtype.kind == 'O':
+        # Python 大整数组成的列表或数组，可以同时有负数和超过 int64 的正数
+        numbers = [int(value) for value in array.ravel()]
+        if numbers and min(numbers) < -_INT64_MAX - 1:
+            raise ValueError("整数超出 64 位范围")
+        negative = np.array([value < 0 for value in numbers], dtype=bool)
+        magnitude = np.array([abs(value) for value in numbers], dtype=np.uint64)
+        return _format_magnitudes(magnitude, negative, base, output, width)
+    if array.dtype.kind not in 'iu':
+        raise ValueError("输入必须是整数数组")
+    array = array.ravel()
+
+    if array.dtype.kind == 'i':
+        negative = array < 0
+        # 取绝对值时经过 uint64，-2^63 也不会溢出
+        magnitude = np.where(negative, -(array.astype(np.int64).astype(np.uint64)),
+                             array.astype(np.uint64))
+    else:
+        negative = np.zeros(len(array), dtype=bool)
+        magnitude = array.astype(np.uint64)
+    return _format_magnitudes(magnitude, negative, base, output, width)
+
+
+def _format_magnitudes(magnitude, negative, base, output, width):
+    """按绝对值（uint64 数组）和负数掩码格式化，见 format_integers"""
+    count = len(magnitude)
+    # 从低位到高位取出每一位，按从高到低的顺序存放（右对齐、前补0）
+    columns = max(1, len(integer_to_digits(int(magnitude.max()), base))) if count else 1
+    digits = np.empty((count, columns), dtype=np.uint8)
+    remaining = magnitude.copy()
+    shift = {2: 1, 4: 2, 8: 3, 16: 4, 32: 5}.get(base)
+    for column in range(columns - 1, -1, -1):
+        if shift:
+            digits[:, column] = remaining & np.uint64(base - 1)
+            remaining >>= np.uint64(shift)
+        else:
+            remaining, digit = np.divmod(remaining, np.uint64(base))
+            digits[:, column] = digit
+    # 每项的有效位数（0 也占一位）
+    nonzero = digits != 0
+    lengths = np.where(nonzero.any(axis=1), columns - np.argmax(nonzero, axis=1), 1)
+    signs = negative.astype(np.int64)
+    digit_codes = _DIGIT_CODES[digits]
+
+    if output == 'bytes':
+        width = (int((lengths + signs).max()) if count else 1) if width is None else width
+        if width < 1:
+            raise ValueError("宽度必须为正整数")
+        mask = lengths + signs > width
+        codes = np.full((count, width), ord('0'), dtype=np.uint8)
+        kept = min(width, columns)
+        codes[:, width - kept:] = digit_codes[:, columns - kept:]
+        if negative.any():
+            codes[negative, 0] = ord('-')
+        codes[mask] = ord(' ')
+        return BulkConversionResult(codes.tobytes(), mask, width)
+
+    # 每行前加负号列、后加换行列，只保留负号、有效数字和换行，整块解码后按换行切分
+    rows = np.empty((count, columns + 2), dtype=np.uint8)
+    rows[:, 0] = ord('-')
+    rows[:, 1:-1] = digit_codes
+    rows[:, -1] = ord('\n')
+    keep = np.empty(rows.shape, dtype=bool)
+    keep[:, 0] = negative
+    keep[:, 1:-1] = np.arange(columns) >= (columns - lengths)[:, None]
+    keep[:, -1] = True
+    strings = rows[keep].tobytes().decode('ascii').split('\n')
+    strings.pop()
+    return BulkConversionResult(strings, np.zeros(count, dtype=bool))
+
+
+def _format_python(values, base, output, width):
+    """无 NumPy 时逐项格式化"""
+    strings = [('-' if value < 0 else '') + integer_to_digits(abs(int(value)), base) for value in values]
+    mask = [False] * len(strings)
+    if output == 'list':
+        return BulkConversionResult(strings, mask)
+    width = max(map(len, strings), default=1) if width is None else width
+    packed = []
+    for index, text in enumerate(strings):
+        if len(text) > width:
+            mask[index] = True
+            packed.append(' ' * width)
+        elif text.startswith('-'):
+            packed.append('-' + text[1:].rjust(width - 1, '0'))
+        else:
+            packed.append(text.rjust(width, '0'))
+    return BulkConversionResult(''.join(packed).encode('ascii'), mask, width)
+
+
+def convert_many(items, from_base, to_base, output='list', width=None):
+    """批量进制转换
+
+    Args:
+        items: NumPy 整数数组（忽略 from_base）、字符串序列或 NumPy 字符串数组
+        from_base: 源进制（2 到 36）
+        to_base: 目标进制（2 到 36）
+        output: 'list' 或 'bytes'，见 format_integers
+        width: 'bytes' 模式下每项的字节数
+
+    Returns:
+        BulkConversionResult，无效或超出 -2^63 到 2^64-1 的输入在 mask 中标出
+    """
+    if NUMPY_AVAILABLE and isinstance(items, np.ndarray) and items.dtype.kind in 'iu':
+        return format_integers(items, to_base, output, width)
+
+    _check_base(to_base)
+    if output not in ('list', 'bytes'):
+        raise ValueError("output 必须是 'list' 或 'bytes'")
+    if NUMPY_AVAILABLE:
+        # 直接用解析得到的绝对值和符号格式化，不经过 int64/uint64 数组
+        magnitude, negative, parsed_mask = _parse(items, from_base)
+        result = _format_magnitudes(magnitude, negative, to_base, output, width)
+        mask = parsed_mask | result.mask
+    else:
+        parsed = _parse(items, from_base)
+        parsed_mask = parsed.mask
+        result = format_integers(parsed.values, to_base, output, width)
+        mask = [a or b for a, b in zip(parsed_mask, result.mask)]
+    if output == 'list':
+        values = result.values
+        for index in (np.flatnonzero(parsed_mask) if NUMPY_AVAILABLE else
+                      [i for i, bad in enumerate(parsed_mask) if bad]):
+            values[index] = ''
+        return BulkConversionResult(values, mask)
+
+    packed = bytearray(result.values)
+    for index in (np.flatnonzero(mask) if NUMPY_AVAILABLE else [i for i, bad in enumerate(mask) if bad]):
+        packed[index * result.width:(index + 1) * result.width] = b' ' * result.width
+    return BulkConversionResult(bytes(packed), mask, result.width)
+
+
+def benchmark_bulk_conversion(count=1000000):
+    """批量转换与逐个调用 NumberSystemConverter.convert 的速度比较
+
+    Returns:
+        {方式: 每秒转换个数}
+    """
+    import random
+    import time
+
+    generator = random.Random(0)
+    hex_ids = [format(generator.getrandbits(64), 'X') for _ in range(count)]
+    results = {}
+
+    sample = hex_ids[:min(count, 20000)]
+    start = time.perf_counter()
+    for text in sample:
+        NumberSystemConverter.convert(text, 16, 10)
+    results['scalar hex->dec'] = len(sample) / (time.perf_counter() - start)
+
+    for label, from_base, to_base, output in (('bulk hex->dec', 16, 10, 'list'),
+                                              ('bulk hex->bin', 16, 2, 'list'),
+                                              ('bulk hex->dec packed', 16, 10, 'bytes')):
+        start = time.perf_counter()
+        convert_many(hex_ids, from_base, to_base, output)
+        results[label] = count / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m convert.number_system.bulk_converter
+    for label, rate in benchmark_bulk_conversion().items():
+        print(f"{label:>22}: {rate:>14,.0f} 个/秒")
@@ -0,0 +1,292 @@
+"""
+文件字节转储模块
+把任意二进制文件以十六进制、八进制或二进制文本按定宽行输出，并能把转储文本还原为字节。
+
+文件通过 mmap 映射，按 memoryview 切片分块处理，不为单个字节创建 Python 对象：
+十六进制使用 bytes.hex，八进制和二进制使用按字节值索引的查找表（NumPy 向量化）。
+
+转储行格式（offsets=True 时带偏移列）：
+    00000000  48 65 6c 6c 6f 2c 20 77 6f 72 6c 64 21 0a 00 ff
+"""
+
+import mmap
+import os
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 支持的进制及每个字节对应的数字位数
+DUMP_DIGITS = {16: 2, 8: 3, 2: 8}
+
+DEFAULT_ROW_BYTES = 16
+
+# 每块处理的行数（每块约 64 KB 原始数据）
+DEFAULT_BLOCK_ROWS = 4096
+
+# 偏移列的最少十六进制位数
+MIN_OFFSET_WIDTH = 8
+
+# 每个字节值的文本：_BYTE_TEXT[base][value]
+_BYTE_TEXT = {base: [format(value, f'0{digits}{"x" if base == 16 else "o" if base == 8 else "b"}')
+                     for value in range(256)]
+              for base, digits in DUMP_DIGITS.items()}
+
+if NUMPY_AVAILABLE:
+    # 字节值 -> 一个单元格（数字加分隔空格）的定长记录，按记录整体查表
+    _BYTE_CELLS = {base: np.frombuffer(''.join(text + ' ' for text in texts).encode('ascii'),
+                                       dtype=f'V{DUMP_DIGITS[base] + 1}')
+                   for base, texts in _BYTE_TEXT.items()}
+
+
+def _check_layout(base, row_bytes):
+    if base not in DUMP_DIGITS:
+        raise ValueError("转储只支持二进制、八进制和十六进制")
+    if not isinstance(row_bytes, int) or row_bytes < 1:
+        raise ValueError("每行字节数必须为正整数")
+
+
+def _offset_width(size):
+    """偏移列宽度：至少8位，文件超过 4 GB 时加宽"""
+    return max(MIN_OFFSET_WIDTH, len(format(max(size - 1, 0), 'x')))
+
+
+def _format_row(row, base, offset, offset_width):
+    """逐行格式化（最后不满一行的部分，或无 NumPy 时使用）"""
+    if base == 16:
+        cells = row.hex(' ')
+    else:
+        cells = ' '.join(map(_BYTE_TEXT[base].__getitem__, row))
+    if offset_width:
+        return f"{offset:0{offset_width}x}  {cells}\n"
+    return cells + '\n'
+
+
+def _format_rows(block, base, row_bytes, offset, offset_width):
+    """把整行数据一次格式化为转储文本（block 长度为 row_bytes 的整数倍）"""
+    rows = len(block) // row_bytes
+    if base == 16:
+        # bytes.hex 用空格分隔，末尾补一个分隔位后每行恰好 3 × row_bytes 个字符
+        cells = np.frombuffer((block.hex(' ') + ' ').encode('ascii'), dtype=np.uint8)
+    else:
+        cells = _BYTE_CELLS[base][np.frombuffer(block, dtype=np.uint8)].view(np.uint8)
+    cells = cells.reshape(rows, -1)
+    prefix = offset_width + 2 if offset_width else 0
+    lines = np.empty((rows, prefix + cells.shape[1]), dtype=np.uint8)
+    lines[:, prefix:] = cells
+    lines[:, -1] = ord('\n')
+    if offset_width:
+        # 偏移量按大端 64 位整数整体转为十六进制，取末尾 offset_width 位
+        offsets = np.arange(offset, offset + rows * row_bytes, row_bytes, dtype='>u8')
+        text = np.frombuffer(offsets.tobytes().hex().encode('ascii'), dtype=np.uint8).reshape(rows, 16)
+        lines[:, :offset_width] = text[:, 16 - offset_width:]
+        lines[:, offset_width:prefix] = ord(' ')
+    return lines.tobytes()
+
+
+def iter_dump(path, base=16, row_bytes=DEFAULT_ROW_BYTES, offsets=True, block_rows=DEFAULT_BLOCK_ROWS):
+    """流式转储文件
+
+    Args:
+        path: 文件路径
+        base: 2、8 或 16
+        row_bytes: 每行字节数
+        offsets: 是否在行首输出十六进制偏移
+        block_rows: 每块处理的行数
+
+    Yields:
+        转储文本块（ASCII 字节串，每块由若干完整行组成）
+    """
+    _check_layout(base, row_bytes)
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    offset_width = _offset_width(size) if offsets else 0
+    block_bytes = row_bytes * max(1, block_rows)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for start in range(0, size, block_bytes):
+                end = min(size, start + block_bytes)
+                full = (end - start) - (end - start) % row_bytes if NUMPY_AVAILABLE else 0
+                chunk = b''
+                if full:
+                    with view[start:start + full] as block:
+                        chunk = _format_rows(block, base, row_bytes, start, offset_width)
+                # 不满一行的尾部（或无 NumPy 时的全部数据）逐行格式化
+                if start + full < end:
+                    chunk += ''.join(_format_row(view[position:min(end, position + row_bytes)], base,
+                                                 position, offset_width)
+                                     for position in range(start + full, end, row_bytes)).encode('ascii')
+                # yield 时不持有任何切片，提前关闭生成器也能正常释放映射
+                yield chunk
+        finally:
+            view.release()
+
+
+def dump_file(source, target, base=16, row_bytes=DEFAULT_ROW_BYTES, offsets=True):
+    """把文件转储为文本文件
+
+    Returns:
+        写入的字节数
+    """
+    written = 0
+    with open(target, 'wb') as out:
+        for chunk in iter_dump(source, base, row_bytes, offsets):
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def _parse_line(line, base, offsets, line_number):
+    """逐行解析转储文本（格式不整齐的行使用）"""
+    text = line.decode('ascii', errors='replace').strip()
+    if offsets:
+        _, separator, text = text.partition('  ')
+        if not separator:
+            text = ''
+    cells = text.split()
+    digits = DUMP_DIGITS[base]
+    try:
+        if any(len(cell) != digits for cell in cells):
+            raise ValueError
+        if base == 16:
+            return bytes.fromhex(text)
+        return bytes(int(cell, base) for cell in cells)
+    except ValueError:
+        raise ValueError(f"转储第 {line_number} 行格式错误") from None
+
+
+def _parse_rows(block, base, prefix, row_bytes):
+    """把格式整齐的整行一次解析为字节，格式不符时返回 None"""
+    digits = DUMP_DIGITS[base]
+    width = prefix + row_bytes * (digits + 1)
+    codes = np.frombuffer(block, dtype=np.uint8).reshape(-1, width)
+    cells = codes[:, prefix:].reshape(len(codes), row_bytes, digits + 1)
+    separators = cells[:, :, digits]
+    if not ((separators[:, :-1] == ord(' ')).all() and (separators[:, -1] == ord('\n')).all()):
+        return None
+    if base == 16:
+        # bytes.fromhex 跳过空白，只需去掉偏移列
+        try:
+            return bytes.fromhex(codes[:, prefix:].tobytes().decode('ascii'))
+        except ValueError:
+            return None
+    # 八进制和二进制只有数字字符，减去 '0' 后（无符号回绕）超出范围即为非法
+    values = cells[:, :, :digits] - np.uint8(ord('0'))
+    if (values >= base).any():
+        return None
+    if base == 2:
+        # 每个字节的8位在内存中连续，整块按顺序打包即可
+        return np.packbits(values.reshape(-1)).tobytes()
+    total = values[:, :, 0].astype(np.uint16) * 64 + values[:, :, 1] * 8 + values[:, :, 2]
+    if (total > 255).any():
+        return None
+    return total.astype(np.uint8).tobytes()
+
+
+def iter_undump(path, base=16, offsets=True, block_bytes=1 << 20):
+    """流式还原转储文本（偏移列不参与还原，按行的顺序拼接）
+
+    Yields:
+        还原出的字节块
+    """
+    if base not in DUMP_DIGITS:
+        raise ValueError("转储只支持二进制、八进制和十六进制")
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    digits = DUMP_DIGITS[base]
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # 由第一行推断行格式：偏移列宽度和每行字节数
+        first_end = mapped.find(b'\n')
+        first_line = mapped[:first_end if first_end >= 0 else size]
+        prefix = first_line.find(b'  ') + 2 if offsets else 0
+        row_bytes, remainder = divmod(len(first_line) - prefix + 1, digits + 1)
+        width = prefix + row_bytes * (digits + 1)
+        if row_bytes < 1 or remainder or (offsets and prefix < 2):
+            width = 0
+
+        view = memoryview(mapped)
+        try:
+            line_number = 1
+            start = 0
+            while start < size:
+                end = mapped.rfind(b'\n', start, min(size, start + block_bytes)) + 1
+                if end <= start:
+                    end = mapped.find(b'\n', start) + 1 or size
+                full = (end - start) - (end - start) % width if width and NUMPY_AVAILABLE else 0
+                data = _parse_rows(view[start:start + full], base, prefix, row_bytes) if full else None
+                if data is None:
+                    full = 0
+                else:
+                    line_number += full // width
+                # 格式不整齐的行（如最后不满一行）逐行解析
+                for line in mapped[start + full:end].splitlines():
+                    if line.strip():
+                        data = (data or b'') + _parse_line(line, base, offsets, line_number)
+                    line_number += 1
+                if data:
+                    yield data
+                start = end
+        finally:
+            view.release()
+
+
+def undump_file(source, target, base=16, offsets=True):
+    """把转储文本还原为二进制文件
+
+    Returns:
+        写入的字节数
+    """
+    written = 0
+    with open(target, 'wb') as out:
+        for chunk in iter_undump(source, base, offsets):
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def benchmark_dump(size_mb=1024, directory=None):
+    """转储和还原的吞吐量（按原始数据计算）
+
+    Args:
+        size_mb: 测试文件大小（MB）
+        directory: 临时文件所在目录，默认为系统临时目录
+
+    Returns:
+        {阶段: MB/s}
+    """
+    import tempfile
+    import time
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as folder:
+        source = os.path.join(folder, 'data.bin')
+        with open(source, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1 << 20))
+        for base in (16, 8, 2):
+            dumped = os.path.join(folder, f'data.{base}.txt')
+            start = time.perf_counter()
+            dump_file(source, dumped, base)
+            results[f'dump base {base}'] = size_mb / (time.perf_counter() - start)
+            restored = os.path.join(folder, 'restored.bin')
+            start = time.perf_counter()
+            undump_file(dumped, restored, base)
+            results[f'undump base {base}'] = size_mb / (time.perf_counter() - start)
+            os.remove(dumped)
+            os.remove(restored)
+    return results
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m convert.number_system.byte_dump [大小MB]
+    import sys
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    for stage, rate in benchmark_dump(size).items():
+        print(f"{stage:>16}: {rate:>8.1f} MB/s（{size} MB 文件）")
@@ -5,6 +5,34 @@
 
 import math
 
+from utils.error_handling import (ERROR_INVALID_NUMBER, ERROR_NEGATIVE_VALUE, ERROR_DIVISION_BY_ZERO,
+                                  ERROR_DOMAIN, ERROR_OVERFLOW)
+from utils.result import Result, failure, parse_number
+
+# 三角函数结果与整数的差小于该值时取整
+_SNAP_EPSILON = 1e-10
+# float 能表示的最大二进制指数
+_MAX_EXPONENT = 1023
+# try_factorial 接受的最大参数：10000! 约 3.6 万位，计算约 5 毫秒；更大的参数计算时间迅速增长
+MAX_FACTORIAL_ARGUMENT = 10000
+
+
+def _snap_to_integer(result):
+    """处理三角函数的浮点数精度问题：足够接近整数的结果取整"""
+    if abs(result) < _SNAP_EPSILON:
+        result = 0
+    if abs(result - round(result)) < _SNAP_EPSILON:
+        return round(result)
+    return result
+
+
+def _integer_if_whole(result):
+    """如果结果是整数值的浮点数，转换为int"""
+    if isinstance(result, float) and result.is_integer():
+        return int(result)
+    return result
+
+
 class MathFunctions:
     """数学扩展功能类"""
 
@@ -101,13 +129,8 @@ class MathFunctions:
         try:
             if degrees:
                 x = math.radians(x)
-            result = math.sin(x)
             # 处理浮点数精度问题
-            if abs(result) < 1e-10:
-                result = 0
-            if abs(result - round(result)) < 1e-10:
-                return round(result)
-            return result
+            return _snap_to_integer(math.sin(x))
         except Exception as e:
             raise ValueError(f"正弦计算错误: {str(e)}")
 
@@ -117,13 +140,8 @@ class MathFunctions:
         try:
             if degrees:
                 x = math.radians(x)
-            result = math.cos(x)
             # 处理浮点数精度问题
-            if abs(result) < 1e-10:
-                result = 0
-            if abs(result - round(result)) < 1e-10:
-                return round(result)
-            return result
+            return _snap_to_integer(math.cos(x))
         except Exception as e:
             raise ValueError(f"余弦计算错误: {str(e)}")
 
@@ -137,11 +155,7 @@ class MathFunctions:
             # 处理浮点数精度问题和无穷大
             if abs(result) > 1e15:
                 raise ValueError("正切函数值超出范围")
-            if abs(result) < 1e-10:
-                result = 0
-            if abs(result - round(result)) < 1e-10:
-                return round(result)
-            return result
+            return _snap_to_integer(result)
         except Exception as e:
             raise ValueError(f"正切计算错误: {str(e)}")
 
@@ -163,5 +177,156 @@ class MathFunctions:
         else:
             return round(x, digits)
 
+    # ---- 结果 API ----
+    # 以下方法与同名函数功能相同，但先校验输入，出错时返回带错误码的 Result 而不抛出异常，
+    # 调用方不需要 try/except 就能得到稳定的错误码；速度并不比捕获异常更快（见 python -m utils.result）
+
+    @staticmethod
+    def try_sqrt(x):
+        """平方根，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if x < 0:
+            return failure(ERROR_NEGATIVE_VALUE)
+        return Result(_integer_if_whole(math.sqrt(x)))
+
+    @staticmethod
+    def try_power(x, y):
+        """幂运算 x^y，返回 Result"""
+        x = parse_number(x)
+        y = parse_number(y)
+        if x is None or y is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if x == 0:
+            if y < 0:
+                return failure(ERROR_DIVISION_BY_ZERO)
+        elif x < 0 and not y.is_integer():
+            return failure(ERROR_DOMAIN)
+        elif abs(x) != 1 and y * math.log2(abs(x)) >= _MAX_EXPONENT + 1:
+            return failure(ERROR_OVERFLOW)
+        try:
+            result = math.pow(x, y)
+        except OverflowError:
+            # 按 log2 预判在边界附近可能差一点，以实际计算为准
+            return failure(ERROR_OVERFLOW)
+        return Result(_integer_if_whole(result))
+
+    @staticmethod
+    def try_modulus(x, y):
+        """取模运算 x % y，返回 Result"""
+        x = parse_number(x)
+        y = parse_number(y)
+        if x is None or y is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if y == 0:
+            return failure(ERROR_DIVISION_BY_ZERO)
+        return Result(x % y)
+
+    @staticmethod
+    def try_reciprocal(x):
+        """倒数 1/x，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if x == 0:
+            return failure(ERROR_DIVISION_BY_ZERO)
+        return Result(_integer_if_whole(1 / x))
+
+    @staticmethod
+    def try_factorial(x):
+        """阶乘 x!，整数值的浮点数和字符串也可以接受，返回 Result
+
+        x 超过 MAX_FACTORIAL_ARGUMENT 时返回 ERROR_OVERFLOW（大数阶乘请用 combinatorics.factorial）
+        """
+        if not isinstance(x, int) or isinstance(x, bool):
+            x = parse_number(x)
+            if x is None:
+                return failure(ERROR_INVALID_NUMBER)
+            if not x.is_integer():
+                return failure(ERROR_DOMAIN)
+            x = int(x)
+        if x < 0:
+            return failure(ERROR_NEGATIVE_VALUE)
+        if x > MAX_FACTORIAL_ARGUMENT:
+            return failure(ERROR_OVERFLOW)
+        return Result(math.factorial(x))
+
+    @staticmethod
+    def try_absolute(x):
+        """绝对值 |x|，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(_integer_if_whole(abs(x)))
+
+    @staticmethod
+    def try_logarithm(x, base=10):
+        """对数 log_base(x)，返回 Result"""
+        x = parse_number(x)
+        base = parse_number(base)
+        if x is None or base is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if x <= 0 or base <= 0 or base == 1:
+            return failure(ERROR_DOMAIN)
+        if base == 10:
+            result = math.log10(x)
+        elif base == math.e:
+            result = math.log(x)
+        else:
+            result = math.log(x, base)
+        return Result(_integer_if_whole(result))
+
+    @staticmethod
+    def try_sine(x, degrees=True):
+        """正弦函数，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(_snap_to_integer(math.sin(math.radians(x) if degrees else x)))
+
+    @staticmethod
+    def try_cosine(x, degrees=True):
+        """余弦函数，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(_snap_to_integer(math.cos(math.radians(x) if degrees else x)))
+
+    @staticmethod
+    def try_tangent(x, degrees=True):
+        """正切函数，函数值超出范围时返回 ERROR_OVERFLOW，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        result = math.tan(math.radians(x) if degrees else x)
+        if abs(result) > 1e15:
+            return failure(ERROR_OVERFLOW)
+        return Result(_snap_to_integer(result))
+
+    @staticmethod
+    def try_floor(x):
+        """向下取整，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(math.floor(x))
+
+    @staticmethod
+    def try_ceil(x):
+        """向上取整，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(math.ceil(x))
+
+    @staticmethod
+    def try_round(x, digits=0):
+        """四舍五入，返回 Result"""
+        x = parse_number(x)
+        if x is None:
+            return failure(ERROR_INVALID_NUMBER)
+        return Result(round(x) if digits == 0 else round(x, digits))
+
 # 创建全局实例，方便其他模块调用
 math_func = MathFunctions()
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+数组数学函数模块
+MathFunctions 的向量化版本：接受序列或NumPy数组，返回数组结果，
+定义域错误以掩码形式返回而不抛出异常
+"""
+
+import math
+
+from .advanced_math import MathFunctions
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 与 MathFunctions 三角函数相同的精度阈值
+_SNAP_EPSILON = 1e-10
+_TAN_LIMIT = 1e15
+
+# float64 能表示到 170!
+_MAX_FACTORIAL = 170
+_FACTORIAL_TABLE = (np.array([float(math.factorial(n)) for n in range(_MAX_FACTORIAL + 1)])
+                    if NUMPY_AVAILABLE else None)
+
+
+class ArrayResult:
+    """数组计算结果"""
+
+    def __init__(self, values, mask):
+        """
+        Args:
+            values: 逐元素结果，出错位置为 NaN（NumPy）或 None（列表）
+            mask: 布尔掩码，True 表示该元素超出定义域或计算出错
+        """
+        self.values = values
+        self.mask = mask
+
+    @property
+    def error_count(self):
+        """出错的元素数量"""
+        mask = self.mask
+        return int(mask.sum()) if hasattr(mask, 'sum') else sum(mask)
+
+    @property
+    def has_errors(self):
+        """是否有元素出错"""
+        return self.error_count > 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"ArrayResult(size={len(self.values)}, errors={self.error_count})"
+
+
+def _map_scalar(function, *args):
+    """无NumPy时逐元素调用 MathFunctions，出错元素记入掩码"""
+    columns = [list(arg) if hasattr(arg, '__len__') and not isinstance(arg, str) else None
+               for arg in args]
+    lengths = {len(column) for column in columns if column is not None}
+    if len(lengths) > 1:
+        raise ValueError("输入序列的长度不一致")
+    size = lengths.pop() if lengths else 1
+    columns = [column if column is not None else [arg] * size
+               for column, arg in zip(columns, args)]
+
+    values = []
+    mask = []
+    for row in zip(*columns):
+        try:
+            values.append(function(*row))
+            mask.append(False)
+        except (ValueError, TypeError, OverflowError):
+            values.append(None)
+            mask.append(True)
+    return ArrayResult(values, mask)
+
+
+def _finish(values, mask):
+    """把出错位置的结果置为 NaN 并打包"""
+    values = np.asarray(values, dtype=float)
+    mask = np.broadcast_to(np.asarray(mask, dtype=bool), values.shape).copy()
+    values = np.where(mask, np.nan, values)
+    return ArrayResult(values, mask)
+
+
+def _snap(result):
+    """与 MathFunctions 相同的精度处理：足够接近整数的值取整"""
+    rounded = np.round(result)
+    return np.where(np.abs(result - rounded) < _SNAP_EPSILON, rounded, result)
+
+
+class ArrayMathFunctions:
+    """数组数学函数类，函数名和参数与 MathFunctions 一致"""
+
+    @staticmethod
+    def sqrt(x):
+        """计算平方根"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.sqrt, x)
+        x = np.asarray(x, dtype=float)
+        invalid = x < 0
+        return _finish(np.sqrt(np.where(invalid, 0, x)), invalid)
+
+    @staticmethod
+    def power(x, y):
+        """计算幂运算 x^y"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.power, x, y)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        with np.errstate(all='ignore'):
+            invalid = ((x < 0) & (y != np.floor(y))) | ((x == 0) & (y < 0))
+            result = np.power(np.where(invalid, 1, x), y)
+        return _finish(result, invalid | ~np.isfinite(result))
+
+    @staticmethod
+    def modulus(x, y):
+        """计算取模运算 x % y"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.modulus, x, y)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        invalid = y == 0
+        return _finish(np.mod(x, np.where(invalid, 1, y)), invalid)
+
+    @staticmethod
+    def reciprocal(x):
+        """计算倒数 1/x"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.reciprocal, x)
+        x = np.asarray(x, dtype=float)
+        invalid = x == 0
+        return _finish(1 / np.where(invalid, 1, x), invalid)
+
+    @staticmethod
+    def factorial(x):
+        """计算阶乘 x!（结果为浮点数，超过 170! 视为溢出）"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.factorial, x)
+        x = np.asarray(x, dtype=float)
+        invalid = (x < 0) | (x != np.floor(x)) | (x > _MAX_FACTORIAL) | np.isnan(x)
+        index = np.where(invalid, 0, x).astype(np.int64)
+        return _finish(_FACTORIAL_TABLE[index], invalid)
+
+    @staticmethod
+    def absolute(x):
+        """计算绝对值 |x|"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.absolute, x)
+        x = np.asarray(x, dtype=float)
+        return _finish(np.abs(x), False)
+
+    @staticmethod
+    def logarithm(x, base=10):
+        """计算对数 log_base(x)，默认常用对数"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.logarithm, x, base)
+        x = np.asarray(x, dtype=float)
+        base = np.asarray(base, dtype=float)
+        invalid = (x <= 0) | (base <= 0) | (base == 1)
+        safe_x = np.where(invalid, 1, x)
+        safe_base = np.where(invalid, 10, base)
+        with np.errstate(all='ignore'):
+            if base.ndim == 0 and base == 10:
+                result = np.log10(safe_x)
+            elif base.ndim == 0 and base == math.e:
+                result = np.log(safe_x)
+            else:
+                result = np.log(safe_x) / np.log(safe_base)
+        return _finish(result, invalid)
+
+    @staticmethod
+    def sine(x, degrees=True):
+        """计算正弦函数 sin(x)"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(lambda v: MathFunctions.sine(v, degrees), x)
+        x = np.asarray(x, dtype=float)
+        if degrees:
+            x = np.radians(x)
+        return _finish(_snap(np.sin(x)), ~np.isfinite(x))
+
+    @staticmethod
+    def cosine(x, degrees=True):
+        """计算余弦函数 cos(x)"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(lambda v: MathFunctions.cosine(v, degrees), x)
+        x = np.asarray(x, dtype=float)
+        if degrees:
+            x = np.radians(x)
+        return _finish(_snap(np.cos(x)), ~np.isfinite(x))
+
+    @staticmethod
+    def tangent(x, degrees=True):
+        """计算正切函数 tan(x)，函数值超出范围的位置记入掩码"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(lambda v: MathFunctions.tangent(v, degrees), x)
+        x = np.asarray(x, dtype=float)
+        if degrees:
+            x = np.radians(x)
+        with np.errstate(all='ignore'):
+            result = np.tan(x)
+        invalid = ~np.isfinite(result) | (np.abs(result) > _TAN_LIMIT)
+        return _finish(_snap(np.where(invalid, 0, result)), invalid)
+
+    @staticmethod
+    def floor(x):
+        """向下取整"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.floor, x)
+        x = np.asarray(x, dtype=float)
+        return _finish(np.floor(x), ~np.isfinite(x))
+
+    @staticmethod
+    def ceil(x):
+        """向上取整"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(MathFunctions.ceil, x)
+        x = np.asarray(x, dtype=float)
+        return _finish(np.ceil(x), ~np.isfinite(x))
+
+    @staticmethod
+    def round(x, digits=0):
+        """四舍五入（与内置 round 一样采用银行家舍入）"""
+        if not NUMPY_AVAILABLE:
+            return _map_scalar(lambda v: MathFunctions.round(v, digits), x)
+        x = np.asarray(x, dtype=float)
+        return _finish(np.round(x, digits), False)
+
+# 创建全局实例，方便其他模块调用
+array_math = ArrayMathFunctions()
@@ -0,0 +1,278 @@
+"""
+组合数学模块
+实现素数摆动（Prime Swing）阶乘、组合数、排列数及其取模版本，
+并提供基于 lgamma 的位数估计，计算过程可通过事件随时取消
+"""
+
+import math
+from bisect import bisect_right
+
+from utils.error_handling import CalculationCancelledError
+
+LN10 = math.log(10)
+_LOG10_2 = math.log10(2)
+
+# 小于 33 时直接查表：swing(n) = n! / (floor(n/2)!)^2
+_SMALL_SWING = [math.factorial(n) // math.factorial(n // 2) ** 2 for n in range(33)]
+
+# 乘积树叶子节点的大小
+_LEAF_SIZE = 16
+
+
+def _check_cancel(cancel_event):
+    """如果取消事件已触发，抛出 CalculationCancelledError"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise CalculationCancelledError()
+
+
+def _validate(n, k=None):
+    """检查参数为非负整数且 k <= n"""
+    if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+        raise ValueError("n 必须是非负整数")
+    if k is not None:
+        if not isinstance(k, int) or isinstance(k, bool) or k < 0:
+            raise ValueError("k 必须是非负整数")
+        if k > n:
+            raise ValueError("k 不能大于 n")
+
+
+def primes_up_to(n):
+    """埃拉托斯特尼筛法，返回不超过 n 的素数列表"""
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+def product(values, cancel_event=None):
+    """用平衡乘积树计算乘积，使大整数乘法的规模尽量均衡"""
+    values = list(values)
+
+    def multiply(lo, hi):
+        if hi - lo <= _LEAF_SIZE:
+            result = 1
+            for i in range(lo, hi):
+                result *= values[i]
+            return result
+        _check_cancel(cancel_event)
+        mid = (lo + hi) // 2
+        return multiply(lo, mid) * multiply(mid, hi)
+
+    return multiply(0, len(values)) if values else 1
+
+
+def _swing(n, primes, cancel_event):
+    """计算摆动阶乘 n!/(floor(n/2)!)^2 的素因子乘积"""
+    if n < len(_SMALL_SWING):
+        return _SMALL_SWING[n]
+
+    sqrt_n = math.isqrt(n)
+    factors = []
+
+    # p <= sqrt(n)：逐位计算指数
+    for p in primes[:bisect_right(primes, sqrt_n)]:
+        q = n
+        power = 1
+        while q:
+            q //= p
+            if q & 1:
+                power *= p
+        if power > 1:
+            factors.append(power)
+
+    # sqrt(n) < p <= n/3：指数为 floor(n/p) 的奇偶性
+    for p in primes[bisect_right(primes, sqrt_n):bisect_right(primes, n // 3)]:
+        if (n // p) & 1:
+            factors.append(p)
+
+    # n/2 < p <= n：指数恒为1
+    factors.extend(primes[bisect_right(primes, n // 2):bisect_right(primes, n)])
+
+    return product(factors, cancel_event)
+
+
+def factorial(n, cancel_event=None):
+    """素数摆动算法计算阶乘 n!
+
+    n! = (floor(n/2)!)^2 * swing(n)，递归过程中的乘法规模较均衡。
+
+    Args:
+        n: 非负整数
+        cancel_event: threading.Event，触发后尽快抛出 CalculationCancelledError
+    """
+    _validate(n)
+    if n < 2:
+        return 1
+
+    primes = primes_up_to(n)
+
+    def recurse(m):
+        if m < 2:
+            return 1
+        _check_cancel(cancel_event)
+        half = recurse(m // 2)
+        return half * half * _swing(m, primes, cancel_event)
+
+    return recurse(n)
+
+
+def _legendre(n, p):
+    """勒让德公式：n! 中素数 p 的指数"""
+    exponent = 0
+    while n:
+        n //= p
+        exponent += n
+    return exponent
+
+
+def _binomial_exponents(n, k, cancel_event):
+    """逐个素数计算 C(n, k) 的素因子指数，产出 (p, e)"""
+    for i, p in enumerate(primes_up_to(n)):
+        if i % 4096 == 0:
+            _check_cancel(cancel_event)
+        exponent = _legendre(n, p) - _legendre(k, p) - _legendre(n - k, p)
+        if exponent:
+            yield p, exponent
+
+
+def binomial(n, k, cancel_event=None):
+    """组合数 C(n, k)，通过素因子分解约去分母后再相乘"""
+    _validate(n, k)
+    k = min(k, n - k)
+    if k == 0:
+        return 1
+    if k < 64:
+        return math.comb(n, k)
+    factors = [p ** e if e > 1 else p for p, e in _binomial_exponents(n, k, cancel_event)]
+    return product(factors, cancel_event)
+
+
+def permutation(n, k, cancel_event=None):
+    """排列数 P(n, k) = n! / (n-k)!"""
+    _validate(n, k)
+    return product(range(n - k + 1, n + 1), cancel_event)
+
+
+def _validate_modulus(m):
+    if not isinstance(m, int) or isinstance(m, bool) or m <= 0:
+        raise ValueError("模数必须是正整数")
+
+
+def factorial_mod(n, m, cancel_event=None):
+    """n! mod m，n >= m 时结果必为0"""
+    _validate(n)
+    _validate_modulus(m)
+    if m == 1 or n >= m:
+        return 0
+    result = 1
+    for i, p in enumerate(primes_up_to(n)):
+        if i % 4096 == 0:
+            _check_cancel(cancel_event)
+        result = result * pow(p, _legendre(n, p), m) % m
+    return result
+
+
+def binomial_mod(n, k, m, cancel_event=None):
+    """C(n, k) mod m，对任意正整数模数有效（不需要模逆元）"""
+    _validate(n, k)
+    _validate_modulus(m)
+    if m == 1:
+        return 0
+    result = 1
+    for p, exponent in _binomial_exponents(n, min(k, n - k), cancel_event):
+        result = result * pow(p, exponent, m) % m
+    return result
+
+
+def permutation_mod(n, k, m, cancel_event=None):
+    """P(n, k) mod m"""
+    _validate(n, k)
+    _validate_modulus(m)
+    result = 1 % m
+    for i, value in enumerate(range(n - k + 1, n + 1)):
+        if i % 65536 == 0:
+            _check_cancel(cancel_event)
+        result = result * value % m
+        if result == 0:
+            break
+    return result
+
+
+def log10_factorial(n):
+    """log10(n!) 的估计值"""
+    return math.lgamma(n + 1) / LN10
+
+
+def factorial_digits(n):
+    """估计 n! 的十进制位数（不实际计算阶乘）"""
+    _validate(n)
+    return int(log10_factorial(n)) + 1
+
+
+def binomial_digits(n, k):
+    """估计 C(n, k) 的十进制位数"""
+    _validate(n, k)
+    log_value = log10_factorial(n) - log10_factorial(k) - log10_factorial(n - k)
+    return int(max(log_value, 0)) + 1
+
+
+def permutation_digits(n, k):
+    """估计 P(n, k) 的十进制位数"""
+    _validate(n, k)
+    return int(max(log10_factorial(n) - log10_factorial(n - k), 0)) + 1
+
+
+def format_large_integer(value, max_digits=4000, significant=10):
+    """格式化大整数，位数过多时使用科学计数法并注明位数
+
+    直接 str() 百万位的整数耗时很长（且超过解释器的位数限制），
+    因此用整数除法只求出前 significant + 1 位，位数和有效数字都是精确的。
+    """
+    if not isinstance(value, int):
+        return str(value)
+    if value == 0:
+        return "0"
+    number = abs(value)
+    # 按二进制位数估计的十进制位数，可能比实际少一位
+    estimate = int((number.bit_length() - 1) * _LOG10_2) + 1
+    if estimate <= max_digits and (estimate < max_digits or number < 10 ** max_digits):
+        return str(value)
+
+    # 去掉低 k 位十进制数：number // 10^k == (number >> k) // 5^k，5^k 比 10^k 小，求幂更快
+    dropped = max(estimate - significant - 1, 0)
+    leading = (number >> dropped) // 5 ** dropped
+    digits = dropped + len(str(leading))
+
+    # 四舍五入到 significant 位有效数字
+    extra = 10 ** (digits - dropped - significant)
+    rounded, remainder = divmod(leading, extra)
+    if 2 * remainder >= extra:
+        rounded += 1
+    exponent = digits - 1
+    if rounded == 10 ** significant:
+        rounded //= 10
+        exponent += 1
+    text = str(rounded)
+    mantissa = f"{text[0]}.{text[1:]}" if significant > 1 else text
+    sign = "-" if value < 0 else ""
+    return f"{sign}{mantissa}e+{exponent} (共 {digits} 位)"
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m core.math_ext.combinatorics
+    import time
+
+    for n in (10000, 100000, 200000):
+        start = time.perf_counter()
+        swing_result = factorial(n)
+        swing_time = time.perf_counter() - start
+        start = time.perf_counter()
+        builtin_result = math.factorial(n)
+        builtin_time = time.perf_counter() - start
+        assert swing_result == builtin_result
+        print(f"{n}!: 位数 {factorial_digits(n)}, 素数摆动 {swing_time:.3f} s, "
+              f"math.factorial {builtin_time:.3f} s")
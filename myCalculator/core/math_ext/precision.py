@@ -0,0 +1,370 @@
+"""
+高精度计算模块
+基于 decimal 实现任意有效位数的常数和函数：
+π（Chudnovsky 二分法）、e、平方根（牛顿迭代）、对数（算术几何平均）和三角函数，
+长时间的计算在各步之间检查取消事件
+"""
+
+import decimal
+import math
+import threading
+from decimal import Decimal
+
+from utils.error_handling import CalculationCancelledError
+
+# 内部计算额外保留的保护位数
+GUARD_DIGITS = 10
+
+# 允许的最大有效位数
+MAX_DIGITS = 1000000
+
+LN10 = math.log(10)
+_LOG10_2 = math.log10(2)
+_HALF = Decimal('0.5')
+
+# Chudnovsky 公式中的常数
+_CHUDNOVSKY_C = 640320
+_CHUDNOVSKY_C3_OVER_24 = _CHUDNOVSKY_C ** 3 // 24
+_DIGITS_PER_TERM = math.log10(_CHUDNOVSKY_C3_OVER_24 / 72)
+
+# 已计算的常数缓存：名称 -> (有效位数, 值)，只保留见过的最高精度
+_constant_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _check_cancel(cancel_event):
+    """如果取消事件已触发，抛出 CalculationCancelledError"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise CalculationCancelledError()
+
+
+def _validate_digits(digits):
+    if not isinstance(digits, int) or isinstance(digits, bool) or digits < 1:
+        raise ValueError("有效位数必须是正整数")
+    if digits > MAX_DIGITS:
+        raise ValueError(f"有效位数不能超过 {MAX_DIGITS}")
+
+
+def _context(digits):
+    """指定有效位数的运算上下文"""
+    return decimal.Context(prec=digits, rounding=decimal.ROUND_HALF_EVEN,
+                           Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+def to_decimal(x):
+    """把输入转换为 Decimal，字符串按十进制精确解析（不经过浮点数）"""
+    if isinstance(x, Decimal):
+        return x
+    if isinstance(x, float):
+        return Decimal(repr(x))
+    try:
+        value = Decimal(str(x).strip()) if isinstance(x, str) else Decimal(x)
+    except decimal.InvalidOperation:
+        raise ValueError(f"无效的数值 '{x}'")
+    if not value.is_finite():
+        raise ValueError(f"无效的数值 '{x}'")
+    return value
+
+
+def _cached_constant(name, digits, compute, cancel_event):
+    """按名称取缓存的常数
+
+    缓存精度足够时直接舍入到所需位数；否则以更高精度重新计算并替换缓存。
+    """
+    _validate_digits(digits)
+    with _cache_lock:
+        cached = _constant_cache.get(name)
+    if cached is None or cached[0] < digits:
+        value = compute(digits + GUARD_DIGITS, cancel_event)
+        with _cache_lock:
+            cached = _constant_cache.get(name)
+            if cached is None or cached[0] < digits:
+                cached = (digits, value)
+                _constant_cache[name] = cached
+    return _context(digits).plus(cached[1])
+
+
+def _chudnovsky_split(a, b, cancel_event):
+    """Chudnovsky 级数第 [a, b) 项的二分求和，返回 (P, Q, T)"""
+    if b - a == 1:
+        if a == 0:
+            p = q = 1
+        else:
+            p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+            q = a * a * a * _CHUDNOVSKY_C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    if b - a > 64:
+        _check_cancel(cancel_event)
+    m = (a + b) // 2
+    p1, q1, t1 = _chudnovsky_split(a, m, cancel_event)
+    p2, q2, t2 = _chudnovsky_split(m, b, cancel_event)
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+def _compute_pi(prec, cancel_event):
+    terms = int(prec / _DIGITS_PER_TERM) + 2
+    _, q, t = _chudnovsky_split(0, terms, cancel_event)
+    context = _context(prec)
+    numerator = context.multiply(Decimal(426880 * q), _sqrt(Decimal(10005), prec, cancel_event))
+    return context.divide(numerator, Decimal(t))
+
+
+def _exp_series_terms(prec):
+    """使 k! > 10^prec 的最小 k"""
+    k = 2
+    while math.lgamma(k + 1) / math.log(10) <= prec:
+        k *= 2
+    return k
+
+
+def _e_split(a, b, cancel_event):
+    """sum_{k=a+1}^{b} a!/k! 的二分求和，返回 (P, Q)"""
+    if b - a == 1:
+        return 1, b
+    if b - a > 64:
+        _check_cancel(cancel_event)
+    m = (a + b) // 2
+    p1, q1 = _e_split(a, m, cancel_event)
+    p2, q2 = _e_split(m, b, cancel_event)
+    return p1 * q2 + p2, q1 * q2
+
+
+def _compute_e(prec, cancel_event):
+    p, q = _e_split(0, _exp_series_terms(prec), cancel_event)
+    context = _context(prec)
+    return context.add(1, context.divide(Decimal(p), Decimal(q)))
+
+
+def pi(digits, cancel_event=None):
+    """圆周率 π，digits 位有效数字"""
+    return _cached_constant('pi', digits, _compute_pi, cancel_event)
+
+
+def e(digits, cancel_event=None):
+    """自然常数 e，digits 位有效数字"""
+    return _cached_constant('e', digits, _compute_e, cancel_event)
+
+
+def _sqrt(x, prec, cancel_event):
+    """平方根：牛顿迭代求 1/sqrt(x)，每步精度加倍，只用乘法
+
+    decimal 自带的 sqrt 在十万位时比一次乘法慢上百倍，且中途无法取消。
+    """
+    if not x:
+        return Decimal(0)
+    # x = m * 100^k，m 在 [1, 100) 内，用浮点数给出约15位的初值
+    k = x.adjusted() // 2
+    m = x.scaleb(-2 * k, _context(prec))
+    y = Decimal(1 / math.sqrt(float(m)))
+    p = 14
+    while p < prec:
+        _check_cancel(cancel_event)
+        p = min(2 * p, prec)
+        context = _context(p + GUARD_DIGITS)
+        # y <- y + y * (1 - m * y^2) / 2
+        residual = context.subtract(1, context.multiply(m, context.multiply(y, y)))
+        y = context.add(y, context.multiply(context.multiply(y, residual), _HALF))
+    context = _context(prec)
+    return context.multiply(m, y).scaleb(k, context)
+
+
+def _agm(a, b, prec, cancel_event):
+    """算术几何平均 AGM(a, b)
+
+    二次收敛：a、b 的相对差小于 10^(-prec/2) 后，再取一次算术平均即达到 prec 位精度。
+    """
+    context = _context(prec)
+    epsilon = Decimal(1).scaleb(-(prec // 2 + 1))
+    while context.subtract(a, b).copy_abs() > context.multiply(a, epsilon):
+        _check_cancel(cancel_event)
+        a, b = context.multiply(context.add(a, b), _HALF), _sqrt(context.multiply(a, b), prec, cancel_event)
+    return context.multiply(context.add(a, b), _HALF)
+
+
+def _ln_large(s, prec, cancel_event):
+    """s > 10^(prec/2) 时 ln(s) = π / (2 AGM(1, 4/s))，相对误差约为 1/s^2"""
+    context = _context(prec)
+    mean = _agm(Decimal(1), context.divide(4, s), prec, cancel_event)
+    return context.divide(pi(prec, cancel_event), context.multiply(2, mean))
+
+
+def _compute_ln2(prec, cancel_event):
+    # ln 2 = ln(2^m) / m，取 2^m > 10^(prec/2 + 1)
+    m = int((prec / 2 + 1) / _LOG10_2) + 1
+    return _context(prec).divide(_ln_large(Decimal(2 ** m), prec + len(str(m)), cancel_event), m)
+
+
+def _ln(x, prec, cancel_event):
+    """自然对数：ln(x) = ln(x * 2^m) - m ln 2，x * 2^m 足够大时用 AGM 计算
+
+    两项相减会抵消 ln(x * 2^m) 的整数位数，x 接近 1 时还会抵消 ln(x) 的前导零，
+    这些位数预先加到工作精度上。
+    """
+    if x == 1:
+        return Decimal(0)
+    integer_digits = len(str(int((prec + 2 + abs(x.adjusted())) * LN10)))
+    leading_zeros = max(-_context(20).subtract(x, 1).adjusted(), 0)
+    digits = prec + integer_digits + leading_zeros
+    m = max(int((digits / 2 + 1 - x.adjusted()) / _LOG10_2) + 1, 0)
+    context = _context(digits)
+    if not m:
+        return _ln_large(x, digits, cancel_event)
+    # 先取精度更高的 ln 2，其中缓存的 π 随后可以直接舍入使用
+    ln2 = _cached_constant('ln2', digits + len(str(m)), _compute_ln2, cancel_event)
+    value = _ln_large(context.multiply(x, Decimal(2 ** m)), digits, cancel_event)
+    return context.subtract(value, context.multiply(m, ln2))
+
+
+def ln10(digits, cancel_event=None):
+    """ln 10，digits 位有效数字"""
+    return _cached_constant('ln10', digits, lambda prec, event: _ln(Decimal(10), prec, event),
+                            cancel_event)
+
+
+def sqrt(x, digits, cancel_event=None):
+    """平方根"""
+    _validate_digits(digits)
+    x = to_decimal(x)
+    if x < 0:
+        raise ValueError("负数不能计算实数平方根")
+    return _context(digits).plus(_sqrt(x, digits + GUARD_DIGITS, cancel_event))
+
+
+def ln(x, digits, cancel_event=None):
+    """自然对数"""
+    _validate_digits(digits)
+    x = to_decimal(x)
+    if x <= 0:
+        raise ValueError("对数的真数必须大于0")
+    return _context(digits).plus(_ln(x, digits + GUARD_DIGITS, cancel_event))
+
+
+def log(x, digits, base=10, cancel_event=None):
+    """对数 log_base(x)，默认常用对数"""
+    _validate_digits(digits)
+    x = to_decimal(x)
+    if x <= 0:
+        raise ValueError("对数的真数必须大于0")
+    base = to_decimal(base)
+    if base <= 0 or base == 1:
+        raise ValueError("对数的底数必须大于0且不等于1")
+    prec = digits + GUARD_DIGITS
+    if base == 10:
+        denominator = ln10(prec, cancel_event)
+    else:
+        denominator = _ln(base, prec, cancel_event)
+    return _context(digits).divide(_ln(x, prec, cancel_event), denominator)
+
+
+def _taylor(x, prec, first_term, start, cancel_event):
+    """sin/cos 的泰勒级数：从 first_term 开始，每项乘以 -x^2/((n+1)(n+2))"""
+    context = _context(prec)
+    x_squared = context.multiply(x, x)
+    epsilon = Decimal(1).scaleb(-prec)
+    total = term = first_term
+    n = start
+    # 取负和取绝对值用 copy_* 方法，避免按默认上下文（28位）舍入
+    while term.copy_abs() > epsilon:
+        if n % 256 == 0:
+            _check_cancel(cancel_event)
+        term = context.divide(context.multiply(term.copy_negate(), x_squared), (n + 1) * (n + 2))
+        total = context.add(total, term)
+        n += 2
+    return total
+
+
+def _reduce_angle(x, digits, degrees, cancel_event):
+    """把角度归约到 [-π/4, π/4]
+
+    Returns:
+        (余量弧度, 象限 0-3)
+    """
+    # 整数部分越大，归约时需要的位数越多
+    prec = digits + GUARD_DIGITS + max(x.adjusted(), 0)
+    context = _context(prec)
+    if degrees:
+        # 角度制下按 90° 精确归约，整数倍角的结果没有舍入误差
+        quadrant_width = Decimal(90)
+    else:
+        quadrant_width = context.divide(pi(prec, cancel_event), 2)
+
+    quadrant = context.divide(x, quadrant_width).to_integral_value(rounding=decimal.ROUND_HALF_EVEN)
+    remainder = context.subtract(x, context.multiply(quadrant, quadrant_width))
+    if degrees:
+        remainder = context.divide(context.multiply(remainder, pi(prec, cancel_event)), 180)
+    return remainder, int(quadrant) % 4
+
+
+def _sin_cos(x, digits, degrees, cancel_event):
+    """同时计算 sin(x) 和 cos(x)"""
+    _validate_digits(digits)
+    x = to_decimal(x)
+    remainder, quadrant = _reduce_angle(x, digits, degrees, cancel_event)
+    prec = digits + GUARD_DIGITS
+    sin_r = _taylor(remainder, prec, remainder, 1, cancel_event) if remainder else Decimal(0)
+    cos_r = _taylor(remainder, prec, Decimal(1), 0, cancel_event) if remainder else Decimal(1)
+    return (
+        (sin_r, cos_r, sin_r.copy_negate(), cos_r.copy_negate())[quadrant],
+        (cos_r, sin_r.copy_negate(), cos_r.copy_negate(), sin_r)[quadrant],
+    )
+
+
+def sin(x, digits, degrees=True, cancel_event=None):
+    """正弦函数，默认输入为角度（与 MathFunctions 一致）"""
+    value, _ = _sin_cos(x, digits, degrees, cancel_event)
+    return _context(digits).plus(value)
+
+
+def cos(x, digits, degrees=True, cancel_event=None):
+    """余弦函数，默认输入为角度"""
+    _, value = _sin_cos(x, digits, degrees, cancel_event)
+    return _context(digits).plus(value)
+
+
+def tan(x, digits, degrees=True, cancel_event=None):
+    """正切函数，默认输入为角度"""
+    sin_x, cos_x = _sin_cos(x, digits, degrees, cancel_event)
+    if cos_x == 0:
+        raise ValueError("正切函数在此处无定义")
+    return _context(digits).divide(sin_x, cos_x)
+
+
+def format_decimal(value):
+    """格式化高精度结果：去掉末尾多余的0，数量级适中时不使用科学计数法"""
+    precision = max(len(value.as_tuple().digits), 1)
+    value = value.normalize(_context(precision))
+    if -7 < value.adjusted() < max(precision, 28):
+        return format(value, 'f')
+    return str(value)
+
+
+def get_cache_info():
+    """获取常数缓存的信息：名称 -> 已缓存的有效位数"""
+    with _cache_lock:
+        return {name: cached[0] for name, cached in _constant_cache.items()}
+
+
+def clear_cache():
+    """清空常数缓存"""
+    with _cache_lock:
+        _constant_cache.clear()
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m core.math_ext.precision
+    import time
+
+    for digits in (1000, 10000, 100000):
+        clear_cache()
+        start = time.perf_counter()
+        pi(digits)
+        pi_time = time.perf_counter() - start
+        start = time.perf_counter()
+        pi(digits // 2)
+        slice_time = time.perf_counter() - start
+        start = time.perf_counter()
+        e(digits)
+        e_time = time.perf_counter() - start
+        print(f"{digits} 位: π {pi_time:.3f} s（缓存后取一半位数 {slice_time * 1000:.2f} ms）, "
+              f"e {e_time:.3f} s")
@@ -5,6 +5,9 @@
 
 # 导入核心组件
 from .stack_calc.basic_calculator import Calculator
+from .stack_calc.expression_compiler import compile_expression, CompiledExpression
 from .math_ext.advanced_math import MathFunctions
+from .math_ext.array_math import ArrayMathFunctions, ArrayResult
 
-__all__ = ['Calculator', 'MathFunctions']
\ No newline at end of file
+__all__ = ['Calculator', 'MathFunctions', 'ArrayMathFunctions', 'ArrayResult',
+           'compile_expression', 'CompiledExpression']
\ No newline at end of file
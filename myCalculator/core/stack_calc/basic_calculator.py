@@ -3,42 +3,74 @@
 支持连续计算和表达式求值
 """
 
-from .stack_handler import Stack
+from .engine import default_engine, BINARY_OPERATORS
+from .incremental import IncrementalEvaluator
+from .numeric_backend import get_backend
+from .tokenizer import PRECEDENCE
 
 class Calculator:
-    """基于栈的计算器类"""
-
-    def __init__(self):
-        """初始化计算器"""
-        self.expression = ""
-        self.result_stack = Stack()
-        self.operator_stack = Stack()
+    """基于栈的计算器类
+
+    只保存交互输入的表达式，解析和求值交给无状态的 ExpressionEngine
+    """
+
+    def __init__(self, engine=None, backend=None):
+        """初始化计算器
+
+        Args:
+            engine: 表达式引擎，默认使用全局共享的引擎
+            backend: 数值后端名称（'float'、'fraction'、'decimal'）或后端对象
+        """
+        self.engine = engine if engine is not None else default_engine
+        self.backend = get_backend(backend)
+        self.incremental = IncrementalEvaluator(self.backend)
+        self._expression = ""
+
+    @property
+    def expression(self):
+        """当前输入的表达式"""
+        return self._expression
+
+    @expression.setter
+    def expression(self, value):
+        """整体替换表达式时重建增量求值状态"""
+        self._expression = value
+        self.incremental.reset()
+        self.incremental.feed(value)
+
+    def _append(self, text):
+        """追加字符，同时增量更新求值状态"""
+        self._expression += text
+        self.incremental.feed(text)
 
     def input_digit(self, digit):
         """输入数字"""
         if isinstance(digit, (int, float)):
-            self.expression += str(digit)
+            self._append(str(digit))
         else:
-            self.expression += digit
+            self._append(digit)
 
     def input_operator(self, operator):
         """输入运算符"""
-        if self.expression and self.expression[-1] in "+-*/":
+        if self._expression and self._expression[-1] in PRECEDENCE:
             # 如果前一个字符也是运算符，替换它
-            self.expression = self.expression[:-1] + operator
-        else:
-            self.expression += operator
+            self.backspace()
+        self._append(operator)
 
     def clear(self):
         """清空当前表达式"""
-        self.expression = ""
-        self.result_stack.clear()
-        self.operator_stack.clear()
+        self._expression = ""
+        self.incremental.reset()
 
     def backspace(self):
-        """删除最后一个字符"""
-        if self.expression:
-            self.expression = self.expression[:-1]
+        """删除最后一个字符，通过检查点回滚增量状态"""
+        if self._expression:
+            self._expression = self._expression[:-1]
+            self.incremental.rollback()
+
+    def preview(self):
+        """返回当前输入的实时预览结果，无法计算时返回 None"""
+        return self.incremental.preview()
 
     def get_current_expression(self):
         """获取当前表达式"""
@@ -46,29 +78,16 @@ class Calculator:
 
     def precedence(self, operator):
         """返回运算符优先级"""
-        if operator in ('+', '-'):
-            return 1
-        elif operator in ('*', '/'):
-            return 2
-        return 0
+        return PRECEDENCE.get(operator, 0)
 
     def is_operator(self, char):
         """检查字符是否是运算符"""
-        return char in '+-*/'
+        return char in PRECEDENCE
 
     def apply_operator(self, operator, b, a):
         """应用运算符进行计算"""
         try:
-            if operator == '+':
-                return a + b
-            elif operator == '-':
-                return a - b
-            elif operator == '*':
-                return a * b
-            elif operator == '/':
-                if b == 0:
-                    raise ValueError("除数不能为零")
-                return a / b
+            return BINARY_OPERATORS[operator](a, b)
         except Exception as e:
             raise ValueError(f"计算错误: {str(e)}")
 
@@ -77,87 +96,38 @@ class Calculator:
         if not self.expression:
             return 0
 
-        # 清空栈
-        self.result_stack.clear()
-        self.operator_stack.clear()
-
         try:
-            # 解析表达式中的数字和运算符
-            i = 0
-            while i < len(self.expression):
-                char = self.expression[i]
-
-                if char.isdigit() or char == '.':
-                    # 解析数字（可能有多位）
-                    num_str = ""
-                    while i < len(self.expression) and (self.expression[i].isdigit() or self.expression[i] == '.'):
-                        num_str += self.expression[i]
-                        i += 1
-                    number = float(num_str) if '.' in num_str else int(num_str)
-                    self.result_stack.push(number)
-                    continue
-
-                elif self.is_operator(char):
-                    # 处理运算符优先级
-                    while (not self.operator_stack.is_empty() and
-                           self.precedence(self.operator_stack.peek()) >= self.precedence(char)):
-                        self._calculate_one_operation()
-                    self.operator_stack.push(char)
-
-                elif char == '(':
-                    self.operator_stack.push(char)
-
-                elif char == ')':
-                    # 处理括号
-                    while (not self.operator_stack.is_empty() and
-                           self.operator_stack.peek() != '('):
-                        self._calculate_one_operation()
-                    if self.operator_stack.is_empty():
-                        raise ValueError("括号不匹配")
-                    self.operator_stack.pop()  # 移除 '('
-
-                i += 1
-
-            # 处理剩余的运算符
-            while not self.operator_stack.is_empty():
-                self._calculate_one_operation()
-
-            if self.result_stack.size() == 1:
-                result = self.result_stack.pop()
-                # 如果结果是整数，转换为int
-                if isinstance(result, float) and result.is_integer():
-                    result = int(result)
-                return result
-            else:
-                raise ValueError("表达式格式错误")
-
+            return self.engine.evaluate(self.expression, backend=self.backend)
         except Exception as e:
             self.clear()
             raise ValueError(f"计算错误: {str(e)}")
 
-    def _calculate_one_operation(self):
-        """执行一次运算"""
-        if self.operator_stack.is_empty():
-            raise ValueError("运算符栈为空")
-
-        if self.result_stack.size() < 2:
-            raise ValueError("数字栈中没有足够的操作数")
-
-        operator = self.operator_stack.pop()
-        b = self.result_stack.pop()
-        a = self.result_stack.pop()
-        result = self.apply_operator(operator, b, a)
-        self.result_stack.push(result)
-
     def calculate_continuous(self, expression):
-        """连续计算功能，支持复杂的表达式计算"""
-        old_expression = self.expression
+        """连续计算功能，支持复杂的表达式计算（不修改当前输入的表达式）"""
         try:
-            self.expression = expression
-            result = self.calculate()
-            return result
-        finally:
-            self.expression = old_expression
+            return self.engine.evaluate(expression, backend=self.backend)
+        except Exception as e:
+            raise ValueError(f"计算错误: {str(e)}")
+
+    def set_backend(self, backend, **options):
+        """切换数值后端
+
+        Args:
+            backend: 后端名称或后端对象
+            options: 后端参数，如 set_backend('decimal', prec=50)
+        """
+        self.backend = get_backend(backend, **options)
+        # 预览按新后端重新计算当前输入
+        self.incremental.set_backend(self.backend)
+        self.incremental.feed(self._expression)
+
+    def get_cache_info(self):
+        """获取表达式解析缓存的统计信息"""
+        return self.engine.get_cache_info()
+
+    def clear_cache(self):
+        """清空表达式解析缓存"""
+        self.engine.clear_cache()
 
     def __str__(self):
         """返回当前表达式的字符串表示"""
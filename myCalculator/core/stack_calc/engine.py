@@ -0,0 +1,400 @@
+"""
+无状态表达式求值引擎
+使用Pratt解析器生成不可变的语法树和后缀指令序列，
+解析结果可以在多个线程之间安全共享
+"""
+
+import math
+import operator
+import time
+from collections import namedtuple
+
+from ..math_ext.advanced_math import MathFunctions
+from . import profiling
+from .expression_cache import ExpressionCache
+from .tokenizer import (tokenize, PRECEDENCE, RIGHT_ASSOCIATIVE,
+                        NUMBER, NAME, OPERATOR, LPAREN, RPAREN, COMMA)
+
+# 语法树节点（不可变）
+Number = namedtuple('Number', ['value'])
+Variable = namedtuple('Variable', ['name'])
+UnaryOp = namedtuple('UnaryOp', ['op', 'operand'])
+BinaryOp = namedtuple('BinaryOp', ['op', 'left', 'right'])
+FunctionCall = namedtuple('FunctionCall', ['name', 'args'])
+
+# 后缀指令操作码
+PUSH = 'PUSH'
+LOAD = 'LOAD'
+NEGATE = 'NEGATE'
+BINARY = 'BINARY'
+CALL = 'CALL'
+
+# 解析结果：原表达式、语法树、后缀指令序列、自由变量名
+Program = namedtuple('Program', ['expression', 'tree', 'instructions', 'variables'])
+
+# 前缀正负号的绑定强度：高于乘除，低于乘方，因此 -2^2 = -(2^2)
+_PREFIX_POWER = PRECEDENCE['*'] * 10 + 5
+
+_END = (None, None, -1)
+
+# 精确整数乘方结果的十进制位数上限（与解释器整数转字符串的默认上限相同，更长的结果也无法显示）。
+# 超过时改用浮点数计算，溢出则报错，避免 9^9^9 这样的表达式长时间占用界面线程
+MAX_EXACT_POWER_DIGITS = 4300
+_LOG10_2 = math.log10(2)
+
+
+def divide(a, b):
+    """除法运算，除数为零时抛出 ValueError"""
+    if b == 0:
+        raise ValueError("除数不能为零")
+    return a / b
+
+
+def exact_power_fits(base, exponent):
+    """估计整数 base 的非负整数 exponent 次方是否不超过 MAX_EXACT_POWER_DIGITS 位（不实际计算）"""
+    base = abs(base)
+    if base <= 1:
+        return True
+    # |base| >= 2 时每次乘方至少增加 log10(2) 位，先排除过大的指数，避免转换浮点数时溢出
+    if exponent > MAX_EXACT_POWER_DIGITS / _LOG10_2:
+        return False
+    return exponent * math.log10(base) <= MAX_EXACT_POWER_DIGITS
+
+
+def power(a, b):
+    """乘方运算，非负整数指数的整数乘方保持精确，结果位数过多时改用浮点数计算"""
+    if isinstance(a, int) and isinstance(b, int) and b >= 0 and exact_power_fits(a, b):
+        return a ** b
+    return MathFunctions.power(a, b)
+
+
+def normalize(result):
+    """如果结果是整数值的浮点数，转换为int"""
+    if isinstance(result, float) and result.is_integer():
+        return int(result)
+    return result
+
+
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': divide,
+    '^': power
+}
+
+# 表达式中可调用的函数，统一转发到 MathFunctions
+FUNCTIONS = {
+    'sqrt': MathFunctions.sqrt,
+    'pow': MathFunctions.power,
+    'mod': MathFunctions.modulus,
+    'recip': MathFunctions.reciprocal,
+    'fact': MathFunctions.factorial,
+    'abs': MathFunctions.absolute,
+    'log': MathFunctions.logarithm,
+    'ln': lambda x: MathFunctions.logarithm(x, math.e),
+    'sin': MathFunctions.sine,
+    'cos': MathFunctions.cosine,
+    'tan': MathFunctions.tangent,
+    'floor': MathFunctions.floor,
+    'ceil': MathFunctions.ceil,
+    'round': MathFunctions.round
+}
+
+
+def parse(expression):
+    """使用Pratt解析器将表达式解析为语法树
+
+    Args:
+        expression: 表达式字符串
+
+    Returns:
+        语法树根节点
+    """
+    return parse_tokens(tokenize(expression))
+
+
+def parse_tokens(tokens):
+    """把记号列表解析为语法树（parse 的后半部分，便于分别计时）
+
+    Pratt解析器的递归改为显式的待完成结构栈，表达式再长、括号嵌套再深也不会超出递归深度限制。
+    栈中每一项为 (类型, 运算符或函数名, 已解析的部分, 外层的最小绑定强度)。
+    """
+    if not tokens:
+        raise ValueError("表达式为空")
+
+    position = 0
+    count = len(tokens)
+    pending = []
+    min_power = 0
+
+    while True:
+        # 前缀部分：数字、变量、括号、函数调用或前缀正负号
+        kind, value, _ = tokens[position] if position < count else _END
+        position += 1
+        next_kind = tokens[position][0] if position < count else None
+
+        if kind is NUMBER:
+            left = Number(value)
+        elif kind is NAME:
+            if next_kind is LPAREN:
+                position += 1
+                if value not in FUNCTIONS:
+                    raise ValueError(f"未知函数 '{value}'")
+                if position < count and tokens[position][0] is RPAREN:
+                    position += 1
+                    left = FunctionCall(value, ())
+                else:
+                    pending.append((CALL, value, [], min_power))
+                    min_power = 0
+                    continue
+            else:
+                left = Variable(value)
+        elif kind is LPAREN:
+            pending.append((LPAREN, None, None, min_power))
+            min_power = 0
+            continue
+        elif kind is OPERATOR and value in '+-':
+            pending.append((NEGATE, value, None, min_power))
+            min_power = _PREFIX_POWER
+            continue
+        elif kind is None:
+            raise ValueError("表达式不完整")
+        else:
+            raise ValueError("表达式格式错误")
+
+        # 中缀部分：绑定强度更高的运算符继续向右解析，否则完成栈顶的待完成结构
+        while True:
+            kind, value, _ = tokens[position] if position < count else _END
+            if kind is OPERATOR:
+                left_power = PRECEDENCE[value] * 10
+                if left_power > min_power:
+                    position += 1
+                    pending.append((BINARY, value, left, min_power))
+                    min_power = left_power - 1 if value in RIGHT_ASSOCIATIVE else left_power
+                    break
+
+            if not pending:
+                if kind is RPAREN:
+                    raise ValueError("括号不匹配")
+                if kind is not None:
+                    raise ValueError("表达式格式错误")
+                return left
+
+            frame, op, partial, min_power = pending.pop()
+            if frame is BINARY:
+                left = BinaryOp(op, partial, left)
+            elif frame is NEGATE:
+                left = UnaryOp(op, left)
+            elif frame is LPAREN:
+                if kind is not RPAREN:
+                    raise ValueError("括号不匹配")
+                position += 1
+            else:
+                partial.append(left)
+                if kind is COMMA:
+                    position += 1
+                    pending.append((CALL, op, partial, min_power))
+                    min_power = 0
+                    break
+                if kind is not RPAREN:
+                    raise ValueError("括号不匹配")
+                position += 1
+                left = FunctionCall(op, tuple(partial))
+
+
+def flatten(tree):
+    """将语法树展开为后缀指令序列（后序遍历使用显式栈，不受递归深度限制）
+
+    Returns:
+        (指令元组, 自由变量名元组)
+    """
+    instructions = []
+    names = set()
+    # (节点, 子节点是否已展开)
+    pending = [(tree, False)]
+
+    while pending:
+        node, expanded = pending.pop()
+        if isinstance(node, Number):
+            instructions.append((PUSH, node.value))
+        elif isinstance(node, Variable):
+            names.add(node.name)
+            instructions.append((LOAD, node.name))
+        elif isinstance(node, UnaryOp):
+            if expanded:
+                if node.op == '-':
+                    instructions.append((NEGATE, None))
+            else:
+                pending.append((node, True))
+                pending.append((node.operand, False))
+        elif isinstance(node, BinaryOp):
+            if expanded:
+                instructions.append((BINARY, BINARY_OPERATORS[node.op]))
+            else:
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+        elif expanded:
+            instructions.append((CALL, (FUNCTIONS[node.name], len(node.args), node.name)))
+        else:
+            pending.append((node, True))
+            pending.extend((arg, False) for arg in reversed(node.args))
+
+    return tuple(instructions), tuple(sorted(names))
+
+
+def stack_profile(instructions):
+    """静态分析指令序列，返回 (归约步数, 栈深度峰值)
+
+    指令序列是确定的，不必在执行时逐条计数。
+    """
+    depth = high_water = steps = 0
+    for opcode, arg in instructions:
+        if opcode is PUSH or opcode is LOAD:
+            depth += 1
+            if depth > high_water:
+                high_water = depth
+        elif opcode is BINARY:
+            depth -= 1
+            steps += 1
+        elif opcode is NEGATE:
+            steps += 1
+        else:
+            depth -= arg[1] - 1
+            steps += 1
+            if depth > high_water:
+                high_water = depth
+    return steps, high_water
+
+
+def run(program, variables=None):
+    """执行后缀指令序列，所有中间状态都在局部变量中"""
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    for opcode, arg in program.instructions:
+        if opcode is PUSH:
+            push(arg)
+        elif opcode is BINARY:
+            b = pop()
+            push(arg(pop(), b))
+        elif opcode is LOAD:
+            try:
+                push(variables[arg])
+            except (KeyError, TypeError):
+                raise ValueError(f"未定义的变量 '{arg}'")
+        elif opcode is NEGATE:
+            push(-pop())
+        else:
+            function, argc, name = arg
+            args = stack[-argc:] if argc else []
+            del stack[len(stack) - argc:]
+            try:
+                push(function(*args))
+            except TypeError:
+                raise ValueError(f"函数 '{name}' 的参数个数错误")
+
+    return normalize(stack[0])
+
+
+class ExpressionEngine:
+    """无状态表达式引擎，只持有解析结果缓存，可被多个线程同时调用"""
+
+    def __init__(self, cache_size=256, backend=None):
+        """初始化引擎
+
+        Args:
+            cache_size: 解析结果缓存容量
+            backend: 默认数值后端（见 numeric_backend 模块），None 表示整数/浮点数混合运算
+        """
+        self.cache = ExpressionCache(maxsize=cache_size)
+        self.backend = backend
+
+    def parse(self, expression):
+        """解析表达式，返回不可变的 Program（优先从缓存中读取）"""
+        key = ExpressionCache.normalize(expression)
+        program = self.cache.get(key)
+        if program is None:
+            tree = parse(key)
+            instructions, names = flatten(tree)
+            program = Program(key, tree, instructions, names)
+            self.cache.put(key, program)
+        return program
+
+    def evaluate(self, expression, variables=None, backend=None):
+        """计算表达式
+
+        Args:
+            expression: 表达式字符串或已解析的 Program
+            variables: 变量名到数值的映射
+            backend: 本次计算使用的数值后端，默认使用引擎的后端
+
+        Returns:
+            计算结果
+        """
+        profiler = profiling.active
+        if profiler is not None:
+            return self._evaluate_profiled(profiler, expression, variables, backend)
+
+        program = expression if isinstance(expression, Program) else self.parse(expression)
+        backend = backend if backend is not None else self.backend
+        if backend is None:
+            return run(program, variables)
+        return backend.run(program, variables)
+
+    def _evaluate_profiled(self, profiler, expression, variables, backend):
+        """与 evaluate 相同，但分阶段计时并把统计交给剖析器"""
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        record = {}
+        stage = 'parse'
+        try:
+            if isinstance(expression, Program):
+                program = expression
+                record['cached'] = True
+            else:
+                key = ExpressionCache.normalize(expression)
+                program = self.cache.get(key)
+                record['cached'] = program is not None
+                if program is None:
+                    tokenize_start = perf_counter()
+                    stage = 'tokenize'
+                    tokens = tokenize(key)
+                    parse_start = perf_counter()
+                    stage = 'parse'
+                    tree = parse_tokens(tokens)
+                    instructions, names = flatten(tree)
+                    program = Program(key, tree, instructions, names)
+                    self.cache.put(key, program)
+                    record['tokenize_us'] = (parse_start - tokenize_start) * 1e6
+                    record['parse_us'] = (perf_counter() - parse_start) * 1e6
+                    record['tokens'] = len(tokens)
+            record['expression'] = program.expression[:200]
+            record['reduction_steps'], record['stack_high_water'] = stack_profile(program.instructions)
+
+            stage = 'evaluate'
+            evaluate_start = perf_counter()
+            backend = backend if backend is not None else self.backend
+            result = run(program, variables) if backend is None else backend.run(program, variables)
+            record['evaluate_us'] = (perf_counter() - evaluate_start) * 1e6
+            return result
+        except Exception as e:
+            record['error'] = f"{stage}:{type(e).__name__}"
+            raise
+        finally:
+            record['total_us'] = (perf_counter() - start) * 1e6
+            profiler.record(record)
+
+    def get_cache_info(self):
+        """获取解析结果缓存的统计信息"""
+        return self.cache.get_info()
+
+    def clear_cache(self):
+        """清空解析结果缓存"""
+        self.cache.clear()
+
+
+# 创建全局实例，所有计算器共享同一个解析缓存
+default_engine = ExpressionEngine()
@@ -0,0 +1,97 @@
+"""
+表达式解析结果缓存模块
+使用LRU策略缓存已解析的后缀表达式（逆波兰式）
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _is_word(char):
+    """字符是否属于数字或变量名"""
+    return char.isalnum() or char in '_.'
+
+
+class ExpressionCache:
+    """有界LRU缓存，键为规范化后的表达式（线程安全）"""
+
+    def __init__(self, maxsize=256):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的表达式数量
+        """
+        if maxsize <= 0:
+            raise ValueError("缓存容量必须大于0")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(expression):
+        """规范化表达式作为缓存键
+
+        去掉运算符、括号和逗号两侧的空白；两个数字或变量名之间的空白保留为一个空格，
+        否则 "1 2" 会变成 "12"，原本应报格式错误的表达式反而能算出结果。
+        """
+        expression = expression.strip()
+
+        def separator(match):
+            before = expression[match.start() - 1]
+            after = expression[match.end()]
+            return ' ' if _is_word(before) and _is_word(after) else ''
+
+        return _WHITESPACE.sub(separator, expression)
+
+    def get(self, key):
+        """查找缓存，命中时将条目移到最近使用的位置"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存条目和统计计数"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_info(self):
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
@@ -0,0 +1,172 @@
+"""
+表达式编译模块
+将表达式编译为Python代码对象，适合同一公式用不同变量值反复求值
+"""
+
+import ast
+import keyword
+
+from .engine import (default_engine, divide, power, normalize, run, FUNCTIONS,
+                     Number, Variable, UnaryOp, FunctionCall)
+from .expression_cache import ExpressionCache
+
+_BINARY_OPERATORS = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult}
+
+# 除法、乘方和函数调用转发到引擎中的实现，保证行为一致
+_HELPERS = {'_divide': divide, '_power': power, '_normalize': normalize}
+_HELPERS.update({f'_fn_{name}': function for name, function in FUNCTIONS.items()})
+
+# 已编译表达式缓存，键为 (规范化表达式, 变量名元组)
+_compiled_cache = ExpressionCache(maxsize=256)
+
+
+def _helper_call(name, args):
+    """构建对辅助函数的调用节点"""
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+class CompiledExpression:
+    """编译后的表达式，可以像函数一样调用"""
+
+    def __init__(self, expression, variables, function):
+        self.expression = expression
+        self.variables = variables
+        self.function = function
+
+    def __call__(self, *args, **kwargs):
+        """按位置或变量名传入变量值并求值"""
+        try:
+            return self.function(*args, **kwargs)
+        except TypeError as e:
+            raise ValueError(f"变量参数错误: {str(e)}")
+
+    def evaluate(self, **values):
+        """按变量名传入变量值并求值"""
+        return self(**values)
+
+    def __repr__(self):
+        return f"CompiledExpression('{self.expression}', variables={self.variables})"
+
+
+def _build_leaf(node):
+    """数字和变量对应的Python语法树节点"""
+    if isinstance(node, Number):
+        return ast.Constant(value=node.value)
+    if node.name.startswith('_') or keyword.iskeyword(node.name):
+        raise ValueError(f"无效的变量名 '{node.name}'")
+    return ast.Name(id=node.name, ctx=ast.Load())
+
+
+def _build_tree(tree):
+    """由引擎的语法树构建Python表达式语法树（后序遍历使用显式栈，不受递归深度限制）"""
+    built = []
+    # (节点, 子节点是否已构建)
+    pending = [(tree, False)]
+
+    while pending:
+        node, expanded = pending.pop()
+        if isinstance(node, (Number, Variable)):
+            built.append(_build_leaf(node))
+        elif not expanded:
+            pending.append((node, True))
+            if isinstance(node, UnaryOp):
+                pending.append((node.operand, False))
+            elif isinstance(node, FunctionCall):
+                pending.extend((arg, False) for arg in reversed(node.args))
+            else:
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+        elif isinstance(node, UnaryOp):
+            op = ast.USub() if node.op == '-' else ast.UAdd()
+            built.append(ast.UnaryOp(op=op, operand=built.pop()))
+        elif isinstance(node, FunctionCall):
+            argc = len(node.args)
+            args = built[len(built) - argc:]
+            del built[len(built) - argc:]
+            built.append(_helper_call(f'_fn_{node.name}', args))
+        else:
+            right = built.pop()
+            left = built.pop()
+            if node.op == '/':
+                built.append(_helper_call('_divide', [left, right]))
+            elif node.op == '^':
+                built.append(_helper_call('_power', [left, right]))
+            else:
+                built.append(ast.BinOp(left=left, op=_BINARY_OPERATORS[node.op](), right=right))
+
+    return built[0]
+
+
+def _compile_lambda(key, arg_names, body, namespace):
+    """把表达式语法树包装为以 arg_names 为参数的 lambda 并编译"""
+    arguments = ast.arguments(
+        posonlyargs=[], args=[ast.arg(arg=name) for name in arg_names],
+        vararg=None, kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]
+    )
+    tree = ast.Expression(body=ast.Lambda(args=arguments, body=body))
+    ast.fix_missing_locations(tree)
+
+    code = compile(tree, f"<expression {key}>", 'eval')
+    return eval(code, namespace)
+
+
+def compile_expression(expression, variables=None):
+    """将表达式编译为可调用对象
+
+    Args:
+        expression: 表达式字符串，可以包含变量名，如 "(a+b)*2"
+        variables: 变量名顺序（决定位置参数顺序），默认按字母顺序
+
+    Returns:
+        CompiledExpression 对象
+    """
+    try:
+        key = ExpressionCache.normalize(expression)
+        cache_key = (key, tuple(variables) if variables is not None else None)
+        compiled = _compiled_cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+
+        program = default_engine.parse(key)
+        body = _build_tree(program.tree)
+        names = set(program.variables)
+
+        if variables is None:
+            arg_names = program.variables
+        else:
+            arg_names = tuple(variables)
+            missing = names.difference(arg_names)
+            if missing:
+                raise ValueError(f"未声明的变量: {', '.join(sorted(missing))}")
+            for name in arg_names:
+                if not name.isidentifier() or name.startswith('_') or keyword.iskeyword(name):
+                    raise ValueError(f"无效的变量名 '{name}'")
+
+        namespace = {'__builtins__': {}}
+        namespace.update(_HELPERS)
+        try:
+            function = _compile_lambda(key, arg_names, _helper_call('_normalize', [body]), namespace)
+        except RecursionError:
+            # 嵌套过深的表达式超出 Python 编译器的递归限制，改为由引擎执行后缀指令
+            namespace.update({'_run': run, '_program': program})
+            values = ast.Dict(keys=[ast.Constant(value=name) for name in arg_names],
+                              values=[ast.Name(id=name, ctx=ast.Load()) for name in arg_names])
+            body = _helper_call('_run', [ast.Name(id='_program', ctx=ast.Load()), values])
+            function = _compile_lambda(key, arg_names, body, namespace)
+
+        compiled = CompiledExpression(key, arg_names, function)
+        _compiled_cache.put(cache_key, compiled)
+        return compiled
+
+    except Exception as e:
+        raise ValueError(f"表达式编译错误: {str(e)}")
+
+
+def get_cache_info():
+    """获取已编译表达式缓存的统计信息"""
+    return _compiled_cache.get_info()
+
+
+def clear_cache():
+    """清空已编译表达式缓存"""
+    _compiled_cache.clear()
@@ -0,0 +1,247 @@
+"""
+增量求值模块
+随着字符逐个输入维护调度场算法的双栈状态，支持退格回滚和实时预览结果
+"""
+
+from .engine import normalize
+from .numeric_backend import get_backend, _LeaveIntegerPath
+from .tokenizer import PRECEDENCE, RIGHT_ASSOCIATIVE
+
+# 一元负号的优先级：高于乘除，低于乘方
+_NEGATE = 'neg'
+_LEVELS = dict(PRECEDENCE)
+_LEVELS[_NEGATE] = PRECEDENCE['*'] + 0.5
+
+_DIGITS = set('0123456789.')
+
+
+def _negate(item):
+    """数值栈一项取负"""
+    value, integer = item
+    return -value, None if integer is None else -integer
+
+
+# 撤销日志中的栈操作
+_PUSHED_VALUE = 0
+_POPPED_VALUE = 1
+_PUSHED_OPERATOR = 2
+_POPPED_OPERATOR = 3
+
+
+class IncrementalEvaluator:
+    """增量调度场求值器
+
+    每输入一个字符只做该字符引起的归约，并在撤销日志中记录这个字符对两个栈做的压入和弹出，
+    退格时按日志逆向撤销而不重新解析整个表达式。每个字符的日志长度与它引起的栈操作次数相同，
+    均摊为 O(1)，不随栈深度增长。
+
+    运算使用与 Calculator 相同的数值后端。数值栈的每一项是 (后端数值, 整数路径结果)：
+    精确后端对只含整数和 + - * ^ 的子表达式先在 int 上计算，与 ExactBackend.run
+    的整数快速路径一致，整数路径不适用时该项为 None，因此预览与最终结果相同。
+    """
+
+    def __init__(self, backend=None):
+        """初始化求值器
+
+        Args:
+            backend: 数值后端名称或后端对象，默认为浮点数后端
+        """
+        self.backend = get_backend(backend)
+        self.reset()
+
+    def set_backend(self, backend):
+        """切换数值后端（需要重新输入表达式以重建状态）"""
+        self.backend = get_backend(backend)
+        self.reset()
+
+    def reset(self):
+        """清空所有状态"""
+        self.values = []
+        self.operators = []
+        self.number = ""             # 正在输入的数字文本
+        self.expect_operand = True   # 下一个记号是否应为操作数
+        self.error = None            # 输入过程中遇到的错误信息
+        # 每个字符一项：(输入前的 number, expect_operand, error, 栈操作列表)
+        self._undo_log = []
+        self._changes = None
+
+    def _push_value(self, value):
+        self.values.append(value)
+        self._changes.append((_PUSHED_VALUE, None))
+
+    def _pop_value(self):
+        value = self.values.pop()
+        self._changes.append((_POPPED_VALUE, value))
+        return value
+
+    def _push_operator(self, operator):
+        self.operators.append(operator)
+        self._changes.append((_PUSHED_OPERATOR, None))
+
+    def _pop_operator(self):
+        operator = self.operators.pop()
+        self._changes.append((_POPPED_OPERATOR, operator))
+        return operator
+
+    def _apply(self):
+        """弹出一个运算符并计算，结果压回数值栈（记入撤销日志）"""
+        operator = self._pop_operator()
+        if operator == _NEGATE:
+            self._push_value(_negate(self._pop_value()))
+        else:
+            b, a = self._pop_value(), self._pop_value()
+            self._push_value(self._binary(operator, a, b))
+
+    def _literal(self, text):
+        """数字文本转换为数值栈的一项"""
+        integer = None
+        if self.backend.integer_operators and '.' not in text:
+            integer = int(text)
+        return self.backend.convert(text), integer
+
+    def _binary(self, operator, a, b):
+        """计算数值栈两项的二元运算"""
+        integer = None
+        if a[1] is not None and b[1] is not None:
+            function = self.backend.integer_operators.get(operator)
+            if function is not None:
+                try:
+                    integer = function(a[1], b[1])
+                except _LeaveIntegerPath:
+                    pass
+        return self.backend.operators[operator](a[0], b[0]), integer
+
+    def feed(self, text):
+        """依次输入多个字符"""
+        for char in text:
+            self.push(char)
+
+    def push(self, char):
+        """输入一个字符"""
+        self._changes = []
+        self._undo_log.append((self.number, self.expect_operand, self.error, self._changes))
+        if self.error is not None or char.isspace():
+            return
+        try:
+            self._push(char)
+        except (ValueError, ArithmeticError) as e:
+            self.error = str(e)
+
+    def _push(self, char):
+        if char in _DIGITS:
+            if not self.expect_operand and not self.number:
+                raise ValueError("表达式格式错误")
+            self.number += char
+            self.expect_operand = False
+            return
+
+        self._flush_number()
+
+        if char == '(':
+            if not self.expect_operand:
+                raise ValueError("表达式格式错误")
+            self._push_operator(char)
+
+        elif char == ')':
+            if self.expect_operand:
+                raise ValueError("表达式不完整")
+            while self.operators and self.operators[-1] != '(':
+                self._apply()
+            if not self.operators:
+                raise ValueError("括号不匹配")
+            self._pop_operator()
+
+        elif char in PRECEDENCE:
+            if self.expect_operand:
+                # 前缀正负号
+                if char == '-':
+                    self._push_operator(_NEGATE)
+                elif char != '+':
+                    raise ValueError("表达式格式错误")
+                return
+            level = PRECEDENCE[char]
+            right = char in RIGHT_ASSOCIATIVE
+            while self.operators and self.operators[-1] != '(':
+                top = _LEVELS[self.operators[-1]]
+                if top > level or (top == level and not right):
+                    self._apply()
+                else:
+                    break
+            self._push_operator(char)
+            self.expect_operand = True
+
+        else:
+            raise ValueError(f"无效字符 '{char}'")
+
+    def _flush_number(self):
+        """把正在输入的数字压入数值栈"""
+        if self.number:
+            self._push_value(self._literal(self.number))
+            self.number = ""
+
+    def rollback(self):
+        """撤销最后输入的一个字符：按撤销日志逆序还原这个字符做过的栈操作"""
+        if not self._undo_log:
+            return
+        number, expect_operand, error, changes = self._undo_log.pop()
+        values = self.values
+        operators = self.operators
+        for kind, item in reversed(changes):
+            if kind == _PUSHED_VALUE:
+                values.pop()
+            elif kind == _POPPED_VALUE:
+                values.append(item)
+            elif kind == _PUSHED_OPERATOR:
+                operators.pop()
+            else:
+                operators.append(item)
+        self.number = number
+        self.expect_operand = expect_operand
+        self.error = error
+
+    def preview(self):
+        """返回当前输入的预览结果
+
+        末尾悬空的运算符会被忽略，未闭合的括号视为已闭合；
+        从栈顶向下折叠尚未归约的运算符，不复制栈也不重新解析整个表达式。
+
+        Returns:
+            预览结果，无法计算时返回 None
+        """
+        if self.error is not None:
+            return None
+
+        values = self.values
+        operators = self.operators
+        count = len(operators)
+        depth = len(values)
+        try:
+            if self.number:
+                result = self._literal(self.number)
+            else:
+                if self.expect_operand:
+                    # 跳过末尾悬空的运算符和左括号
+                    while count:
+                        count -= 1
+                        operator = operators[count]
+                        if operator != '(' and operator != _NEGATE:
+                            break
+                if not depth:
+                    return None
+                depth -= 1
+                result = values[depth]
+
+            for index in range(count - 1, -1, -1):
+                operator = operators[index]
+                if operator == _NEGATE:
+                    result = _negate(result)
+                elif operator != '(':
+                    depth -= 1
+                    result = self._binary(operator, values[depth], result)
+
+            value, integer = result
+            if integer is not None:
+                return integer
+            return self.backend.normalize(normalize(value))
+        except (ValueError, ArithmeticError, IndexError):
+            return None
@@ -0,0 +1,351 @@
+"""
+数值后端模块
+为表达式引擎提供可切换的数值类型：浮点数（默认）、精确分数 Fraction 和十进制 Decimal，
+精确后端中只含整数的表达式走纯整数快速路径，不做任何类型转换
+"""
+
+import decimal
+import operator
+import time
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from fractions import Fraction
+
+from ..math_ext.advanced_math import MathFunctions
+from .engine import (BINARY_OPERATORS, PUSH, LOAD, BINARY, CALL, default_engine, exact_power_fits,
+                     normalize, run)
+from .expression_cache import ExpressionCache
+from .tokenizer import number_literals
+
+# 指令中的运算函数 -> 运算符
+_SYMBOLS = {function: symbol for symbol, function in BINARY_OPERATORS.items()}
+
+# 参数可以直接使用精确数值的函数，其余函数转换为浮点数后调用 MathFunctions
+_EXACT_FUNCTIONS = {'abs', 'floor', 'ceil', 'round', 'mod'}
+
+
+class _LeaveIntegerPath(Exception):
+    """整数快速路径遇到非整数结果，需要改用完整后端重新计算"""
+
+
+def _int_power(a, b):
+    if b < 0 or not exact_power_fits(a, b):
+        raise _LeaveIntegerPath()
+    return a ** b
+
+
+_INT_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '^': _int_power
+}
+
+
+def _integral(value):
+    """整数值的 Fraction/Decimal 转换为 int，阶乘等函数只接受 int"""
+    if not isinstance(value, int) and value == int(value):
+        return int(value)
+    return value
+
+
+class FloatBackend:
+    """浮点数后端：整数和浮点数混合运算，除法总是得到浮点数（默认行为）"""
+
+    name = 'float'
+    operators = BINARY_OPERATORS
+    # 没有单独的整数路径：int 之间的运算本来就是精确的
+    integer_operators = {}
+
+    def convert(self, value):
+        """数字字面量文本转换为 int 或 float，数值原样返回"""
+        if isinstance(value, str):
+            return float(value) if '.' in value else int(value)
+        return value
+
+    def normalize(self, value):
+        return normalize(value)
+
+    def run(self, program, variables=None):
+        return run(program, variables)
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class ExactBackend(FloatBackend, ABC):
+    """精确数值后端基类
+
+    每个表达式的指令按后端类型转换一次并缓存；只含整数字面量、
+    不含除法、函数和变量的表达式直接在 int 上计算。
+    """
+
+    name = None
+    integer_operators = _INT_OPERATORS
+
+    def __init__(self, cache_size=256):
+        self.cache = ExpressionCache(maxsize=cache_size)
+        self.operators = {
+            '+': self.add,
+            '-': self.subtract,
+            '*': self.multiply,
+            '/': self.divide,
+            '^': self.power
+        }
+
+    # 子类实现具体的数值类型
+    @abstractmethod
+    def convert(self, value):
+        """把 int、float 或数字字面量文本转换为本后端的数值类型"""
+
+    def add(self, a, b):
+        return a + b
+
+    def subtract(self, a, b):
+        return a - b
+
+    def multiply(self, a, b):
+        return a * b
+
+    @abstractmethod
+    def divide(self, a, b):
+        """除法，除数为零时抛出 ValueError"""
+
+    @abstractmethod
+    def power(self, a, b):
+        """乘方"""
+
+    @abstractmethod
+    def normalize(self, value):
+        """整数值的结果转换为 int"""
+
+    def call(self, name, function, args):
+        """调用表达式中的函数"""
+        if name == 'fact':
+            return function(*map(_integral, args))
+        if name == 'recip' and len(args) == 1:
+            # 用本后端的除法计算，Decimal 按后端上下文的精度而不是线程默认上下文
+            if args[0] == 0:
+                raise ValueError("倒数计算错误: 零的倒数不存在")
+            return self.divide(1, args[0])
+        if name in _EXACT_FUNCTIONS:
+            return function(*args)
+        return self.convert(function(*map(float, args)))
+
+    def _translate(self, program):
+        """把指令翻译为后端版本，返回 (整数路径指令或 None, 后端指令)"""
+        literals = iter(number_literals(program.expression))
+        integer_only = True
+        int_instructions = []
+        instructions = []
+
+        for opcode, arg in program.instructions:
+            if opcode is PUSH:
+                text = next(literals)
+                integer_only = integer_only and '.' not in text
+                int_instructions.append((opcode, arg))
+                instructions.append((opcode, self.convert(text)))
+            elif opcode is BINARY:
+                symbol = _SYMBOLS[arg]
+                integer_only = integer_only and symbol in _INT_OPERATORS
+                int_instructions.append((opcode, _INT_OPERATORS.get(symbol)))
+                instructions.append((opcode, self.operators[symbol]))
+            elif opcode is CALL:
+                integer_only = False
+                function, argc, name = arg
+                instructions.append((opcode, (self._bind(name, function), argc, name)))
+            else:
+                integer_only = integer_only and opcode is not LOAD
+                int_instructions.append((opcode, arg))
+                instructions.append((opcode, arg))
+
+        int_program = program._replace(instructions=tuple(int_instructions)) if integer_only else None
+        return int_program, program._replace(instructions=tuple(instructions))
+
+    def _bind(self, name, function):
+        return lambda *args: self.call(name, function, args)
+
+    def run(self, program, variables=None):
+        """按本后端的数值类型执行程序"""
+        translated = self.cache.get(program.expression)
+        if translated is None:
+            translated = self._translate(program)
+            self.cache.put(program.expression, translated)
+        int_program, exact_program = translated
+
+        if int_program is not None:
+            try:
+                return run(int_program)
+            except _LeaveIntegerPath:
+                pass
+
+        if variables:
+            variables = {name: self.convert(value) for name, value in variables.items()}
+        return self.normalize(run(exact_program, variables))
+
+
+class FractionBackend(ExactBackend):
+    """分数后端：所有有理运算都是精确的，如 0.1+0.2 = 3/10，1/3*3 = 1"""
+
+    name = 'fraction'
+
+    def convert(self, value):
+        if isinstance(value, (int, Fraction)):
+            return value
+        if isinstance(value, float):
+            # 按最短十进制表示转换，0.1 -> 1/10
+            value = repr(value)
+        return Fraction(value)
+
+    def divide(self, a, b):
+        if b == 0:
+            raise ValueError("除数不能为零")
+        return Fraction(a) / b
+
+    def power(self, a, b):
+        if isinstance(b, int) or b.denominator == 1:
+            b = int(b)
+            if b < 0 and a == 0:
+                raise ValueError("零不能进行负数次幂")
+            a = Fraction(a)
+            if exact_power_fits(max(abs(a.numerator), a.denominator), abs(b)):
+                return a ** b
+        # 非整数指数的结果一般是无理数，结果位数过多时也无法精确表示，只能退回浮点数计算
+        return self.convert(MathFunctions.power(float(a), float(b)))
+
+    def normalize(self, value):
+        if isinstance(value, Fraction) and value.denominator == 1:
+            return value.numerator
+        return value
+
+
+class DecimalBackend(ExactBackend):
+    """十进制后端：按给定的 decimal 上下文（精度和舍入方式）计算"""
+
+    name = 'decimal'
+
+    def __init__(self, context=None, prec=None, cache_size=256):
+        """
+        Args:
+            context: decimal.Context，默认为28位有效数字、四舍六入五成双
+            prec: 只修改有效位数时的简便写法
+        """
+        super().__init__(cache_size)
+        self.context = context.copy() if context is not None else decimal.Context()
+        if prec is not None:
+            self.context.prec = prec
+
+    def convert(self, value):
+        if isinstance(value, (int, Decimal)):
+            return value
+        if isinstance(value, float):
+            value = repr(value)
+        return Decimal(value)
+
+    def add(self, a, b):
+        return self.context.add(a, b)
+
+    def subtract(self, a, b):
+        return self.context.subtract(a, b)
+
+    def multiply(self, a, b):
+        return self.context.multiply(a, b)
+
+    def divide(self, a, b):
+        if b == 0:
+            raise ValueError("除数不能为零")
+        return self.context.divide(a, b)
+
+    def power(self, a, b):
+        if a == 0 and b < 0:
+            raise ValueError("零不能进行负数次幂")
+        if a < 0 and b != int(b):
+            raise ValueError("负数不能进行非整数次幂")
+        return self.context.power(a, b)
+
+    def call(self, name, function, args):
+        context = self.context
+        if name == 'sqrt' and len(args) == 1:
+            if args[0] < 0:
+                raise ValueError("负数不能计算实数平方根")
+            return context.sqrt(args[0])
+        if name in ('ln', 'log') and len(args) <= 2 and args:
+            if args[0] <= 0:
+                raise ValueError("对数的真数必须大于0")
+            if name == 'ln':
+                return context.ln(args[0])
+            if len(args) == 1 or args[1] == 10:
+                return context.log10(args[0])
+            if args[1] <= 0 or args[1] == 1:
+                raise ValueError("对数的底数必须大于0且不等于1")
+            return context.divide(context.ln(args[0]), context.ln(args[1]))
+        return super().call(name, function, args)
+
+    def normalize(self, value):
+        if isinstance(value, Decimal) and value == value.to_integral_value() \
+                and value.adjusted() < self.context.prec:
+            return int(value)
+        return value
+
+    def __repr__(self):
+        return f"DecimalBackend(prec={self.context.prec}, rounding={self.context.rounding})"
+
+
+BACKENDS = {
+    'float': FloatBackend,
+    'fraction': FractionBackend,
+    'decimal': DecimalBackend
+}
+
+
+def get_backend(backend=None, **options):
+    """按名称创建数值后端，已是后端对象时原样返回
+
+    Args:
+        backend: 'float'、'fraction'、'decimal' 或后端对象，None 表示默认的浮点数后端
+        options: 传给后端构造函数的参数，如 DecimalBackend 的 prec
+    """
+    if backend is None:
+        backend = 'float'
+    if not isinstance(backend, str):
+        return backend
+    try:
+        return BACKENDS[backend](**options)
+    except KeyError:
+        raise ValueError(f"未知的数值后端 '{backend}'，可选: {', '.join(BACKENDS)}")
+
+
+def benchmark_backends(repeat=20000):
+    """比较各后端的求值速度（解析结果已缓存，只测量执行）
+
+    Returns:
+        {后端名称: {表达式类别: 每秒求值次数}}
+    """
+    workloads = {
+        'integer': ["1+2*3-4", "(12+34)*(56-78)^2", "2^64-1"],
+        'decimal': ["0.1+0.2", "1/3*3", "(1.5+2.25)*4/7"]
+    }
+    backends = [FloatBackend(), FractionBackend(), DecimalBackend(), DecimalBackend(prec=50)]
+    results = {}
+    for backend in backends:
+        label = backend.name if not isinstance(backend, DecimalBackend) \
+            else f"decimal(prec={backend.context.prec})"
+        results[label] = {}
+        for category, expressions in workloads.items():
+            programs = [default_engine.parse(expression) for expression in expressions]
+            for program in programs:
+                backend.run(program)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for program in programs:
+                    backend.run(program)
+            elapsed = time.perf_counter() - start
+            results[label][category] = repeat * len(programs) / elapsed
+    return results
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m core.stack_calc.numeric_backend
+    for label, rates in benchmark_backends().items():
+        print(f"{label:>18}: 整数表达式 {rates['integer']:>10,.0f} 次/秒, "
+              f"小数表达式 {rates['decimal']:>10,.0f} 次/秒")
@@ -0,0 +1,191 @@
+"""
+表达式引擎性能剖析模块
+按需记录每次求值的分阶段耗时、归约步数、栈深度峰值和异常次数，
+汇总为直方图，可在Python中读取或导出为JSON。
+
+启用方式：
+    设置环境变量 MYCALCULATOR_PROFILE=1（值为 .json 文件路径时退出前自动导出），
+    或使用上下文管理器 ``with profile() as profiler: ...``。
+未启用时引擎只多一次全局变量判断。
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+
+PROFILE_ENV_VAR = 'MYCALCULATOR_PROFILE'
+
+# 当前生效的剖析器，None 表示未启用（引擎每次求值只检查这一个变量）
+active = None
+
+
+class Histogram:
+    """以2的幂为桶上界的直方图"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = Counter()
+
+    def record(self, value):
+        """记录一个非负数值"""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value <= 0:
+            bound = 0
+        else:
+            mantissa, exponent = math.frexp(value)
+            bound = math.ldexp(1, exponent - 1 if mantissa == 0.5 else exponent)
+        self.buckets[bound] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        """转换为可序列化的字典，桶按上界从小到大排列"""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {f"<={bound:g}": count for bound, count in sorted(self.buckets.items())}
+        }
+
+    def __repr__(self):
+        return f"Histogram(count={self.count}, mean={self.mean:.3g}, max={self.max})"
+
+
+class Profiler:
+    """求值过程剖析器，线程安全"""
+
+    # 直方图名称：分阶段耗时（微秒）和结构统计
+    HISTOGRAMS = ('tokenize_us', 'parse_us', 'evaluate_us', 'total_us',
+                  'tokens', 'reduction_steps', 'stack_high_water')
+
+    def __init__(self, recent_size=1000):
+        """
+        Args:
+            recent_size: 保留最近多少次调用的明细记录
+        """
+        self._lock = threading.Lock()
+        self.recent_size = recent_size
+        self.reset()
+
+    def reset(self):
+        """清空所有统计"""
+        with self._lock:
+            self.calls = 0
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.exceptions = Counter()
+            self.histograms = {name: Histogram() for name in self.HISTOGRAMS}
+            self.recent = deque(maxlen=self.recent_size)
+
+    def record(self, record):
+        """记录一次求值
+
+        Args:
+            record: 字典，包含 expression、cached 以及各阶段的耗时和统计，
+                    出错时包含 error（"阶段:异常类型"）
+        """
+        with self._lock:
+            self.calls += 1
+            if record.get('cached'):
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+            error = record.get('error')
+            if error is not None:
+                self.exceptions[error] += 1
+            for name in self.HISTOGRAMS:
+                value = record.get(name)
+                if value is not None:
+                    self.histograms[name].record(value)
+            self.recent.append(record)
+
+    def get_stats(self):
+        """返回汇总统计（字典）"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'exceptions': dict(self.exceptions),
+                'histograms': {name: histogram.to_dict()
+                               for name, histogram in self.histograms.items()}
+            }
+
+    def get_recent(self):
+        """返回最近若干次调用的明细记录"""
+        with self._lock:
+            return list(self.recent)
+
+    def to_json(self, indent=2):
+        """汇总统计的JSON文本"""
+        return json.dumps(self.get_stats(), ensure_ascii=False, indent=indent)
+
+    def dump(self, path):
+        """把汇总统计写入JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def __repr__(self):
+        return f"Profiler(calls={self.calls}, exceptions={sum(self.exceptions.values())})"
+
+
+def enable(profiler=None):
+    """全局启用剖析，返回生效的剖析器"""
+    global active
+    active = profiler if profiler is not None else Profiler()
+    return active
+
+
+def disable():
+    """全局停用剖析，返回之前的剖析器"""
+    global active
+    previous, active = active, None
+    return previous
+
+
+@contextmanager
+def profile(profiler=None):
+    """在 with 块内启用剖析，退出后恢复之前的状态
+
+    Example:
+        with profile() as profiler:
+            calculator.calculate()
+        print(profiler.to_json())
+    """
+    global active
+    previous = active
+    current = enable(profiler)
+    try:
+        yield current
+    finally:
+        active = previous
+
+
+def _enable_from_environment():
+    value = os.environ.get(PROFILE_ENV_VAR, '').strip()
+    if not value or value == '0':
+        return
+    profiler = enable()
+    if value.lower().endswith('.json'):
+        atexit.register(profiler.dump, value)
+
+
+_enable_from_environment()
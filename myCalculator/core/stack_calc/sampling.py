@@ -0,0 +1,421 @@
+"""
+函数采样模块
+在区间上对 f(x) 做向量化自适应采样（曲率大的地方加密），
+按像素列降采样以便在画布上绘制大量采样点，并在同一采样结果上
+向量化地求根和求极值
+"""
+
+import math
+
+from utils.error_handling import CalculationCancelledError
+from .vectorized import evaluate_vectorized, NUMPY_AVAILABLE, np
+
+# 相邻采样点偏离弦线超过 y 范围的这个比例时加密
+DEFAULT_TOLERANCE = 1e-3
+
+# 自适应加密的最多轮数和采样点总数上限
+MAX_REFINE_DEPTH = 8
+MAX_SAMPLES = 2000000
+
+# 黄金分割比
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def _check_cancel(cancel_event):
+    """如果取消事件已触发，抛出 CalculationCancelledError"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise CalculationCancelledError()
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise ValueError("函数采样需要安装 NumPy")
+
+
+def _validate_range(x_min, x_max):
+    x_min = float(x_min)
+    x_max = float(x_max)
+    if not (math.isfinite(x_min) and math.isfinite(x_max)):
+        raise ValueError("区间端点必须是有限数值")
+    if x_min >= x_max:
+        raise ValueError("区间左端点必须小于右端点")
+    return x_min, x_max
+
+
+def make_function(expression, variable='x'):
+    """把表达式包装为数组函数 f(xs) -> ys
+
+    出错（除零、超出定义域、溢出）的位置为 NaN。表达式中只能使用一个变量。
+    """
+    _require_numpy()
+
+    def function(xs):
+        xs = np.asarray(xs, dtype=float)
+        result = evaluate_vectorized(expression, **{variable: xs})
+        ys = np.array(np.broadcast_to(np.asarray(result.values, dtype=float), xs.shape))
+        ys[np.broadcast_to(result.error_mask, xs.shape) | ~np.isfinite(ys)] = np.nan
+        return ys
+
+    return function
+
+
+def _robust_span(ys):
+    """y 的有效范围（忽略极少数极端值，避免极点附近的巨大函数值放大容差）"""
+    finite = ys[np.isfinite(ys)]
+    if finite.size == 0:
+        return 1.0
+    low, high = np.percentile(finite, (1, 99))
+    return float(high - low) or max(float(abs(high)), 1.0)
+
+
+def sample_function(expression, x_min, x_max, points=1000, variable='x',
+                    tolerance=DEFAULT_TOLERANCE, max_depth=MAX_REFINE_DEPTH,
+                    max_samples=MAX_SAMPLES, cancel_event=None):
+    """在 [x_min, x_max] 上对表达式自适应采样
+
+    先均匀取 points 个点，然后每轮找出偏离相邻两点弦线超过 tolerance * y范围
+    的点、以及有效与无效（NaN）交界的区间，对这些区间取中点一次性求值，
+    直到没有需要加密的区间、达到 max_depth 轮或采样点总数达到 max_samples。
+
+    Args:
+        expression: 以 variable 为自变量的表达式，如 "sin(x) * x"
+        x_min, x_max: 采样区间
+        points: 初始均匀采样点数（至少为3）
+        variable: 自变量名
+        tolerance: 加密阈值（相对于 y 的有效范围）
+        max_depth: 最多加密轮数，0 表示只做均匀采样
+        max_samples: 采样点总数上限
+        cancel_event: 可选的 threading.Event，触发后抛出 CalculationCancelledError
+
+    Returns:
+        (xs, ys)：按 x 升序排列的 NumPy 数组，出错位置的 y 为 NaN
+    """
+    x_min, x_max = _validate_range(x_min, x_max)
+    if points < 3:
+        raise ValueError("采样点数不能少于3")
+    function = make_function(expression, variable)
+
+    xs = np.linspace(x_min, x_max, int(points))
+    ys = function(xs)
+    threshold = tolerance * _robust_span(ys)
+
+    for _ in range(max_depth):
+        _check_cancel(cancel_event)
+        finite = np.isfinite(ys)
+
+        # 中间点到相邻两点弦线的竖直距离
+        x0, x1, x2 = xs[:-2], xs[1:-1], xs[2:]
+        y0, y1, y2 = ys[:-2], ys[1:-1], ys[2:]
+        with np.errstate(invalid='ignore'):
+            chord = y0 + (y2 - y0) * ((x1 - x0) / (x2 - x0))
+            bent = np.abs(y1 - chord) > threshold
+
+        # 需要加密的区间：弯曲点两侧的区间，以及有效/无效交界的区间
+        refine = finite[:-1] != finite[1:]
+        refine[:-1] |= bent
+        refine[1:] |= bent
+        # 区间已小到浮点数无法再分时停止
+        refine &= (xs[1:] - xs[:-1]) > 4 * np.spacing(np.maximum(np.abs(xs[:-1]), np.abs(xs[1:])))
+
+        indices = np.flatnonzero(refine)
+        if indices.size == 0:
+            break
+        room = max_samples - xs.size
+        if room <= 0:
+            break
+        indices = indices[:room]
+
+        midpoints = (xs[indices] + xs[indices + 1]) / 2
+        xs = np.insert(xs, indices + 1, midpoints)
+        ys = np.insert(ys, indices + 1, function(midpoints))
+
+    return xs, ys
+
+
+def _weighted_percentiles(xs, ys, quantiles):
+    """按每个采样点覆盖的 x 宽度加权的分位数，自适应加密的区域不会占过大比重"""
+    weights = np.gradient(xs)
+    finite = np.isfinite(ys)
+    order = np.argsort(ys[finite])
+    values = ys[finite][order]
+    cumulative = np.cumsum(weights[finite][order])
+    return np.interp(np.asarray(quantiles) * cumulative[-1], cumulative, values)
+
+
+def auto_y_range(xs, ys, margin=0.05):
+    """根据采样结果选择纵轴范围，忽略极点附近的极端值
+
+    Returns:
+        (y_min, y_max)
+    """
+    finite = ys[np.isfinite(ys)]
+    if finite.size == 0:
+        return -1.0, 1.0
+    if finite.size == 1:
+        low = high = float(finite[0])
+    else:
+        low, high = (float(value) for value in _weighted_percentiles(xs, ys, (0.02, 0.98)))
+    # 极端值不多时用真实的最小最大值，让整条曲线都能显示
+    true_low, true_high = float(finite.min()), float(finite.max())
+    span = high - low
+    if true_high - true_low <= 10 * span or span == 0:
+        low, high = true_low, true_high
+        span = high - low
+    if span == 0:
+        padding = max(abs(low), 1.0)
+        return low - padding, high + padding
+    return low - span * margin, high + span * margin
+
+
+def downsample_minmax(xs, ys, width, x_range=None):
+    """按像素列降采样（M4）：每个像素列只保留第一个、最小、最大和最后一个点
+
+    折线在每列内覆盖 y 的完整范围，因此画出来的图形与逐点绘制一致，
+    点数最多为 4 * width，与原始采样点数无关。
+
+    Args:
+        xs, ys: 按 x 升序排列的采样点，y 为 NaN 的点表示曲线断开
+        width: 画布宽度（像素列数）
+        x_range: 横轴显示范围 (x_min, x_max)，默认为采样区间
+
+    Returns:
+        (columns, values, breaks)：像素横坐标、y 值和布尔数组，
+        breaks 为 True 的点是一段新折线的起点
+    """
+    _require_numpy()
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    width = int(width)
+    if width < 1:
+        raise ValueError("画布宽度必须为正整数")
+    x_low, x_high = x_range if x_range is not None else (xs[0], xs[-1])
+    scale = width / (x_high - x_low) if x_high > x_low else 0.0
+
+    # 无效点把曲线切成若干段，同一段内的点 segment 相同
+    invalid = ~np.isfinite(ys)
+    segment = np.cumsum(invalid)
+    keep = ~invalid & (xs >= x_low) & (xs <= x_high)
+    columns = np.minimum(((xs[keep] - x_low) * scale).astype(np.int64), width - 1)
+    segment = segment[keep]
+    ys = ys[keep]
+    if ys.size == 0:
+        empty = np.empty(0)
+        return empty, empty, np.empty(0, dtype=bool)
+
+    # 同一段、同一像素列的连续点为一组
+    new_group = np.empty(ys.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = (columns[1:] != columns[:-1]) | (segment[1:] != segment[:-1])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], ys.size) - 1
+
+    values = np.column_stack((
+        ys[starts],
+        np.minimum.reduceat(ys, starts),
+        np.maximum.reduceat(ys, starts),
+        ys[ends]
+    )).ravel()
+    group_columns = np.repeat(columns[starts] + 0.5, 4)
+
+    breaks = np.zeros(values.size, dtype=bool)
+    group_breaks = np.empty(starts.size, dtype=bool)
+    group_breaks[0] = True
+    group_breaks[1:] = segment[starts[1:]] != segment[starts[:-1]]
+    breaks[::4] = group_breaks
+    return group_columns, values, breaks
+
+
+def canvas_lines(columns, values, breaks, height, y_range):
+    """把降采样结果转换为 Tk Canvas.create_line 可用的坐标列表
+
+    相邻两点分别在显示范围的上方和下方时（如 tan 的极点）视为断开，
+    避免画出贯穿整个画布的竖线。
+
+    Returns:
+        坐标列表的列表，每个元素为 [x0, y0, x1, y1, ...]
+    """
+    y_low, y_high = y_range
+    if values.size == 0 or y_high <= y_low:
+        return []
+    above = values > y_high
+    below = values < y_low
+    breaks = breaks.copy()
+    breaks[1:] |= (above[1:] & below[:-1]) | (below[1:] & above[:-1])
+
+    # 超出画布很远的点截断到画布附近，避免坐标过大
+    rows = np.clip((y_high - values) / (y_high - y_low) * (height - 1), -height, 2 * height)
+    points = np.column_stack((columns, rows))
+
+    lines = []
+    for part in np.split(points, np.flatnonzero(breaks)[1:]):
+        if len(part) >= 2:
+            lines.append(part.ravel().tolist())
+    return lines
+
+
+def find_roots(expression, x_min, x_max, points=1000, variable='x', samples=None,
+               max_iterations=200):
+    """在区间内求 f(x) = 0 的全部实根（采样中能发现变号或零值的根）
+
+    在自适应采样结果中找出所有变号区间，对所有区间同时二分，
+    每轮只做一次向量化求值。穿过极点的变号（如 tan）会被剔除。
+
+    Args:
+        samples: 已有的 sample_function 结果 (xs, ys)，省略时重新采样
+
+    Returns:
+        按升序排列的根（NumPy 数组）
+    """
+    function = make_function(expression, variable)
+    xs, ys = samples if samples is not None else sample_function(expression, x_min, x_max, points, variable)
+
+    roots = [xs[ys == 0]]
+    left_values, right_values = ys[:-1], ys[1:]
+    with np.errstate(invalid='ignore'):
+        bracket = np.sign(left_values) * np.sign(right_values) < 0
+    a, b = xs[:-1][bracket], xs[1:][bracket]
+    fa = left_values[bracket]
+    bound = np.maximum(np.abs(fa), np.abs(right_values[bracket]))
+
+    for _ in range(max_iterations):
+        middle = (a + b) / 2
+        active = (middle > a) & (middle < b)
+        if not active.any():
+            break
+        fm = function(middle)
+        # 与左端同号时根在右半区间；NaN 视为左端同号，最后的检查会剔除
+        go_right = (np.sign(fm) == np.sign(fa)) | np.isnan(fm)
+        # 中点恰好为零时区间收缩为这一点
+        zero = active & (fm == 0)
+        a = np.where(active & go_right | zero, middle, a)
+        fa = np.where(active & go_right, fm, fa)
+        b = np.where(active & ~go_right, middle, b)
+
+    if a.size:
+        candidates = (a + b) / 2
+        values = np.abs(function(candidates))
+        # 真正的根附近函数值不会超过区间端点的函数值；穿过极点时函数值会急剧增大
+        roots.append(candidates[values <= bound])
+
+    roots = np.sort(np.concatenate(roots))
+    if roots.size > 1:
+        # 同一个根可能既是采样点上的零值又在相邻的变号区间中
+        distinct = np.ones(roots.size, dtype=bool)
+        distinct[1:] = np.diff(roots) > 8 * np.spacing(np.abs(roots[1:]) + 1)
+        roots = roots[distinct]
+    return roots
+
+
+def find_extrema(expression, x_min, x_max, points=1000, variable='x', samples=None,
+                 max_iterations=200):
+    """在区间内求 f(x) 的局部极小值和极大值（不含区间端点）
+
+    在采样结果中找出比两侧相邻点都低（高）的点，对所有候选区间
+    同时做黄金分割搜索，每轮只做一次向量化求值。
+
+    Args:
+        samples: 已有的 sample_function 结果 (xs, ys)，省略时重新采样
+
+    Returns:
+        [(x, f(x), 'min' 或 'max'), ...]，按 x 升序排列
+    """
+    function = make_function(expression, variable)
+    xs, ys = samples if samples is not None else sample_function(expression, x_min, x_max, points, variable)
+
+    y0, y1, y2 = ys[:-2], ys[1:-1], ys[2:]
+    with np.errstate(invalid='ignore'):
+        is_min = (y1 <= y0) & (y1 < y2)
+        is_max = (y1 >= y0) & (y1 > y2)
+    candidates = np.flatnonzero(is_min | is_max)
+    if candidates.size == 0:
+        return []
+
+    # 统一转换为求 sign * f 的极小值
+    sign = np.where(is_min[candidates], 1.0, -1.0)
+    bracket_values = np.minimum(sign * ys[candidates], sign * ys[candidates + 2])
+    a = xs[candidates]
+    b = xs[candidates + 2]
+    c = b - _GOLDEN * (b - a)
+    d = a + _GOLDEN * (b - a)
+    fc = sign * function(c)
+    fd = sign * function(d)
+
+    for _ in range(max_iterations):
+        active = (b - a) > 4 * np.spacing(np.abs(a) + np.abs(b))
+        if not active.any():
+            break
+        # 两个内点函数值相等时（如平台）两侧同时收缩，否则保留较小值一侧
+        tie = active & (fc == fd)
+        keep_left = active & ~tie & ((fc < fd) | np.isnan(fd))
+        keep_right = active & ~tie & ~keep_left
+        a = np.where(keep_right | tie, c, a)
+        b = np.where(keep_left | tie, d, b)
+
+        # 保留的内点成为新区间的另一个内点，单侧收缩时每个区间只需计算一个新点
+        next_c = np.where(keep_right, d, np.where(active, b - _GOLDEN * (b - a), c))
+        next_d = np.where(keep_left, c, np.where(active, a + _GOLDEN * (b - a), d))
+        fc = np.where(keep_right, fd, fc)
+        fd = np.where(keep_left, fc, fd)
+        need_c = keep_left | tie
+        need_d = keep_right | tie
+        new_values = function(np.concatenate((next_c[need_c], next_d[need_d])))
+        count = int(need_c.sum())
+        fc[need_c] = sign[need_c] * new_values[:count]
+        fd[need_d] = sign[need_d] * new_values[count:]
+        c, d = next_c, next_d
+
+    x = (a + b) / 2
+    y = function(x)
+    # 在两侧各取一点检查：真正的极值点两侧函数值只有二阶小量的变化，
+    # 收敛到极点或跳跃间断点时两侧函数值相差悬殊
+    step = np.sqrt(np.finfo(float).eps) * (np.abs(x) + 1)
+    y_left = function(x - step)
+    y_right = function(x + step)
+    tolerance = 1e-6 * (np.abs(y) + 1)
+    # 极值必须严格优于采样区间两端的函数值，排除平台和阶梯函数的台阶
+    with np.errstate(invalid='ignore'):
+        valid = (np.isfinite(y) & (np.abs(y_left - y) <= tolerance) & (np.abs(y_right - y) <= tolerance)
+                 & (sign * y_left >= sign * y - tolerance) & (sign * y_right >= sign * y - tolerance)
+                 & (sign * y < bracket_values))
+
+    return [(float(x[i]), float(y[i]), 'min' if sign[i] > 0 else 'max')
+            for i in np.flatnonzero(valid)]
+
+
+def benchmark_plotting(points=1000000, width=800):
+    """采样、降采样和求根的耗时
+
+    Returns:
+        {阶段: 秒}
+    """
+    import time
+
+    expression = "sin(x) * x / 100 + tan(x / 4)"
+    timings = {}
+    start = time.perf_counter()
+    xs, ys = sample_function(expression, -1000, 1000, points, max_depth=0)
+    timings['uniform_sample'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns, values, breaks = downsample_minmax(xs, ys, width)
+    canvas_lines(columns, values, breaks, 600, auto_y_range(xs, ys))
+    timings['downsample'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    samples = sample_function(expression, -1000, 1000, 2000)
+    timings['adaptive_sample'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    find_roots(expression, -1000, 1000, samples=samples)
+    timings['roots'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    find_extrema(expression, -1000, 1000, samples=samples)
+    timings['extrema'] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m core.stack_calc.sampling
+    for stage, seconds in benchmark_plotting().items():
+        print(f"{stage:>16}: {seconds * 1000:8.1f} ms")
@@ -0,0 +1,106 @@
+"""
+表达式词法分析模块
+使用预编译的正则扫描器一次性将表达式切分为带类型的记号
+"""
+
+import re
+import time
+from collections import namedtuple
+
+# 记号类型
+NUMBER = 'NUMBER'
+NAME = 'NAME'
+OPERATOR = 'OPERATOR'
+LPAREN = 'LPAREN'
+RPAREN = 'RPAREN'
+COMMA = 'COMMA'
+
+# 运算符优先级表（'^' 为右结合）
+PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
+RIGHT_ASSOCIATIVE = {'^'}
+
+Token = namedtuple('Token', ['kind', 'value', 'pos'])
+
+# 每次匹配跳过前导空白并识别一个记号，最后一个分组兜底捕获非法字符
+_SCANNER = re.compile(r"""
+    \s*(?:
+        (\d+\.?\d*|\.\d+)   # 1: 数字
+      | ([A-Za-z_]\w*)      # 2: 变量名
+      | ([-+*/^])           # 3: 运算符
+      | (\()                # 4: 左括号
+      | (\))                # 5: 右括号
+      | (,)                 # 6: 逗号（函数参数分隔）
+      | (\S)                # 7: 非法字符
+    )
+""", re.VERBOSE)
+
+_KINDS = (None, NUMBER, NAME, OPERATOR, LPAREN, RPAREN, COMMA)
+
+
+def tokenize(expression):
+    """将表达式切分为记号列表
+
+    Args:
+        expression: 表达式字符串
+
+    Returns:
+        Token 列表，数字记号的值已转换为 int 或 float
+
+    Raises:
+        ValueError: 表达式中包含无法识别的字符
+    """
+    tokens = []
+    append = tokens.append
+    for match in _SCANNER.finditer(expression):
+        index = match.lastindex
+        text = match.group(index)
+        if index == 1:
+            value = float(text) if '.' in text else int(text)
+            append(Token(NUMBER, value, match.start(index)))
+        elif index == 7:
+            raise ValueError(f"无效字符 '{text}'（位置 {match.start(index)}）")
+        else:
+            append(Token(_KINDS[index], text, match.start(index)))
+    return tokens
+
+
+def number_literals(expression):
+    """按出现顺序返回表达式中数字记号的原始文本
+
+    tokenize 已把数字转换为 int/float，精确数值后端需要原始文本才能无损转换。
+    """
+    return [match.group(1) for match in _SCANNER.finditer(expression) if match.lastindex == 1]
+
+
+def benchmark_tokenizer(length=10000, repeat=20):
+    """词法分析微基准测试
+
+    Args:
+        length: 测试表达式的近似字符数
+        repeat: 重复次数
+
+    Returns:
+        包含记号数量、耗时和每秒记号数的字典
+    """
+    unit = "(12.5+345)*6/78-9+"
+    expression = (unit * (length // len(unit) + 1))[:length].rstrip('+-*/(')
+    expression += ')' * (expression.count('(') - expression.count(')'))
+
+    token_count = len(tokenize(expression))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tokenize(expression)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'characters': len(expression),
+        'tokens': token_count,
+        'seconds': elapsed / repeat,
+        'tokens_per_second': token_count * repeat / elapsed if elapsed else float('inf')
+    }
+
+
+if __name__ == "__main__":
+    stats = benchmark_tokenizer()
+    print(f"表达式长度: {stats['characters']} 字符, 记号数: {stats['tokens']}")
+    print(f"单次耗时: {stats['seconds'] * 1000:.3f} ms, 吞吐量: {stats['tokens_per_second']:,.0f} tokens/s")
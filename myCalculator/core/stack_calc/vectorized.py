@@ -0,0 +1,187 @@
+"""
+向量化表达式求值模块
+对同一表达式在多组输入数据上逐元素求值，可用时使用NumPy一次完成
+"""
+
+import math
+
+from ..math_ext.array_math import ArrayMathFunctions
+from .engine import default_engine, divide, power, PUSH, LOAD, NEGATE, BINARY
+from .expression_compiler import compile_expression
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 表达式函数名到数组版本的映射，与引擎的 FUNCTIONS 一一对应
+ARRAY_FUNCTIONS = {
+    'sqrt': ArrayMathFunctions.sqrt,
+    'pow': ArrayMathFunctions.power,
+    'mod': ArrayMathFunctions.modulus,
+    'recip': ArrayMathFunctions.reciprocal,
+    'fact': ArrayMathFunctions.factorial,
+    'abs': ArrayMathFunctions.absolute,
+    'log': ArrayMathFunctions.logarithm,
+    'ln': lambda x: ArrayMathFunctions.logarithm(x, math.e),
+    'sin': ArrayMathFunctions.sine,
+    'cos': ArrayMathFunctions.cosine,
+    'tan': ArrayMathFunctions.tangent,
+    'floor': ArrayMathFunctions.floor,
+    'ceil': ArrayMathFunctions.ceil,
+    'round': ArrayMathFunctions.round
+}
+
+
+class VectorizedResult:
+    """向量化求值结果"""
+
+    def __init__(self, values, zero_division_mask, domain_error_mask=None):
+        """
+        Args:
+            values: 逐元素结果，出错的位置为 NaN（NumPy）或 None（列表）
+            zero_division_mask: 布尔掩码，True 表示该元素发生了除零
+            domain_error_mask: 布尔掩码，True 表示该元素的函数调用超出定义域
+        """
+        self.values = values
+        self.zero_division_mask = zero_division_mask
+        self.domain_error_mask = domain_error_mask
+
+    @property
+    def error_mask(self):
+        """所有出错元素的掩码"""
+        if self.domain_error_mask is None:
+            return self.zero_division_mask
+        if NUMPY_AVAILABLE and hasattr(self.zero_division_mask, 'shape'):
+            return self.zero_division_mask | self.domain_error_mask
+        return [a or b for a, b in zip(self.zero_division_mask, self.domain_error_mask)]
+
+    @property
+    def error_count(self):
+        """出错的元素数量"""
+        mask = self.error_mask
+        return int(mask.sum()) if hasattr(mask, 'sum') else sum(mask)
+
+    @property
+    def has_errors(self):
+        """是否有元素出错"""
+        return self.error_count > 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"VectorizedResult(size={len(self.values)}, errors={self.error_count})"
+
+
+def _is_sequence(value):
+    """判断输入是否为需要逐元素处理的序列"""
+    return hasattr(value, '__len__') and not isinstance(value, (str, bytes))
+
+
+def _evaluate_numpy(program, columns):
+    """使用NumPy对后缀指令序列整体求值
+
+    输入和常数统一转换为 float64：整数数组直接相乘会按 int64 静默溢出回绕。
+    """
+    arrays = {name: np.asarray(value, dtype=float) for name, value in columns.items()}
+    stack = []
+    mask = np.zeros((), dtype=bool)
+    domain_mask = np.zeros((), dtype=bool)
+
+    for opcode, arg in program.instructions:
+        if opcode is PUSH:
+            stack.append(float(arg))
+        elif opcode is LOAD:
+            stack.append(arrays[arg])
+        elif opcode is NEGATE:
+            stack.append(-stack.pop())
+        elif opcode is BINARY:
+            b = stack.pop()
+            a = stack.pop()
+            if arg is divide:
+                a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+                zero = b == 0
+                mask = mask | zero
+                stack.append(np.divide(a, b, out=np.full(a.shape, np.nan), where=~zero))
+            elif arg is power:
+                # 与 pow() 相同，负数的非整数次幂、零的负数次幂和溢出记为定义域错误
+                result = ArrayMathFunctions.power(a, b)
+                domain_mask = domain_mask | result.mask
+                stack.append(result.values)
+            else:
+                stack.append(arg(a, b))
+        else:
+            # 函数调用使用 MathFunctions 的数组版本，定义域错误记入掩码
+            _, argc, name = arg
+            args = stack[-argc:]
+            del stack[len(stack) - argc:]
+            try:
+                result = ARRAY_FUNCTIONS[name](*args)
+            except TypeError:
+                raise ValueError(f"函数 '{name}' 的参数个数错误")
+            domain_mask = domain_mask | result.mask
+            stack.append(result.values)
+
+    values = np.asarray(stack[0])
+    shape = np.broadcast_shapes(values.shape, mask.shape, domain_mask.shape,
+                                *(array.shape for array in arrays.values()))
+    # 只含常数和标量输入时结果至少有一个元素，与无 NumPy 时的单元素列表一致
+    shape = shape or (1,)
+    values = np.broadcast_to(values, shape).copy()
+    mask = np.broadcast_to(mask, shape).copy()
+    domain_mask = np.broadcast_to(domain_mask, shape) & ~mask
+    return VectorizedResult(values, mask, domain_mask)
+
+
+def _evaluate_python(expression, names, columns):
+    """无NumPy时，使用编译后的表达式逐元素求值"""
+    compiled = compile_expression(expression, names)
+    lengths = {len(value) for value in columns.values() if _is_sequence(value)}
+    if len(lengths) > 1:
+        raise ValueError("输入序列的长度不一致")
+    size = lengths.pop() if lengths else 1
+
+    rows = [columns[name] if _is_sequence(columns[name]) else [columns[name]] * size
+            for name in names]
+    values = []
+    mask = []
+    for row in zip(*rows) if rows else [()] * size:
+        try:
+            values.append(compiled(*row))
+            mask.append(False)
+        except ValueError:
+            values.append(None)
+            mask.append(True)
+    return VectorizedResult(values, mask)
+
+
+def evaluate_vectorized(expression, **columns):
+    """对表达式在数组输入上逐元素求值
+
+    与 Calculator 共用同一个解析引擎，运算符优先级相同。除数为零不会中断整批计算，
+    而是记录在结果的 zero_division_mask 中。
+
+    Args:
+        expression: 含变量名的表达式，如 "(price - cost) / cost"
+        **columns: 变量名到 NumPy 数组、序列或标量的映射
+
+    Returns:
+        VectorizedResult 对象
+    """
+    try:
+        program = default_engine.parse(expression)
+        names = program.variables
+        missing = [name for name in names if name not in columns]
+        if missing:
+            raise ValueError(f"缺少变量: {', '.join(missing)}")
+
+        used = {name: columns[name] for name in names}
+        if NUMPY_AVAILABLE:
+            return _evaluate_numpy(program, used)
+        return _evaluate_python(expression, names, used)
+
+    except Exception as e:
+        raise ValueError(f"向量化计算错误: {str(e)}")
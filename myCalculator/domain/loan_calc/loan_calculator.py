@@ -4,6 +4,12 @@
 """
 
 import math
+import sys
+
+from utils.error_handling import ERROR_INVALID_NUMBER, ERROR_INVALID_PARAMETER, ERROR_OVERFLOW
+from utils.result import Result, failure, parse_number
+
+_LOG_MAX_FLOAT = math.log(sys.float_info.max)
 
 class LoanCalculator:
     """贷款计算器类"""
@@ -161,6 +167,53 @@ class LoanCalculator:
         else:
             raise ValueError("未设置的还款方式")
 
+    def try_calculate(self, principal, annual_rate, loan_term, term_unit='years', method=None):
+        """设置参数并计算的不抛出异常版本：先校验全部参数，出错时返回带错误码的 Result 而不抛出异常
+
+        Args:
+            principal: 贷款本金
+            annual_rate: 年利率（百分比）
+            loan_term: 贷款期限
+            term_unit: 期限单位 ('years' 或 'months')
+            method: 还款方式，默认使用当前设置的方式
+
+        Returns:
+            Result，成功时 value 为与 calculate 相同的还款结果字典
+        """
+        principal = parse_number(principal)
+        annual_rate = parse_number(annual_rate)
+        loan_term = parse_number(loan_term)
+        if principal is None or annual_rate is None or loan_term is None:
+            return failure(ERROR_INVALID_NUMBER)
+        if method is None:
+            method = self.repayment_method
+        if principal <= 0 or annual_rate < 0 or loan_term <= 0 \
+                or method not in (self.EQUAL_PAYMENT, self.EQUAL_PRINCIPAL):
+            return failure(ERROR_INVALID_PARAMETER)
+        if term_unit == 'years':
+            months = int(loan_term * 12)
+        elif term_unit == 'months':
+            months = int(loan_term)
+        else:
+            return failure(ERROR_INVALID_PARAMETER)
+        if months < 1:
+            # 不足一个月的期限无法生成还款计划
+            return failure(ERROR_INVALID_PARAMETER)
+
+        if method == self.EQUAL_PAYMENT and annual_rate > 0:
+            # 等额本息公式中 本金 * 月利率 * (1 + 月利率)^月数 超出浮点数范围时结果为 inf/NaN 或抛出异常
+            monthly_rate = annual_rate / 100 / 12
+            if months * math.log1p(monthly_rate) + math.log(principal * max(monthly_rate, 1)) >= _LOG_MAX_FLOAT:
+                return failure(ERROR_OVERFLOW)
+
+        self.set_loan_parameters(principal, annual_rate, loan_term, term_unit)
+        self.repayment_method = method
+        try:
+            return Result(self.calculate())
+        except ValueError:
+            # 参数已全部校验，剩下的只可能是数值超出范围
+            return failure(ERROR_OVERFLOW)
+
     def compare_methods(self):
         """
         比较两种还款方式
@@ -0,0 +1,4 @@
+"""
+回归测试
+在项目根目录（myCalculator）运行：python -m pytest -q 或 python -m unittest discover tests
+"""
@@ -0,0 +1,46 @@
+"""批量进制转换回归测试：结果与输入逐项对齐，每项的有效性与同批其他项无关"""
+
+import unittest
+
+from convert.number_system.bulk_converter import convert_many, parse_strings
+
+_UINT64_MAX = (1 << 64) - 1
+
+
+class AlignmentTest(unittest.TestCase):
+
+    def test_item_with_newline_is_rejected(self):
+        result = convert_many(['1\n2', '3'], 10, 16)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(list(result.values), ['', '3'])
+        self.assertEqual(list(result.mask), [True, False])
+
+    def test_bytes_items_with_newline(self):
+        result = convert_many([b'10', b'1\n2', b'255'], 10, 16, output='bytes')
+        self.assertEqual(result.values, b'0A  FF')
+        self.assertEqual(list(result.mask), [False, True, False])
+
+
+class IndependentValidityTest(unittest.TestCase):
+
+    def test_uint64_value_next_to_negative(self):
+        items = ['-1', str(_UINT64_MAX), '-9223372036854775808']
+        result = convert_many(items, 10, 16)
+        self.assertEqual(list(result.values), ['-1', 'FFFFFFFFFFFFFFFF', '-8000000000000000'])
+        self.assertFalse(result.mask.any())
+
+    def test_parse_mixed_signs(self):
+        result = parse_strings(['-1', str(_UINT64_MAX)], 10)
+        self.assertEqual([int(value) for value in result.values], [-1, _UINT64_MAX])
+        self.assertFalse(result.mask.any())
+
+    def test_same_item_same_validity(self):
+        alone = convert_many([str(_UINT64_MAX + 1)], 10, 2)
+        mixed = convert_many(['-5', str(_UINT64_MAX + 1)], 10, 2)
+        self.assertTrue(alone.mask[0])
+        self.assertTrue(mixed.mask[1])
+        self.assertFalse(mixed.mask[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
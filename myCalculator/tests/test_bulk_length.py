@@ -0,0 +1,53 @@
+"""批量长度换算回归测试：CSV 流式改写"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from convert.length import bulk_length
+
+
+@unittest.skipUnless(bulk_length.NUMPY_AVAILABLE, "需要 NumPy")
+class CsvColumnTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, 'in.csv')
+        self.target = os.path.join(self.folder, 'out.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def convert(self, text, *args, **options):
+        with open(self.source, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        stats = bulk_length.convert_csv_column(self.source, self.target, *args, **options)
+        with open(self.target, encoding='utf-8', newline='') as f:
+            return f.read(), stats
+
+    def test_quoted_newline_across_batches(self):
+        text = 'id,feet,note\n1,1,"first\nsecond"\n2,2,"a\nb\nc"\n3,3,plain\n'
+        output, stats = self.convert(text, 'feet', 'foot', 'inch', chunk_rows=1)
+        self.assertEqual(output, 'id,feet,note\n1,12,"first\nsecond"\n2,24,"a\nb\nc"\n3,36,plain\n')
+        self.assertEqual(stats, {'rows': 3, 'converted': 3, 'invalid': 0})
+
+    def test_crlf_is_preserved(self):
+        output, _ = self.convert('id,feet\r\n1,1\r\n\r\n2,2\r\n', 'feet', 'foot', 'inch')
+        self.assertEqual(output, 'id,feet\r\n1,12\r\n2,24\r\n')
+
+    def test_short_rows_blank_the_result_column(self):
+        text = 'id,feet,inches\n1,1,6\n2,3\n3\n'
+        output, stats = self.convert(text, 'feet', 'foot', 'inch', inch_column='inches')
+        self.assertEqual(output, 'id,feet\n1,18\n2,\n3\n')
+        self.assertEqual(stats, {'rows': 3, 'converted': 1, 'invalid': 2})
+
+    def test_invalid_values_are_blank(self):
+        output, stats = self.convert('feet\n-1\nabc\n\n2\n', 0, 'foot', 'inch')
+        # 只有一个空字段的行加引号，否则读回时会被当作空行跳过
+        self.assertEqual(output, 'feet\n""\n""\n24\n')
+        self.assertEqual(stats['invalid'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
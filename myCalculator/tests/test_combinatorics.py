@@ -0,0 +1,30 @@
+"""组合数学模块回归测试：大整数格式化"""
+
+import unittest
+
+from core.math_ext.combinatorics import format_large_integer
+
+
+class FormatLargeIntegerTest(unittest.TestCase):
+
+    def test_just_below_power_of_ten(self):
+        # 10^4001 - 1 有 4001 位，按 log10 计算会误算为 4002 位
+        self.assertEqual(format_large_integer(10 ** 4001 - 1), "1.000000000e+4001 (共 4001 位)")
+        self.assertEqual(format_large_integer(10 ** 4000 - 1), "9" * 4000)
+
+    def test_power_of_ten(self):
+        self.assertEqual(format_large_integer(10 ** 4000), "1.000000000e+4000 (共 4001 位)")
+        self.assertEqual(format_large_integer(-10 ** 5000), "-1.000000000e+5000 (共 5001 位)")
+
+    def test_mantissa_is_exact(self):
+        value = 123456789012345 * 10 ** 5000
+        self.assertEqual(format_large_integer(value), "1.234567890e+5014 (共 5015 位)")
+        self.assertEqual(format_large_integer(value, significant=15), "1.23456789012345e+5014 (共 5015 位)")
+
+    def test_rounding_carries_into_exponent(self):
+        value = (10 ** 12 - 1) * 10 ** 5000
+        self.assertEqual(format_large_integer(value), "1.000000000e+5012 (共 5012 位)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""表达式引擎回归测试"""
+
+import unittest
+
+from core.stack_calc.basic_calculator import Calculator
+from core.stack_calc.engine import ExpressionEngine
+from core.stack_calc.expression_cache import ExpressionCache
+
+
+class WhitespaceTest(unittest.TestCase):
+    """空白字符不能把相邻的数字拼接在一起"""
+
+    def setUp(self):
+        self.engine = ExpressionEngine()
+
+    def test_adjacent_numbers_are_rejected(self):
+        for expression in ("1 2", "12 34 + 1", "1\t2", "x y"):
+            with self.subTest(expression=expression):
+                with self.assertRaisesRegex(ValueError, "表达式格式错误"):
+                    self.engine.evaluate(expression, {'x': 1, 'y': 2})
+
+    def test_calculator_rejects_adjacent_numbers(self):
+        with self.assertRaisesRegex(ValueError, "表达式格式错误"):
+            Calculator().calculate_continuous("1 2")
+
+    def test_spaces_around_operators_are_ignored(self):
+        self.assertEqual(self.engine.evaluate(" 1 + 2 * ( 3 ) "), 7)
+        self.assertEqual(self.engine.evaluate("sqrt (16) + pow (2, 3)"), 12)
+
+    def test_cache_key(self):
+        self.assertEqual(ExpressionCache.normalize(" 1 +\t2 "), "1+2")
+        self.assertEqual(ExpressionCache.normalize("1 \n 2"), "1 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
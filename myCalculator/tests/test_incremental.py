@@ -0,0 +1,67 @@
+"""增量求值回归测试：撤销日志与实时预览"""
+
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from core.stack_calc.basic_calculator import Calculator
+from core.stack_calc.incremental import IncrementalEvaluator
+
+
+class UndoLogTest(unittest.TestCase):
+
+    def test_rollback_restores_every_prefix(self):
+        expression = "2*(3+4)^2-10/(1+1)"
+        evaluator = IncrementalEvaluator()
+        states = []
+        for char in expression:
+            states.append((list(evaluator.values), list(evaluator.operators), evaluator.number))
+            evaluator.push(char)
+        for state in reversed(states):
+            evaluator.rollback()
+            self.assertEqual((list(evaluator.values), list(evaluator.operators), evaluator.number), state)
+
+    def test_rollback_clears_error(self):
+        evaluator = IncrementalEvaluator()
+        evaluator.feed("1+)")
+        self.assertIsNone(evaluator.preview())
+        evaluator.rollback()
+        self.assertEqual(evaluator.preview(), 1)
+
+    def test_preview_does_not_change_state(self):
+        evaluator = IncrementalEvaluator()
+        evaluator.feed("1+2*(3-")
+        before = (list(evaluator.values), list(evaluator.operators))
+        self.assertEqual(evaluator.preview(), 7)
+        self.assertEqual((list(evaluator.values), list(evaluator.operators)), before)
+
+
+class PreviewTest(unittest.TestCase):
+
+    def test_dangling_operators_are_ignored(self):
+        for text, expected in (("2*(3+", 6), ("2+-", 2), ("-", None), ("(", None), ("2^3^2", 512)):
+            evaluator = IncrementalEvaluator()
+            evaluator.feed(text)
+            self.assertEqual(evaluator.preview(), expected, text)
+
+    def test_matches_calculate_for_each_backend(self):
+        expressions = ["0.1+0.2", "1/3*3", "2^100+1", "(2^100+1)-2^100+0.5", "-2^2/3", "2^-1"]
+        for backend in ('float', 'fraction', 'decimal'):
+            calculator = Calculator(backend=backend)
+            for expression in expressions:
+                calculator.expression = expression
+                self.assertEqual(calculator.preview(), calculator.calculate_continuous(expression),
+                                 (backend, expression))
+
+    def test_backend_types(self):
+        calculator = Calculator(backend='fraction')
+        calculator.expression = "1/3"
+        self.assertEqual(calculator.preview(), Fraction(1, 3))
+        calculator.set_backend('decimal', prec=5)
+        self.assertEqual(calculator.preview(), Decimal("0.33333"))
+        calculator.set_backend('float')
+        self.assertEqual(calculator.preview(), 1 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""输入验证回归测试"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from utils.input_validation import InputValidator
+
+
+class ExpressionValidationTest(unittest.TestCase):
+
+    def test_adjacent_numbers_are_rejected(self):
+        for expr in ("1 2", "12 34 + 1", "1..2", "(1 2)"):
+            self.assertFalse(InputValidator.is_valid_expression(expr), expr)
+
+    def test_valid_expressions(self):
+        for expr in ("1 + 2", " (1+2)*3 ", "2^10", "-.5/4"):
+            self.assertTrue(InputValidator.is_valid_expression(expr), expr)
+
+    def test_invalid_expressions(self):
+        for expr in ("", "   ", "(1+2", "1+2)", "x+1", "sqrt(4)", "1,2", "1$2", None):
+            self.assertFalse(InputValidator.is_valid_expression(expr), expr)
+
+    def test_import_does_not_load_core_or_convert(self):
+        code = ("import sys, utils.input_validation; "
+                "print(any(m.startswith(('core', 'convert')) for m in sys.modules))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                                check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
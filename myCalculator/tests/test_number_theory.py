@@ -0,0 +1,35 @@
+"""数论模块回归测试：素性测试与筛法"""
+
+import unittest
+
+from core.math_ext import number_theory
+
+
+class IsPrimeTest(unittest.TestCase):
+
+    def test_strong_pseudoprime_to_first_13_bases(self):
+        # 能通过以2..41为底的 Miller-Rabin 测试的最小合数
+        n = 3317044064679887385961981
+        self.assertFalse(number_theory.is_prime(n))
+
+    def test_large_primes(self):
+        for n in (2 ** 89 - 1, 2 ** 127 - 1, 2 ** 521 - 1):
+            self.assertTrue(number_theory.is_prime(n), n)
+
+    def test_large_composites(self):
+        self.assertFalse(number_theory.is_prime((2 ** 89 - 1) * (2 ** 107 - 1)))
+        self.assertFalse(number_theory.is_prime((2 ** 61 - 1) ** 2))
+
+    def test_strong_lucas_pseudoprimes_are_composite(self):
+        for n in (5459, 5777, 10877, 16109, 18971):
+            self.assertTrue(number_theory._strong_lucas_probable_prime(n), n)
+            self.assertFalse(number_theory.is_prime(n), n)
+
+    def test_agrees_with_sieve(self):
+        primes = set(number_theory.primes_in_range(0, 20000))
+        for n in range(20000):
+            self.assertEqual(number_theory.is_prime(n), n in primes, n)
+
+
+if __name__ == '__main__':
+    unittest.main()
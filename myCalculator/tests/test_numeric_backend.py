@@ -0,0 +1,37 @@
+"""数值后端回归测试：精确运算与倒数"""
+
+import unittest
+from fractions import Fraction
+
+from core.stack_calc.engine import default_engine
+from core.stack_calc.numeric_backend import get_backend, DecimalBackend
+
+
+class ExactBackendTest(unittest.TestCase):
+
+    def evaluate(self, expression, backend, **options):
+        return default_engine.evaluate(expression, backend=get_backend(backend, **options))
+
+    def test_fraction_arithmetic(self):
+        self.assertEqual(self.evaluate("0.1+0.2", 'fraction'), Fraction(3, 10))
+        self.assertEqual(self.evaluate("1/3*3", 'fraction'), 1)
+        self.assertEqual(self.evaluate("2^100+1", 'fraction'), 2 ** 100 + 1)
+
+    def test_recip_is_exact(self):
+        self.assertEqual(self.evaluate("recip(3)", 'fraction'), Fraction(1, 3))
+        self.assertEqual(self.evaluate("recip(3)*3", 'fraction'), 1)
+        self.assertEqual(self.evaluate("recip(0.1)", 'fraction'), 10)
+
+    def test_recip_uses_decimal_context(self):
+        result = self.evaluate("recip(3)", 'decimal', prec=50)
+        self.assertEqual(result, DecimalBackend(prec=50).context.divide(1, 3))
+        self.assertEqual(len(result.as_tuple().digits), 50)
+
+    def test_recip_of_zero(self):
+        for backend in ('fraction', 'decimal'):
+            with self.assertRaises(ValueError):
+                self.evaluate("recip(0)", backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
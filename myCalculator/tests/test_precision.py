@@ -0,0 +1,55 @@
+"""高精度计算回归测试：平方根、对数与取消"""
+
+import decimal
+import threading
+import unittest
+from decimal import Decimal
+
+from core.math_ext import precision
+from utils.error_handling import CalculationCancelledError
+
+
+def _reference(digits):
+    return decimal.Context(prec=digits, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+class AgreementTest(unittest.TestCase):
+    """与 decimal 自带函数（正确舍入）的结果一致"""
+
+    VALUES = [Decimal(2), Decimal(10), Decimal('0.5'), Decimal('123.456'), Decimal('1e-500'),
+              Decimal('1e600'), Decimal('1.0000000001'), Decimal('0.999999999999999999999999')]
+
+    def test_sqrt(self):
+        for digits in (30, 200):
+            for x in self.VALUES:
+                self.assertEqual(precision.sqrt(x, digits), _reference(digits).sqrt(x), (digits, x))
+
+    def test_ln_and_log10(self):
+        for digits in (30, 200):
+            for x in self.VALUES:
+                self.assertEqual(precision.ln(x, digits), _reference(digits).ln(x), (digits, x))
+                self.assertEqual(precision.log(x, digits), _reference(digits).log10(x), (digits, x))
+
+    def test_exact_values(self):
+        self.assertEqual(precision.sqrt(4, 20), 2)
+        self.assertEqual(precision.ln(1, 20), 0)
+        self.assertEqual(precision.log(1000, 20), 3)
+        self.assertEqual(precision.log(8, 20, base=2), 3)
+
+
+class CancelTest(unittest.TestCase):
+
+    def setUp(self):
+        precision.clear_cache()
+        self.event = threading.Event()
+        self.event.set()
+
+    def test_functions_check_cancel_event(self):
+        for function, args in ((precision.sqrt, (2, 1000)), (precision.ln, (3, 1000)),
+                               (precision.log, (7, 1000, 3))):
+            with self.assertRaises(CalculationCancelledError, msg=function.__name__):
+                function(*args, cancel_event=self.event)
+
+
+if __name__ == '__main__':
+    unittest.main()
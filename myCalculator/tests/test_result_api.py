@@ -0,0 +1,41 @@
+"""不抛出异常的 Result API 回归测试：出错时只返回错误码"""
+
+import unittest
+
+from core.math_ext.advanced_math import MathFunctions
+from utils.error_handling import ERROR_OVERFLOW, ERROR_NEGATIVE_VALUE
+
+
+class PowerOverflowTest(unittest.TestCase):
+
+    def test_overflow_at_log2_boundary(self):
+        # y * log2(x) 略小于 1024，但实际结果溢出
+        result = MathFunctions.try_power(282.1686597969656, 125.79212882293386)
+        self.assertEqual(result.error, ERROR_OVERFLOW)
+
+    def test_predicted_overflow(self):
+        self.assertEqual(MathFunctions.try_power(10, 400).error, ERROR_OVERFLOW)
+
+    def test_large_finite_power(self):
+        result = MathFunctions.try_power(2, 1023)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.value, 2 ** 1023)
+
+
+class FactorialLimitTest(unittest.TestCase):
+
+    def test_huge_float_argument(self):
+        self.assertEqual(MathFunctions.try_factorial(1e308).error, ERROR_OVERFLOW)
+
+    def test_huge_int_argument_returns_immediately(self):
+        self.assertEqual(MathFunctions.try_factorial(2 ** 2000).error, ERROR_OVERFLOW)
+
+    def test_limits(self):
+        self.assertEqual(MathFunctions.try_factorial("5").value, 120)
+        self.assertTrue(MathFunctions.try_factorial(10000).ok)
+        self.assertEqual(MathFunctions.try_factorial(10001).error, ERROR_OVERFLOW)
+        self.assertEqual(MathFunctions.try_factorial(-1).error, ERROR_NEGATIVE_VALUE)
+
+
+if __name__ == "__main__":
+    unittest.main()
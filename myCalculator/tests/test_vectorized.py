@@ -0,0 +1,44 @@
+"""向量化求值回归测试：标量结果与错误掩码"""
+
+import math
+import unittest
+
+from core.stack_calc import vectorized
+from core.stack_calc.vectorized import evaluate_vectorized
+
+
+class ScalarResultTest(unittest.TestCase):
+
+    def test_constant_expression_has_one_element(self):
+        result = evaluate_vectorized("1/0")
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result.error_count, 1)
+        self.assertIn("size=1", repr(result))
+
+    def test_scalar_inputs(self):
+        result = evaluate_vectorized("x * 2", x=3)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(list(result.values), [6])
+
+
+@unittest.skipUnless(vectorized.NUMPY_AVAILABLE, "需要 NumPy")
+class ErrorMaskTest(unittest.TestCase):
+
+    def test_zero_division_and_domain_errors(self):
+        result = evaluate_vectorized("1 / x + sqrt(x - 1)", x=[0, 1, 2, 0.5])
+        self.assertEqual(result.zero_division_mask.tolist(), [True, False, False, False])
+        self.assertEqual(result.domain_error_mask.tolist(), [False, False, False, True])
+        self.assertEqual(result.values[2], 1.5)
+
+    def test_power_overflow_is_masked(self):
+        result = evaluate_vectorized("x ^ 400", x=[2, 10])
+        self.assertEqual(result.domain_error_mask.tolist(), [False, True])
+        self.assertTrue(math.isnan(result.values[1]))
+
+    def test_integer_inputs_do_not_wrap(self):
+        result = evaluate_vectorized("x * x", x=[2 ** 40])
+        self.assertEqual(result.values[0], float(2 ** 80))
+
+
+if __name__ == '__main__':
+    unittest.main()
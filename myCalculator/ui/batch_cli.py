@@ -0,0 +1,170 @@
+"""
+批量计算命令行模式
+从文件或标准输入逐行读取表达式，使用进程池分块并行计算，按输入顺序输出结果
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.stack_calc.engine import default_engine
+
+ERROR_PREFIX = "ERROR: "
+
+
+def evaluate_chunk(lines):
+    """计算一块表达式（在工作进程中执行）
+
+    Args:
+        lines: 表达式字符串列表
+
+    Returns:
+        (输出行列表, 错误列表)，错误为 (块内行号, 错误信息)
+    """
+    outputs = []
+    errors = []
+    evaluate = default_engine.evaluate
+    for index, line in enumerate(lines):
+        expression = line.strip()
+        if not expression:
+            outputs.append("")
+            continue
+        try:
+            outputs.append(str(evaluate(expression)))
+        except Exception as e:
+            message = str(e)
+            outputs.append(ERROR_PREFIX + message)
+            errors.append((index, message))
+    return outputs, errors
+
+
+def read_lines(paths):
+    """惰性读取所有输入源中的行，'-' 表示标准输入"""
+    for path in paths:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from f
+
+
+def iter_chunks(lines, chunk_size):
+    """把行迭代器切分为固定大小的块"""
+    iterator = iter(lines)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_results(chunks, workers):
+    """按输入顺序产出每块的计算结果
+
+    最多同时提交 workers * 2 个块，内存占用与输入总大小无关。
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield evaluate_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(evaluate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(paths, output, workers=None, chunk_size=10000, error_stream=None):
+    """执行批量计算
+
+    Args:
+        paths: 输入文件路径列表，'-' 表示标准输入
+        output: 结果输出流
+        workers: 工作进程数，默认为CPU核数
+        chunk_size: 每块包含的行数
+        error_stream: 逐行错误报告的输出流
+
+    Returns:
+        统计信息字典
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size <= 0:
+        raise ValueError("块大小必须大于0")
+
+    start = time.perf_counter()
+    line_count = 0
+    error_count = 0
+    byte_count = 0
+
+    for outputs, errors in iter_results(iter_chunks(read_lines(paths), chunk_size), workers):
+        for index, message in errors:
+            if error_stream is not None:
+                error_stream.write(f"第{line_count + index + 1}行: {message}\n")
+        text = "\n".join(outputs) + "\n"
+        output.write(text)
+        byte_count += len(text)
+        line_count += len(outputs)
+        error_count += len(errors)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'lines': line_count,
+        'errors': error_count,
+        'seconds': elapsed,
+        'lines_per_second': line_count / elapsed if elapsed else 0.0,
+        'output_bytes': byte_count
+    }
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(
+        prog="myCalculator --batch",
+        description="逐行计算文件或标准输入中的表达式，结果按输入顺序输出"
+    )
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="输入文件，'-' 或省略表示标准输入")
+    parser.add_argument('-o', '--output', help="结果输出文件，默认为标准输出")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="工作进程数，默认为CPU核数，1 表示不使用进程池")
+    parser.add_argument('-c', '--chunk-size', type=int, default=10000,
+                        help="每个任务块包含的行数（默认10000）")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="不输出逐行错误信息和吞吐量统计")
+    args = parser.parse_args(argv)
+
+    error_stream = None if args.quiet else sys.stderr
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                stats = run_batch(args.inputs, output, args.workers, args.chunk_size, error_stream)
+        else:
+            stats = run_batch(args.inputs, sys.stdout, args.workers, args.chunk_size, error_stream)
+    except (OSError, ValueError) as e:
+        print(f"批量计算失败: {str(e)}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"共 {stats['lines']} 行，错误 {stats['errors']} 行，"
+              f"耗时 {stats['seconds']:.3f} 秒，"
+              f"吞吐量 {stats['lines_per_second']:,.0f} 行/秒",
+              file=sys.stderr)
+    return 0 if stats['errors'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ from tkinter import ttk, messagebox
 import sys
 import os
 import math
+import time
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,6 +16,10 @@ sys.path.append(project_root)
 
 from core.stack_calc.basic_calculator import Calculator
 from core.math_ext.advanced_math import MathFunctions
+from core.math_ext import combinatorics, number_theory, precision
+from core.stack_calc import sampling
+from utils.background_task import BackgroundTask
+from utils.error_handling import CalculationCancelledError
 try:
     from convert.number_system.base_converter import NumberSystemConverter
     from convert.length.length_units import LengthConverter
@@ -33,6 +38,10 @@ except ImportError as e:
     class LengthConverter:
         def convert(self, value, from_unit, to_unit):
             return "模块不可用"
+        def get_unit_labels(self):
+            return {"米": "meter", "英尺": "foot", "英寸": "inch"}
+        def format_result(self, value, unit):
+            return str(value)
         def get_conversion_info(self):
             return {"错误": "模块不可用"}
 
@@ -58,6 +67,17 @@ except ImportError as e:
         def compare_methods(self):
             return {"error": "模块不可用"}
 
+# 结果超过该位数时在后台线程中计算
+BACKGROUND_DIGITS = 20000
+# 轮询后台任务的间隔（毫秒）
+POLL_INTERVAL_MS = 50
+# 高精度计算超过该有效位数时在后台线程中计算
+PRECISION_BACKGROUND_DIGITS = 5000
+# 需要按整数精确解析输入的数论运算
+NUMBER_THEORY_OPERATIONS = ("is_prime", "next_prime", "factorize", "gcd", "lcm", "modinv")
+# 求根、求极值结果在状态栏中最多列出的个数
+PLOT_LISTED_POINTS = 8
+
 class CalculatorApp:
     """计算器应用程序主类"""
 
@@ -66,7 +86,7 @@ class CalculatorApp:
         self.root = tk.Tk()
         self.root.title("🧮 多功能计算器 - myCalculator")
         # 设置合适的窗口尺寸
-        self.root.geometry("610x720")
+        self.root.geometry("610x860")
         self.root.resizable(True, True)
 
         # 设置窗口居中
@@ -80,6 +100,14 @@ class CalculatorApp:
         self.currency_converter = CurrencyConverter()
         self.loan_calculator = LoanCalculator()
 
+        # 正在后台执行的数学计算任务，以及显示其结果的回调
+        self.math_task = None
+        self.math_task_show = None
+
+        # 函数绘图的采样结果 (参数, xs, ys) 和标记点 [(x, y), ...]
+        self.plot_samples = None
+        self.plot_markers = []
+
         # 当前计算器状态
         self.current_display = "0"
         self.new_number = True
@@ -116,6 +144,8 @@ class CalculatorApp:
         # 创建各个功能页面
         self.create_basic_calculator_tab()
         self.create_math_functions_tab()
+        self.create_precision_tab()
+        self.create_plot_tab()
         self.create_number_system_tab()
         self.create_length_converter_tab()
         self.create_currency_converter_tab()
@@ -143,6 +173,19 @@ class CalculatorApp:
         )
         self.display.pack(fill=tk.X)
 
+        # 实时预览 - 每次输入后显示当前表达式的计算结果
+        self.preview_var = tk.StringVar(value="")
+        preview_label = ttk.Label(
+            display_frame,
+            textvariable=self.preview_var,
+            font=("Arial", 13),
+            anchor="e",
+            background="#1a1a1a",
+            foreground="#95a5a6",
+            padding=(15, 2)
+        )
+        preview_label.pack(fill=tk.X)
+
         # 按钮框架 - 更紧凑的布局
         button_frame = ttk.Frame(basic_frame)
         button_frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
@@ -251,7 +294,10 @@ class CalculatorApp:
             ("|x| 绝对值", lambda: self.calculate_math("absolute")),
             ("⌈x⌉ 向上取整", lambda: self.calculate_math("ceil")),
             ("⌊x⌋ 向下取整", lambda: self.calculate_math("floor")),
-            ("四舍五入", lambda: self.calculate_math("round"))
+            ("四舍五入", lambda: self.calculate_math("round")),
+            ("C(x,y) 组合", lambda: self.calculate_math("combination")),
+            ("P(x,y) 排列", lambda: self.calculate_math("permutation")),
+            ("⏹ 取消计算", self.cancel_math_task)
         ]
 
         for i, (text, command) in enumerate(advanced_functions):
@@ -262,6 +308,27 @@ class CalculatorApp:
         for i in range(3):
             advanced_frame.grid_columnconfigure(i, weight=1)
 
+        # 数论函数
+        number_theory_frame = ttk.LabelFrame(functions_frame, text="🔐 数论函数", padding=12)
+        number_theory_frame.pack(fill=tk.X, pady=(0, 15))
+
+        number_theory_functions = [
+            ("素数判定", lambda: self.calculate_math("is_prime")),
+            ("质因数分解", lambda: self.calculate_math("factorize")),
+            ("下一个素数", lambda: self.calculate_math("next_prime")),
+            ("gcd(x,y)", lambda: self.calculate_math("gcd")),
+            ("lcm(x,y)", lambda: self.calculate_math("lcm")),
+            ("x⁻¹ mod y", lambda: self.calculate_math("modinv"))
+        ]
+
+        for i, (text, command) in enumerate(number_theory_functions):
+            btn = ttk.Button(number_theory_frame, text=text, command=command, width=14,
+                           style="MathFunction.TButton")
+            btn.grid(row=i//3, column=i%3, sticky="ew", padx=6, pady=8)
+
+        for i in range(3):
+            number_theory_frame.grid_columnconfigure(i, weight=1)
+
         # 三角函数
         trig_frame = ttk.LabelFrame(functions_frame, text="📐 三角函数", padding=12)
         trig_frame.pack(fill=tk.X)
@@ -282,6 +349,125 @@ class CalculatorApp:
         for i in range(3):
             trig_frame.grid_columnconfigure(i, weight=1)
 
+    def create_precision_tab(self):
+        """创建高精度计算页面"""
+        precision_frame = ttk.Frame(self.notebook)
+        self.notebook.add(precision_frame, text="🎯 高精度")
+
+        large_font = ("Arial", 14, "bold")
+        entry_font = ("Arial", 13)
+
+        input_frame = ttk.LabelFrame(precision_frame, text="📝 输入参数", padding=15)
+        input_frame.pack(fill=tk.X, padx=15, pady=15)
+
+        ttk.Label(input_frame, text="数值 X:", font=large_font).grid(row=0, column=0, sticky="w", padx=10, pady=12)
+        self.precision_input_var = tk.StringVar(value="2")
+        ttk.Entry(input_frame, textvariable=self.precision_input_var, width=20,
+                  font=entry_font).grid(row=0, column=1, padx=10, pady=12, sticky="ew")
+
+        ttk.Label(input_frame, text="有效位数:", font=large_font).grid(row=0, column=2, sticky="w", padx=10, pady=12)
+        self.precision_digits_var = tk.StringVar(value="50")
+        ttk.Entry(input_frame, textvariable=self.precision_digits_var, width=10,
+                  font=entry_font).grid(row=0, column=3, padx=10, pady=12, sticky="ew")
+
+        self.precision_degrees_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(input_frame, text="三角函数使用角度制", variable=self.precision_degrees_var
+                        ).grid(row=1, column=0, columnspan=4, sticky="w", padx=10)
+
+        input_frame.grid_columnconfigure(1, weight=1)
+
+        button_frame = ttk.LabelFrame(precision_frame, text="🧮 常数与函数", padding=12)
+        button_frame.pack(fill=tk.X, padx=15, pady=(0, 15))
+
+        precision_functions = [
+            ("π 圆周率", lambda: self.calculate_precision("pi")),
+            ("e 自然常数", lambda: self.calculate_precision("e")),
+            ("√x 平方根", lambda: self.calculate_precision("sqrt")),
+            ("ln 自然对数", lambda: self.calculate_precision("ln")),
+            ("log₁₀ 常用对数", lambda: self.calculate_precision("log10")),
+            ("sin 正弦", lambda: self.calculate_precision("sin")),
+            ("cos 余弦", lambda: self.calculate_precision("cos")),
+            ("tan 正切", lambda: self.calculate_precision("tan")),
+            ("⏹ 取消计算", self.cancel_math_task)
+        ]
+
+        for i, (text, command) in enumerate(precision_functions):
+            btn = ttk.Button(button_frame, text=text, command=command, width=14,
+                           style="MathFunction.TButton")
+            btn.grid(row=i//3, column=i%3, sticky="ew", padx=6, pady=8)
+
+        for i in range(3):
+            button_frame.grid_columnconfigure(i, weight=1)
+
+        result_frame = ttk.LabelFrame(precision_frame, text="📋 计算结果", padding=15)
+        result_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
+
+        self.precision_status_var = tk.StringVar()
+        ttk.Label(result_frame, textvariable=self.precision_status_var,
+                  font=("Arial", 11)).pack(side=tk.BOTTOM, anchor="w", pady=(8, 0))
+
+        self.precision_result_text = tk.Text(result_frame, height=10, font=("Courier New", 12),
+                                             wrap="char", bg="#34495e", fg="white",
+                                             relief="solid", borderwidth=1, padx=10, pady=10)
+        scrollbar = ttk.Scrollbar(result_frame, orient="vertical", command=self.precision_result_text.yview)
+        self.precision_result_text.configure(yscrollcommand=scrollbar.set, state="disabled")
+        self.precision_result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def create_plot_tab(self):
+        """创建函数绘图页面"""
+        plot_frame = ttk.Frame(self.notebook)
+        self.notebook.add(plot_frame, text="📈 函数绘图")
+
+        large_font = ("Arial", 14, "bold")
+        entry_font = ("Arial", 13)
+
+        input_frame = ttk.LabelFrame(plot_frame, text="📝 函数与区间", padding=15)
+        input_frame.pack(fill=tk.X, padx=15, pady=15)
+
+        ttk.Label(input_frame, text="f(x) =", font=large_font).grid(row=0, column=0, sticky="w", padx=10, pady=8)
+        self.plot_expression_var = tk.StringVar(value="x^3 - 3*x")
+        ttk.Entry(input_frame, textvariable=self.plot_expression_var,
+                  font=entry_font).grid(row=0, column=1, columnspan=5, padx=10, pady=8, sticky="ew")
+
+        self.plot_x_min_var = tk.StringVar(value="-3")
+        self.plot_x_max_var = tk.StringVar(value="3")
+        self.plot_points_var = tk.StringVar(value="1000")
+        for column, (text, variable) in enumerate([("x 最小:", self.plot_x_min_var),
+                                                   ("x 最大:", self.plot_x_max_var),
+                                                   ("采样点:", self.plot_points_var)]):
+            ttk.Label(input_frame, text=text).grid(row=1, column=column * 2, sticky="w", padx=10, pady=8)
+            ttk.Entry(input_frame, textvariable=variable, width=8,
+                      font=entry_font).grid(row=1, column=column * 2 + 1, padx=5, pady=8, sticky="ew")
+
+        for i in (1, 3, 5):
+            input_frame.grid_columnconfigure(i, weight=1)
+
+        button_frame = ttk.Frame(plot_frame)
+        button_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
+
+        plot_buttons = [
+            ("📈 绘制", self.plot_function),
+            ("求根 f(x)=0", lambda: self.find_plot_points("roots")),
+            ("求极值", lambda: self.find_plot_points("extrema"))
+        ]
+        for i, (text, command) in enumerate(plot_buttons):
+            ttk.Button(button_frame, text=text, command=command,
+                       style="MathFunction.TButton").grid(row=0, column=i, sticky="ew", padx=6)
+            button_frame.grid_columnconfigure(i, weight=1)
+
+        canvas_frame = ttk.LabelFrame(plot_frame, text="📋 函数图像", padding=10)
+        canvas_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
+
+        self.plot_status_var = tk.StringVar()
+        ttk.Label(canvas_frame, textvariable=self.plot_status_var, wraplength=520,
+                  font=("Arial", 11)).pack(side=tk.BOTTOM, anchor="w", pady=(8, 0))
+
+        self.plot_canvas = tk.Canvas(canvas_frame, bg="#1a1a1a", highlightthickness=0, height=360)
+        self.plot_canvas.pack(fill=tk.BOTH, expand=True)
+        # 画布尺寸变化时按新的像素列数重新降采样
+        self.plot_canvas.bind("<Configure>", lambda event: self.draw_plot())
+
     def create_number_system_tab(self):
         """创建进制转换页面"""
         num_frame = ttk.Frame(self.notebook)
@@ -304,7 +490,8 @@ class CalculatorApp:
 
         ttk.Label(input_frame, text="源进制:", font=large_font).grid(row=1, column=0, sticky="w", padx=8, pady=10)
         self.num_from_base_var = tk.StringVar(value="10")
-        base_combo = ttk.Combobox(input_frame, textvariable=self.num_from_base_var, values=["2", "8", "10", "16"], width=12, font=entry_font)
+        base_values = [str(base) for base in range(2, 37)]
+        base_combo = ttk.Combobox(input_frame, textvariable=self.num_from_base_var, values=base_values, width=12, font=entry_font)
         base_combo.grid(row=1, column=1, padx=8, pady=10, sticky="w")
 
         # 转换按钮 - 使用更大的按钮
@@ -332,6 +519,17 @@ class CalculatorApp:
                                    state="readonly", font=result_font, width=40)
             result_entry.grid(row=i, column=1, padx=8, pady=12, sticky="ew")
 
+        # 任意进制（2-36）的结果
+        custom_frame = ttk.Frame(result_frame)
+        custom_frame.grid(row=len(result_labels), column=0, sticky="w", padx=8, pady=12)
+        self.num_custom_base_var = tk.StringVar(value="36")
+        ttk.Combobox(custom_frame, textvariable=self.num_custom_base_var, values=base_values,
+                     width=3, font=label_font).pack(side=tk.LEFT)
+        ttk.Label(custom_frame, text="进制:", font=large_font).pack(side=tk.LEFT)
+        self.num_custom_var = tk.StringVar()
+        ttk.Entry(result_frame, textvariable=self.num_custom_var, state="readonly",
+                  font=result_font, width=40).grid(row=len(result_labels), column=1, padx=8, pady=12, sticky="ew")
+
         result_frame.grid_columnconfigure(1, weight=1)
 
     def create_length_converter_tab(self):
@@ -346,15 +544,11 @@ class CalculatorApp:
         result_font = ("Arial", 13, "bold")
         info_font = ("Arial", 13)
 
-        # 单位映射
-        unit_mapping = {
-            "meter": "米",
-            "foot": "英尺",
-            "inch": "英寸"
-        }
+        # 单位映射：中文名称 -> 单位名称（长度、面积、体积单位按注册表顺序排列）
+        reverse_unit_mapping = self.length_converter.get_unit_labels()
 
         # 反向映射
-        reverse_unit_mapping = {v: k for k, v in unit_mapping.items()}
+        unit_mapping = {v: k for k, v in reverse_unit_mapping.items()}
 
         # 输入框架 - 使用更大的间距和字体
         input_frame = ttk.LabelFrame(length_frame, text="输入长度", padding=15)
@@ -777,6 +971,14 @@ class CalculatorApp:
         style.map("TCombobox",
                  focuscolor=[("focus", "#3498db")])
 
+    def update_preview(self):
+        """根据增量求值状态刷新实时预览"""
+        if self.new_number:
+            self.preview_var.set("")
+            return
+        result = self.calculator.preview()
+        self.preview_var.set("" if result is None else f"= {result}")
+
     def on_basic_button_click(self, button_text):
         """处理基础计算器按钮点击"""
         try:
@@ -850,15 +1052,22 @@ class CalculatorApp:
                 self.calculator.input_digit(')')
                 self.display_var.set(self.calculator.get_current_expression())
 
+            self.update_preview()
+
         except Exception as e:
             messagebox.showerror("计算错误", str(e))
             self.calculator.clear()
             self.display_var.set("0")
             self.new_number = True
+            self.preview_var.set("")
 
     def calculate_math(self, operation):
         """计算数学函数"""
         try:
+            if operation in NUMBER_THEORY_OPERATIONS:
+                self.calculate_number_theory(operation)
+                return
+
             num1 = float(self.math_input_var.get())
             num2 = None
 
@@ -872,8 +1081,9 @@ class CalculatorApp:
                 result = self.math_functions.modulus(num1, num2)
             elif operation == "reciprocal":
                 result = self.math_functions.reciprocal(num1)
-            elif operation == "factorial":
-                result = self.math_functions.factorial(num1)
+            elif operation in ("factorial", "combination", "permutation"):
+                self.calculate_combinatorics(operation)
+                return
             elif operation == "absolute":
                 result = self.math_functions.absolute(num1)
             elif operation == "log10":
@@ -900,22 +1110,269 @@ class CalculatorApp:
         except Exception as e:
             messagebox.showerror("计算错误", str(e))
 
+    @staticmethod
+    def parse_integer(text):
+        """把输入解析为整数，允许 "5.0" 这样的整数值小数"""
+        value = float(text)
+        if not value.is_integer():
+            raise ValueError("请输入整数")
+        return int(text) if text.strip().lstrip('+-').isdigit() else int(value)
+
+    def calculate_combinatorics(self, operation):
+        """计算阶乘、组合数 C(x,y) 或排列数 P(x,y)
+
+        先用 lgamma 估计结果位数，位数较多时转入后台线程计算，
+        界面保持响应并可随时取消。
+        """
+        n = self.parse_integer(self.math_input_var.get())
+        if operation == "factorial":
+            function = combinatorics.factorial
+            args = (n,)
+            digits = combinatorics.factorial_digits(n)
+        else:
+            k = self.parse_integer(self.math_input2_var.get())
+            if operation == "combination":
+                function = combinatorics.binomial
+                digits = combinatorics.binomial_digits(n, k)
+            else:
+                function = combinatorics.permutation
+                digits = combinatorics.permutation_digits(n, k)
+            args = (n, k)
+
+        self.cancel_math_task()
+        if digits <= BACKGROUND_DIGITS:
+            self.math_result_var.set(combinatorics.format_large_integer(function(*args)))
+            return
+
+        self.start_math_task(function, args, combinatorics.format_large_integer,
+                             f"计算中...（约 {digits} 位）")
+
+    def calculate_number_theory(self, operation):
+        """计算数论函数，输入按整数精确解析（不经过浮点数）"""
+        x = self.parse_integer(self.math_input_var.get())
+        if operation == "factorize":
+            # 大数分解耗时不可预估，始终在后台执行
+            self.cancel_math_task()
+            self.start_math_task(number_theory.factorize, (x,),
+                                 number_theory.format_factorization, "分解中...")
+            return
+
+        if operation == "is_prime":
+            result = "是素数" if number_theory.is_prime(x) else "不是素数"
+        elif operation == "next_prime":
+            result = number_theory.next_prime(x)
+        else:
+            y = self.parse_integer(self.math_input2_var.get())
+            if operation == "gcd":
+                result = number_theory.gcd_all((x, y))
+            elif operation == "lcm":
+                result = number_theory.lcm_all((x, y))
+            else:
+                result = number_theory.modinv(x, y)
+        self.math_result_var.set(str(result))
+
+    def calculate_precision(self, operation):
+        """按指定有效位数计算常数或函数，结果显示在高精度页面"""
+        try:
+            digits = self.parse_integer(self.precision_digits_var.get())
+            degrees = self.precision_degrees_var.get()
+            if operation == "pi":
+                function, args = precision.pi, (digits,)
+            elif operation == "e":
+                function, args = precision.e, (digits,)
+            else:
+                x = precision.to_decimal(self.precision_input_var.get())
+                if operation == "sqrt":
+                    function, args = precision.sqrt, (x, digits)
+                elif operation == "ln":
+                    function, args = precision.ln, (x, digits)
+                elif operation == "log10":
+                    function, args = precision.log, (x, digits)
+                elif operation in ("sin", "cos", "tan"):
+                    function, args = getattr(precision, operation), (x, digits, degrees)
+                else:
+                    raise ValueError("未知操作")
+
+            self.cancel_math_task()
+            start = time.perf_counter()
+
+            def show(text):
+                self.show_precision_result(text, f"{digits} 位有效数字，耗时 "
+                                                 f"{time.perf_counter() - start:.3f} 秒")
+
+            if digits <= PRECISION_BACKGROUND_DIGITS:
+                show(precision.format_decimal(function(*args)))
+            else:
+                self.start_math_task(function, args, precision.format_decimal,
+                                     f"计算中...（{digits} 位）", show)
+
+        except Exception as e:
+            messagebox.showerror("计算错误", str(e))
+
+    def show_precision_result(self, text, status=""):
+        """在高精度页面的结果区域显示文本"""
+        self.precision_result_text.config(state="normal")
+        self.precision_result_text.delete("1.0", tk.END)
+        self.precision_result_text.insert("1.0", text)
+        self.precision_result_text.config(state="disabled")
+        self.precision_status_var.set(status)
+
+    def start_math_task(self, function, args, formatter, message, show=None):
+        """在后台线程中执行计算，完成后用 formatter 格式化结果并交给 show 显示
+
+        show 默认显示在数学函数页面的结果框中。
+        """
+        self.math_task_show = show or self.math_result_var.set
+        self.math_task_show(message)
+        self.math_task = BackgroundTask(function, *args).start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_math_task, self.math_task, formatter)
+
+    def poll_math_task(self, task, formatter):
+        """轮询后台任务，完成后显示结果"""
+        if task is not self.math_task:
+            return
+        if not task.done:
+            self.root.after(POLL_INTERVAL_MS, self.poll_math_task, task, formatter)
+            return
+
+        self.math_task = None
+        try:
+            self.math_task_show(formatter(task.result()))
+        except CalculationCancelledError:
+            self.math_task_show("计算已取消")
+        except Exception as e:
+            self.math_task_show("")
+            messagebox.showerror("计算错误", str(e))
+
+    def cancel_math_task(self):
+        """取消正在后台执行的数学计算"""
+        if self.math_task is not None:
+            self.math_task.cancel()
+            self.math_task = None
+            self.math_task_show("计算已取消")
+
+    def read_plot_parameters(self):
+        """读取绘图页面的输入，返回 (表达式, x最小, x最大, 采样点数)"""
+        expression = self.plot_expression_var.get().strip()
+        if not expression:
+            raise ValueError("请输入函数表达式")
+        try:
+            x_min = float(self.plot_x_min_var.get())
+            x_max = float(self.plot_x_max_var.get())
+        except ValueError:
+            raise ValueError("请输入有效的区间端点")
+        points = self.parse_integer(self.plot_points_var.get())
+        if not 3 <= points <= sampling.MAX_SAMPLES:
+            raise ValueError(f"采样点数必须在 3 到 {sampling.MAX_SAMPLES} 之间")
+        return expression, x_min, x_max, points
+
+    def sample_plot(self):
+        """按当前输入采样，参数未变时复用上次的采样结果"""
+        parameters = self.read_plot_parameters()
+        if self.plot_samples is None or self.plot_samples[0] != parameters:
+            xs, ys = sampling.sample_function(*parameters)
+            self.plot_samples = (parameters, xs, ys)
+            self.plot_markers = []
+        return self.plot_samples
+
+    def plot_function(self):
+        """采样并绘制函数图像"""
+        try:
+            start = time.perf_counter()
+            self.plot_samples = None
+            _, xs, ys = self.sample_plot()
+            self.draw_plot()
+            # NaN 不等于自身，出错的采样点 y 为 NaN
+            invalid = int((ys != ys).sum())
+            status = f"采样 {len(xs)} 个点（自适应加密后），耗时 {(time.perf_counter() - start) * 1000:.1f} ms"
+            if invalid:
+                status += f"，其中 {invalid} 个点无定义"
+            self.plot_status_var.set(status)
+        except Exception as e:
+            messagebox.showerror("绘图错误", str(e))
+
+    def find_plot_points(self, kind):
+        """在绘图区间内求根或求极值，并在图像上标出"""
+        try:
+            (expression, x_min, x_max, points), xs, ys = self.sample_plot()
+            if kind == "roots":
+                roots = sampling.find_roots(expression, x_min, x_max, samples=(xs, ys))
+                self.plot_markers = [(x, 0.0) for x in roots]
+                items = [f"x = {x:.10g}" for x in roots]
+                title = "根"
+            else:
+                extrema = sampling.find_extrema(expression, x_min, x_max, samples=(xs, ys))
+                self.plot_markers = [(x, y) for x, y, _ in extrema]
+                items = [f"{'极小' if extremum == 'min' else '极大'} ({x:.8g}, {y:.8g})"
+                         for x, y, extremum in extrema]
+                title = "极值点"
+            self.draw_plot()
+
+            if not items:
+                self.plot_status_var.set(f"区间内没有找到{title}")
+                return
+            text = "，".join(items[:PLOT_LISTED_POINTS])
+            if len(items) > PLOT_LISTED_POINTS:
+                text += f" ... 共 {len(items)} 个"
+            self.plot_status_var.set(f"{title}: {text}")
+        except Exception as e:
+            messagebox.showerror("计算错误", str(e))
+
+    def draw_plot(self):
+        """在画布上绘制坐标轴、函数曲线和标记点"""
+        canvas = self.plot_canvas
+        canvas.delete("all")
+        if self.plot_samples is None:
+            return
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 2 or height < 2:
+            return
+
+        (_, x_min, x_max, _), xs, ys = self.plot_samples
+        y_min, y_max = sampling.auto_y_range(xs, ys)
+
+        def to_canvas(x, y):
+            return ((x - x_min) / (x_max - x_min) * width,
+                    (y_max - y) / (y_max - y_min) * (height - 1))
+
+        # 坐标轴（在显示范围内时）和范围标注
+        axis_color = "#7f8c8d"
+        if x_min <= 0 <= x_max:
+            column, _ = to_canvas(0, 0)
+            canvas.create_line(column, 0, column, height, fill=axis_color)
+        if y_min <= 0 <= y_max:
+            _, row = to_canvas(0, 0)
+            canvas.create_line(0, row, width, row, fill=axis_color)
+        label_font = ("Arial", 9)
+        canvas.create_text(4, 4, anchor="nw", text=f"{y_max:.4g}", fill=axis_color, font=label_font)
+        canvas.create_text(4, height - 4, anchor="sw", text=f"{y_min:.4g}", fill=axis_color, font=label_font)
+        canvas.create_text(width - 4, height - 4, anchor="se", text=f"x ∈ [{x_min:g}, {x_max:g}]",
+                           fill=axis_color, font=label_font)
+
+        # 每个像素列最多画4个点，采样点再多也不会拖慢画布
+        columns, values, breaks = sampling.downsample_minmax(xs, ys, width, (x_min, x_max))
+        for line in sampling.canvas_lines(columns, values, breaks, height, (y_min, y_max)):
+            canvas.create_line(*line, fill="#4fc3f7", width=2)
+
+        for x, y in self.plot_markers:
+            if y_min <= y <= y_max:
+                column, row = to_canvas(x, y)
+                canvas.create_oval(column - 4, row - 4, column + 4, row + 4, outline="#e67e22", width=2)
+
     def convert_number_system(self):
         """进制转换"""
         try:
             number = self.num_input_var.get()
             from_base = int(self.num_from_base_var.get())
+            custom_base = int(self.num_custom_base_var.get())
 
-            # 转换为所有进制
-            decimal_value = self.number_converter.convert(number, from_base, 10)
-            binary_value = self.number_converter.convert(decimal_value, 10, 2)
-            octal_value = self.number_converter.convert(decimal_value, 10, 8)
-            hex_value = self.number_converter.convert(decimal_value, 10, 16)
-
-            self.num_binary_var.set(binary_value)
-            self.num_octal_var.set(octal_value)
-            self.num_decimal_var.set(decimal_value)
-            self.num_hex_var.set(hex_value)
+            # 直接从源进制转换为各目标进制（小数可能被截断，不经过十进制中转）
+            self.num_binary_var.set(self.number_converter.convert(number, from_base, 2))
+            self.num_octal_var.set(self.number_converter.convert(number, from_base, 8))
+            self.num_decimal_var.set(self.number_converter.convert(number, from_base, 10))
+            self.num_hex_var.set(self.number_converter.convert(number, from_base, 16))
+            self.num_custom_var.set(self.number_converter.convert(number, from_base, custom_base))
 
         except Exception as e:
             messagebox.showerror("转换错误", str(e))
@@ -931,15 +1388,17 @@ class CalculatorApp:
             from_unit = self.length_reverse_unit_mapping.get(from_unit_chinese, from_unit_chinese)
             to_unit = self.length_reverse_unit_mapping.get(to_unit_chinese, to_unit_chinese)
 
-            # 执行转换
+            # 执行转换（结果为数值）
             result = self.length_converter.convert(value, from_unit, to_unit)
 
             # 格式化结果显示，使用中文单位
-            if isinstance(result, str) and "英尺" in result and "英寸" in result:
-                # 特殊处理英尺英寸的显示格式
+            if isinstance(result, str):
                 result_text = f"📏 {value} {from_unit_chinese} = {result}"
             else:
-                result_text = f"📏 {value} {from_unit_chinese} = {result} {to_unit_chinese}"
+                result_text = f"📏 {value} {from_unit_chinese} = {self.length_converter.format_result(result, to_unit)}"
+                if to_unit == 'foot':
+                    # 英尺同时显示英尺英寸形式
+                    result_text += f"（{self.length_converter.format_feet_inches(result)}）"
 
             self.length_result_var.set(result_text)
 
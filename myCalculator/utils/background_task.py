@@ -0,0 +1,66 @@
+"""
+后台任务模块
+在守护线程中执行耗时计算，界面线程通过轮询获取结果，并可随时请求取消
+"""
+
+import threading
+
+from utils.error_handling import CalculationCancelledError
+
+
+class BackgroundTask:
+    """后台计算任务
+
+    目标函数需要接受关键字参数 cancel_event（threading.Event），
+    并在计算过程中定期检查，触发后抛出 CalculationCancelledError。
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel_event = threading.Event()
+        self._thread = None
+        self._result = None
+        self._error = None
+
+    def start(self):
+        """启动任务，返回自身便于链式调用"""
+        if self._thread is not None:
+            raise RuntimeError("任务已经启动")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self._result = self.function(*self.args, cancel_event=self.cancel_event, **self.kwargs)
+        except BaseException as e:
+            self._error = e
+
+    def cancel(self):
+        """请求取消任务（计算在下一个检查点停止）"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        """是否已请求取消"""
+        return self.cancel_event.is_set()
+
+    @property
+    def done(self):
+        """任务是否已结束（完成、出错或已取消）"""
+        return self._thread is not None and not self._thread.is_alive()
+
+    def result(self, timeout=None):
+        """等待并返回任务结果，任务出错时重新抛出其异常"""
+        if self._thread is None:
+            raise RuntimeError("任务尚未启动")
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("任务尚未完成")
+        if self._error is not None:
+            raise self._error
+        if self.cancelled:
+            raise CalculationCancelledError()
+        return self._result
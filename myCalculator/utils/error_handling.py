@@ -53,4 +53,52 @@ class ParameterError(CalculatorError):
     """参数错误异常"""
     def __init__(self, message="参数设置错误"):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class CalculationCancelledError(CalculatorError):
+    """计算被取消异常"""
+    def __init__(self, message="计算已取消"):
+        self.message = message
+        super().__init__(self.message)
+
+
+# 结果 API 的错误码：不抛出异常，而是在 Result 对象中返回错误码
+ERROR_NONE = 0
+ERROR_INVALID_NUMBER = 1
+ERROR_NEGATIVE_VALUE = 2
+ERROR_DIVISION_BY_ZERO = 3
+ERROR_DOMAIN = 4
+ERROR_OVERFLOW = 5
+ERROR_INVALID_DIGIT = 6
+ERROR_UNSUPPORTED_BASE = 7
+ERROR_UNSUPPORTED_UNIT = 8
+ERROR_INVALID_PARAMETER = 9
+ERROR_DIMENSION_MISMATCH = 10
+
+ERROR_MESSAGES = {
+    ERROR_NONE: "",
+    ERROR_INVALID_NUMBER: "无效的数值",
+    ERROR_NEGATIVE_VALUE: "数值不能为负数",
+    ERROR_DIVISION_BY_ZERO: "除数不能为零",
+    ERROR_DOMAIN: "超出函数定义域",
+    ERROR_OVERFLOW: "结果超出范围",
+    ERROR_INVALID_DIGIT: "数字不符合指定进制",
+    ERROR_UNSUPPORTED_BASE: "不支持的进制",
+    ERROR_UNSUPPORTED_UNIT: "不支持的单位",
+    ERROR_INVALID_PARAMETER: "参数设置错误",
+    ERROR_DIMENSION_MISMATCH: "单位的量纲不一致"
+}
+
+# 需要转换为异常时（Result.unwrap）使用的异常类型
+ERROR_EXCEPTIONS = {
+    ERROR_INVALID_NUMBER: InvalidInputError,
+    ERROR_NEGATIVE_VALUE: ValidationError,
+    ERROR_DIVISION_BY_ZERO: DivisionByZeroError,
+    ERROR_DOMAIN: ValidationError,
+    ERROR_OVERFLOW: ValidationError,
+    ERROR_INVALID_DIGIT: ConversionError,
+    ERROR_UNSUPPORTED_BASE: ConversionError,
+    ERROR_UNSUPPORTED_UNIT: ConversionError,
+    ERROR_INVALID_PARAMETER: ParameterError,
+    ERROR_DIMENSION_MISMATCH: ConversionError
+}
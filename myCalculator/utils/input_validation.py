@@ -96,9 +96,10 @@ class InputValidator:
 
     @staticmethod
     def is_valid_length_unit(unit):
-        """检查是否为有效的长度单位"""
-        valid_units = ['meter', 'foot', 'inch']
-        return unit in valid_units
+        """检查是否为有效的长度（含面积、体积）单位"""
+        # 延迟导入：utils 不在导入时依赖换算层
+        from convert.length.unit_registry import length_units
+        return unit in length_units
 
     @staticmethod
     def is_valid_loan_term(term):
@@ -121,32 +122,38 @@ class InputValidator:
     @staticmethod
     def is_valid_expression(expr):
         """检查是否为有效的数学表达式"""
+        # 延迟导入：utils 不在导入时依赖计算层
+        from core.stack_calc.tokenizer import tokenize, NUMBER, NAME, COMMA, LPAREN, RPAREN
+
         if not isinstance(expr, str):
             return False
 
-        # 移除所有空白字符
-        expr = expr.replace(" ", "")
+        # 一次扫描完成字符合法性检查
+        try:
+            tokens = tokenize(expr)
+        except ValueError:
+            return False
 
-        if not expr:
+        if not tokens:
             return False
 
-        # 检查是否包含有效字符
-        valid_chars = "0123456789.+-*/()"
-        for char in expr:
-            if char not in valid_chars:
+        # 简单的括号匹配检查；相邻的两个数字（如 "1 2"、"1..2"）之间缺少运算符
+        depth = 0
+        previous = None
+        for token in tokens:
+            if token.kind is NAME or token.kind is COMMA:
                 return False
-
-        # 简单的括号匹配检查
-        stack = []
-        for char in expr:
-            if char == '(':
-                stack.append(char)
-            elif char == ')':
-                if not stack:
+            elif token.kind is NUMBER and previous is NUMBER:
+                return False
+            elif token.kind is LPAREN:
+                depth += 1
+            elif token.kind is RPAREN:
+                if depth == 0:
                     return False
-                stack.pop()
+                depth -= 1
+            previous = token.kind
 
-        return len(stack) == 0
+        return depth == 0
 
     @staticmethod
     def sanitize_number_input(value):
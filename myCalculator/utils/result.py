@@ -0,0 +1,141 @@
+"""
+计算结果对象模块
+为批量调用提供不抛出异常的 API：输入在计算前校验，
+出错时返回带错误码的 Result，而不是构造并抛出异常。
+在 CPython 3.11 上捕获异常的开销很小，这套 API 的好处是调用方不需要 try/except 且错误码稳定，
+并不比捕获异常更快（文本输入时预先校验反而更慢，运行 python -m utils.result 比较）
+"""
+
+import math
+import numbers
+import re
+import sys
+
+from utils.error_handling import ERROR_NONE, ERROR_MESSAGES, ERROR_EXCEPTIONS
+
+# 与 float() 接受的十进制写法一致（不含 inf/nan）
+_NUMBER_PATTERN = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*\Z")
+
+# 最大的有限浮点数，比较一次即可同时排除 inf 和 nan
+_MAX_FLOAT = sys.float_info.max
+
+
+class Result:
+    """轻量结果对象：value 为计算结果，error 为错误码（0 表示成功）"""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value=None, error=ERROR_NONE):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        """是否计算成功"""
+        return self.error == ERROR_NONE
+
+    @property
+    def message(self):
+        """错误码对应的错误信息"""
+        return ERROR_MESSAGES.get(self.error, "未知错误")
+
+    def unwrap(self):
+        """成功时返回结果，失败时抛出对应的异常"""
+        if self.error == ERROR_NONE:
+            return self.value
+        raise ERROR_EXCEPTIONS.get(self.error, ValueError)(self.message)
+
+    def value_or(self, default):
+        """成功时返回结果，失败时返回 default"""
+        return self.value if self.error == ERROR_NONE else default
+
+    def __eq__(self, other):
+        if not isinstance(other, Result):
+            return NotImplemented
+        return self.value == other.value and self.error == other.error
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self.error == ERROR_NONE:
+            return f"Result({self.value!r})"
+        return f"Result(error={self.error}, message='{self.message}')"
+
+
+# 每个错误码共享一个失败结果，出错时不产生新对象（不要修改这些实例）
+_FAILURES = {code: Result(None, code) for code in ERROR_MESSAGES if code != ERROR_NONE}
+
+
+def failure(code):
+    """返回指定错误码的失败结果"""
+    return _FAILURES[code]
+
+
+def parse_number(value):
+    """把输入转换为有限的浮点数，无法转换时返回 None（不抛出异常）"""
+    kind = type(value)
+    if kind is float:
+        return value if -_MAX_FLOAT <= value <= _MAX_FLOAT else None
+    if kind is int:
+        return float(value) if -_MAX_FLOAT <= value <= _MAX_FLOAT else None
+    if kind is str:
+        # 常见的无符号十进制写法只用字符串方法检查，其余写法再用正则表达式
+        digits = value.replace('.', '', 1)
+        if not (digits.isdigit() and digits.isascii()) and _NUMBER_PATTERN.match(value) is None:
+            return None
+        number = float(value)
+        return number if -_MAX_FLOAT <= number <= _MAX_FLOAT else None
+    if isinstance(value, numbers.Real) and kind is not bool:
+        # 其他实数类型（如 numpy 标量、Fraction）走较慢的通用路径
+        number = float(value)
+        return number if math.isfinite(number) else None
+    return None
+
+
+def split_results(results):
+    """把结果序列拆分为 (成功值列表, [(序号, 错误码)])"""
+    values = []
+    errors = []
+    for index, result in enumerate(results):
+        if result.error == ERROR_NONE:
+            values.append(result.value)
+        else:
+            errors.append((index, result.error))
+    return values, errors
+
+
+if __name__ == "__main__":
+    # 在项目根目录运行：python -m utils.result
+    import random
+    import time
+
+    from core.math_ext.advanced_math import MathFunctions
+
+    rng = random.Random(0)
+    workloads = {
+        # 文本输入：无效项包括非数字和负数
+        '文本': [str(rng.uniform(0, 1000)) if rng.random() >= 0.3 else rng.choice(["-4", "abc", ""])
+                 for _ in range(200000)],
+        # 数值输入：无效项为负数（定义域错误）
+        '数值': [rng.uniform(0, 1000) if rng.random() >= 0.3 else -rng.uniform(0, 1000)
+                 for _ in range(200000)]
+    }
+
+    def raising(inputs):
+        values = []
+        for item in inputs:
+            try:
+                values.append(MathFunctions.sqrt(float(item)))
+            except ValueError:
+                values.append(None)
+        return values
+
+    def non_raising(inputs):
+        return [MathFunctions.try_sqrt(item) for item in inputs]
+
+    for name, inputs in workloads.items():
+        for label, function in (("抛出异常", raising), ("Result", non_raising)):
+            start = time.perf_counter()
+            function(inputs)
+            elapsed = time.perf_counter() - start
+            print(f"{name} {label:>6}: {len(inputs) / elapsed:>12,.0f} 次/秒（30% 无效输入）")